@@ -0,0 +1,270 @@
+"""
+Benchmarks engNotation.py engineering notation number pretty-printer: the throughput
+of each formatting path, across value distributions and precisions. Results are written
+as JSON, and can be compared against a stored baseline, failing on a regression
+e.g. python bench_engNotation.py -o baseline.json
+     python bench_engNotation.py --compare baseline.json --threshold 10
+"""
+
+__author__ = "K.J. McClaning"
+__created__ = "2022-08-04"
+__updated__ = "2022-08-04"
+__version__ = "0.0.2"
+
+
+#  MIT License
+#
+#  Copyright (c) 2022 K.J.McClaning
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+
+import argparse
+import json
+import logging
+import platform
+import random
+import sys
+import timeit
+from decimal import Decimal
+
+import engNotation
+from engNotation import (
+    EngArray, EngCodeTable, EngFormatter, EngLazy, EngNotation, EngStream, eng, format_array, format_column,
+    format_into, parse_eng, parse_eng_many,
+)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _datasets(size, seed):
+    """
+    builds the value distributions that every path is measured on
+    :param int size: number of values in each distribution
+    :param int seed: random seed, so that runs are comparable
+    :return dict: distribution name -> list of values
+    """
+    rng = random.Random(seed)
+
+    def signed(magnitude):
+        return magnitude if rng.random() < 0.5 else -magnitude
+
+    inRangeL = [signed(10 ** rng.uniform(-30, 33)) for _ in range(size)]
+    return {
+        # values whose prefixes are in _prefixD
+        'in_range': inRangeL,
+        # values beyond the prefix table, small and large
+        'out_of_range': [signed(10 ** rng.choice((rng.uniform(-300, -30), rng.uniform(33, 300))))
+                         for _ in range(size)],
+        'zeros': [0.0] * size,
+        'nonfinite': [rng.choice((float('nan'), float('inf'), float('-inf'))) for _ in range(size)],
+        'ints': [signed(rng.randint(1, 10 ** rng.randint(1, 15))) for _ in range(size)],
+        'decimals': [Decimal(repr(value)) for value in inRangeL],
+    }
+
+
+def _cases(dataD):
+    """
+    lists the benchmark cases. Each runs a path over a whole distribution
+    :param dict dataD: distributions, from _datasets()
+    :return list: (name, function, number of values per call, render cache size)
+    """
+    caseL = []
+    size = len(dataD['in_range'])
+    for distS, valueL in dataD.items():
+        caseL.append(('construct/%s' % distS, lambda valueL=valueL: [EngNotation(v, 1, 'V') for v in valueL],
+                      size, 0))
+        for precision in (0, 3, 6):
+            caseL.append(('repr/%s/p%i' % (distS, precision),
+                          lambda valueL=valueL, precision=precision: [
+                              repr(EngNotation(v, precision, 'V')) for v in valueL], size, 0))
+        formatter = EngFormatter(1, 'V')
+        caseL.append(('formatter/%s' % distS, lambda valueL=valueL, formatter=formatter: [
+            formatter(v) for v in valueL], size, 0))
+
+    # many distinct unit strings, within and beyond the size of the formatter cache
+    for unitCount in (100, 4000):
+        unitL = ['u%i' % (i % unitCount) for i in range(size)]
+        caseL.append(('repr_units/in_range/%i' % unitCount, lambda unitL=unitL: [
+            repr(EngNotation(v, 1, u)) for v, u in zip(dataD['in_range'], unitL)], size, 0))
+
+    # a working set of repeated values, through the render cache
+    repeatedL = (dataD['in_range'][:max(1, size // 20)] * 20)[:size]
+    caseL.append(('repr_cached/in_range', lambda: [repr(EngNotation(v, 1, 'V')) for v in repeatedL],
+                  len(repeatedL), 1024))
+
+    inRangeL = dataD['in_range']
+    caseL.append(('eng_spec/in_range', lambda: [eng(v, '>12eng.1 V') for v in inRangeL], size, 0))
+    caseL.append(('format_spec/in_range', lambda: [format(EngNotation(v), 'eng.1 V') for v in inRangeL], size, 0))
+    # debug records through a logger that is disabled for them, the literal
+    # log.debug("v=%s", EngNotation(...)) call against its EngLazy counterpart. Neither
+    # argument is rendered: EngNotation decomposes its value on first use only
+    logger = logging.getLogger('bench_engNotation.disabled')
+    logger.setLevel(logging.WARNING)
+    caseL.append(('log_lazy/disabled', lambda: [logger.debug('v=%s', EngLazy(v, 1, 'V')) for v in inRangeL], size, 0))
+    caseL.append(('log_eager/disabled', lambda: [logger.debug('v=%s', EngNotation(v, 1, 'V')) for v in inRangeL],
+                  size, 0))
+
+    stream = EngStream(1, 'V', hysteresis=0.05)
+    caseL.append(('stream/in_range', lambda: [stream(v) for v in inRangeL], size, 0))
+
+    # 16-bit ADC codes through a calibration, per sample and through the lookup table
+    gain, offset = 2.5 / 65536, -1.25
+    codeL = [i * 7919 % 65536 for i in range(size)]
+    codeTable = EngCodeTable(gain, offset, 0, 65535, precision=1, unitS='V')
+    caseL.append(('repr/adc16', lambda: [repr(EngNotation(gain * c + offset, 1, 'V')) for c in codeL], size, 0))
+    caseL.append(('code_table/adc16', lambda: [codeTable(c) for c in codeL], size, 0))
+
+    stringL = [repr(EngNotation(v, 1, 'V')) for v in inRangeL]
+    caseL.append(('parse_eng/in_range', lambda: [parse_eng(s, 'V') for s in stringL], size, 0))
+
+    if np is not None:
+        caseL.append(('parse_eng_many/in_range', lambda: parse_eng_many(stringL, 'V'), size, 0))
+        for distS in ('in_range', 'out_of_range', 'zeros', 'nonfinite', 'ints'):
+            valueA = np.array(dataD[distS], dtype=np.float64)
+            for precision in (0, 3):
+                caseL.append(('format_array/%s/p%i' % (distS, precision),
+                              lambda valueA=valueA, precision=precision: format_array(valueA, precision, 'V'),
+                              size, 0))
+        valueA = np.array(inRangeL)
+        caseL.append(('format_column/in_range', lambda: format_column(valueA, 1, 'V'), size, 0))
+        bufferA = bytearray(size * 16)
+        caseL.append(('format_into/in_range', lambda: format_into(bufferA, valueA, 1, 'V', width=16), size, 0))
+        engArray = EngArray(valueA, 1, 'V')
+        caseL.append(('eng_array/in_range', engArray.format, size, 0))
+        codeA = np.array(codeL)
+        caseL.append(('code_table_array/adc16', lambda: codeTable.format(codeA), size, 0))
+    return caseL
+
+
+def run(size=2000, repeat=5, number=3, seed=1, filterS=None):
+    """
+    Runs the benchmark cases, keeping the best of several repeats of each
+    :param int size: number of values in each distribution
+    :param int repeat: number of timing repeats, the fastest is kept
+    :param int number: number of calls per repeat
+    :param int seed: random seed for the distributions
+    :param string filterS: only run the cases whose names contain this string
+    :return dict: the results, ready to be written as JSON
+    """
+    resultD = {}
+    for nameS, function, count, cacheSize in _cases(_datasets(size, seed)):
+        if filterS is not None and filterS not in nameS:
+            continue
+        EngNotation.cache_configure(cacheSize)
+        EngNotation.cache_clear()
+        try:
+            function()
+            seconds = min(timeit.repeat(function, number=number, repeat=repeat)) / (number * count)
+        finally:
+            EngNotation.cache_configure(0)
+        resultD[nameS] = {'ns_per_value': seconds * 1e9, 'values_per_s': 1.0 / seconds}
+
+    return {
+        'engNotation': engNotation.__version__,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'numpy': None if np is None else np.__version__,
+        'size': size,
+        'results': resultD,
+    }
+
+
+def compare(resultD, baselineD, threshold):
+    """
+    Compares results against a baseline. A case regresses when its throughput drops
+    by more than threshold percent. Cases missing from either side are ignored
+    :param dict resultD: results, from run()
+    :param dict baselineD: baseline results, from run()
+    :param float threshold: allowed throughput drop, in percent
+    :return: (list of (name, baseline values/s, values/s, change in percent), list of regressed names)
+    """
+    rowL = []
+    regressedL = []
+    for nameS, thisD in resultD['results'].items():
+        baseD = baselineD['results'].get(nameS)
+        if baseD is None:
+            continue
+        changePct = (thisD['values_per_s'] / baseD['values_per_s'] - 1.0) * 100.0
+        rowL.append((nameS, baseD['values_per_s'], thisD['values_per_s'], changePct))
+        if changePct < -threshold:
+            regressedL.append(nameS)
+    return rowL, regressedL
+
+
+def main(argv=None):
+    """
+    Command line: runs the benchmarks, writes the results as JSON, and optionally
+    compares them against a baseline file
+    :param list argv: command-line arguments, defaults to sys.argv[1:]
+    :return int: exit status, 1 if a case regressed beyond the threshold
+    """
+    parser = argparse.ArgumentParser(
+        prog='python bench_engNotation.py',
+        description='Benchmarks the engNotation formatting paths.')
+    parser.add_argument('-o', '--output', default='-',
+                        help='JSON results file, "-" or omitted for stdout')
+    parser.add_argument('--compare', metavar='BASELINE',
+                        help='baseline JSON results file to compare against')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help='allowed throughput drop against the baseline, in percent, default 10')
+    parser.add_argument('--size', type=int, default=2000,
+                        help='number of values in each distribution')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='number of timing repeats, the fastest is kept')
+    parser.add_argument('--number', type=int, default=3,
+                        help='number of calls per repeat')
+    parser.add_argument('--seed', type=int, default=1,
+                        help='random seed for the distributions')
+    parser.add_argument('-k', '--filter', dest='filterS',
+                        help='only run the cases whose names contain this string')
+    args = parser.parse_args(argv)
+
+    resultD = run(args.size, args.repeat, args.number, args.seed, args.filterS)
+
+    jsonS = json.dumps(resultD, indent=2, sort_keys=True)
+    if args.output == '-':
+        print(jsonS)
+    else:
+        with open(args.output, 'w') as f:
+            f.write(jsonS + '\n')
+
+    if args.compare is None:
+        return 0
+
+    with open(args.compare) as f:
+        baselineD = json.load(f)
+    rowL, regressedL = compare(resultD, baselineD, args.threshold)
+    for nameS, baseRate, rate, changePct in rowL:
+        flagS = '  REGRESSED' if nameS in regressedL else ''
+        print('%-32s %12.0f %12.0f values/s %+7.1f%%%s' % (nameS, baseRate, rate, changePct, flagS), file=sys.stderr)
+    if regressedL:
+        print('%i case(s) regressed by more than %g%%' % (len(regressedL), args.threshold), file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
+
+# ===========================================================================
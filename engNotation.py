@@ -42,9 +42,57 @@ __version__ = "0.0.2"
 #  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 #  SOFTWARE.
 
+import functools
+import io
+import itertools
+import json
+import logging
 import math
+import operator
+import re
+import struct
+import sys
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from decimal import MAX_EMAX, MAX_PREC, MIN_EMIN, Context, Decimal
+from fractions import Fraction
+
+# numpy is optional, and only required by the batch (array) formatting routines. It
+# takes far longer to import than this module, so it is imported by _numpy() on first
+# use. asyncio, the multiprocessing modules, argparse and csv are also imported where used
+np = None
+
+
+def _numpy():
+    """
+    imports numpy on first use
+    :return module: numpy, or None if it isn't installed
+    """
+    global np
+    if np is None:
+        try:
+            import numpy as np
+        except ImportError:
+            return None
+    return np
+
+
+def _isArray(value):
+    """
+    tests for a numpy array without importing numpy: if nothing has imported numpy
+    yet, value can't be an array. Otherwise _numpy() binds np, for the array path
+    :param value: any object
+    :return boolean: true if value is a numpy array
+    """
+    return sys.modules.get('numpy') is not None and isinstance(value, _numpy().ndarray)
+
 
 _prefixD = {
+    30: "Q",  # quetta
+    27: "R",  # ronna
+    24: "Y",  # yotta
+    21: "Z",  # zetta
     18: "E",  # Exa
     15: "P",  # Pera
     12: "T",  # Tera
@@ -58,124 +106,835 @@ _prefixD = {
     -12: "p",  # pico
     -15: "f",  # femto
     -18: "a",  # atto
+    -21: "z",  # zepto
+    -24: "y",  # yocto
+    -27: "r",  # ronto
+    -30: "q",  # quecto
 }
 
+# the reverse of _prefixD, from the prefix to the exponent string appended to the
+# mantissa when parsing. The micro sign is also accepted for micro
+_prefixExpD = {prefixS: 'e%i' % exponent for exponent, prefixS in _prefixD.items() if prefixS}
+_prefixExpD['\u00b5'] = _prefixExpD['u']
+
+
+class PrefixSet:
+    """
+    A set of unit prefixes, compiled once into an array indexed by exponent, so that
+    finding the prefix of an exponent is a constant-time index with no hashing.
+    Decimal sets (radix 10) are keyed by engineering exponents, multiples of 3, and
+    exponents missing from the set are rendered in the "e%i" form. Binary sets
+    (radix 2) are keyed by powers of two, multiples of step, and exponents missing
+    from the set are rendered in the "p%i" form (times two to the power)
+    e.g. PrefixSet({0: "", 10: "Ki", 20: "Mi"}, radix=2, step=10)
+    """
+
+    __slots__ = ('prefixD', 'radix', 'step', 'minExponent', 'prefixL', 'fallbackS')
+
+    def __init__(self, prefixD, radix=10, step=3):
+        """
+        compiles the prefix set
+        :param dict prefixD: exponent -> prefix string
+        :param int radix: 10 for decimal prefixes, 2 for binary prefixes
+        :param int step: exponent step between prefixes, 3 for decimal prefixes
+        """
+        if radix not in (2, 10):
+            raise ValueError("radix must be 2 or 10")
+        if (radix == 10 and step != 3) or step < 1:
+            raise ValueError("decimal prefix sets have a step of 3")
+        if any(exponent % step for exponent in prefixD):
+            raise ValueError("prefix exponents must be multiples of %i" % step)
+
+        self.prefixD = dict(prefixD)
+        self.radix = radix
+        self.step = step
+        self.fallbackS = 'e%i' if radix == 10 else 'p%i'
+
+        # the prefix, or None, for every exponent step between the extremes
+        self.minExponent = min(prefixD, default=0)
+        maxExponent = max(prefixD, default=-step)
+        self.prefixL = [prefixD.get(exponent) for exponent in range(self.minExponent, maxExponent + 1, step)]
+
+    def prefix(self, engExponent):
+        """
+        Returns the prefix of an engineering exponent
+        :param int engExponent: engineering exponent, a multiple of step
+        :return string,None: the prefix, or None if the exponent isn't in the set
+        """
+        idx = (engExponent - self.minExponent) // self.step
+        if 0 <= idx < len(self.prefixL):
+            return self.prefixL[idx]
+        return None
+
+    def __repr__(self):
+        """
+        :return: a string representing the prefix set
+        """
+        return 'PrefixSet(%r, radix=%i, step=%i)' % (self.prefixD, self.radix, self.step)
+
+
+# the standard prefix sets: SI (the default), IEC binary, and pure engineering
+# notation with no prefixes
+siPrefixSet = PrefixSet(_prefixD)
+binaryPrefixSet = PrefixSet(
+    {0: '', 10: 'Ki', 20: 'Mi', 30: 'Gi', 40: 'Ti', 50: 'Pi', 60: 'Ei', 70: 'Zi', 80: 'Yi'}, radix=2, step=10)
+engPrefixSet = PrefixSet({0: ''})
+_siPrefixL = siPrefixSet.prefixL
+_siMinExponent = siPrefixSet.minExponent
+
+# correctly rounded powers of ten, indexed by exponent - _pow10MinExp. The table
+# reaches one entry beyond the float range (inf) so that the upper bound of every
+# finite float can be looked up
+_pow10MinExp = -324
+_pow10L = [float('1e%i' % e) for e in range(_pow10MinExp, 310)]
+
+# the exponents of the powers of 1000 in _pow10L, so that a scale factor which is
+# one of them is recognised with a single lookup
+_pow1000D = {_pow10L[e - _pow10MinExp]: e for e in range(-306, 307, 3)}
+
+
+def _pow1000Exponent(factor):
+    """
+    returns the base-10 exponent of a float or int scale factor that is a power of 1000
+    :param float,int,Decimal,Fraction factor: scale factor
+    :return int,None: the exponent, a multiple of three, or None
+    """
+    if factor.__class__ is float or factor.__class__ is int:
+        return _pow1000D.get(factor)
+    return None
+
+
+# numpy copy of _pow10L, created by the batch formatter on first use
+_pow10A = None
+
+# for each binary exponent returned by frexp (-1073 to 1024), the base-10 exponent
+# floor(log10(2 ** (binaryExponent - 1))), and the power of ten at which it is one higher
+_frexpMinExp = -1074
+_frexpExponentL = [((e - 1) * 78913) >> 18 for e in range(_frexpMinExp, 1025)]
+_frexpThresholdL = [_pow10L[e + 1 - _pow10MinExp] for e in _frexpExponentL]
+
+# the engineering notation value of each band (exponent % 3) must stay below these
+_bandLimitT = (10.0, 100.0, 1000.0)
+
+
+def _scale(value, exponent):
+    """
+    returns value / 10 ** exponent, dividing by the correctly rounded power of ten
+    so that every power of ten maps exactly to 1.0. In the subnormal range the power
+    of ten would underflow, and the value is scaled exactly, then rounded once
+    :param float value: value to be scaled
+    :param int exponent: base-10 exponent
+    :return float: the scaled value
+    """
+    if exponent >= -307:
+        return value / _pow10L[exponent - _pow10MinExp]
+    return float(Fraction(value) * _pow10Int(-exponent))
+
+
+def _engFromExponent(value, exponent, precision):
+    """
+    generates the engineering format version of a value, given its base-10 exponent.
+    If rounding to the requested precision carries into the next band e.g. 999.96
+    is rounded to "1000", the exponent is bumped so that it is rendered as "1.00k"
+    :param float value: finite, non-zero value to be expressed
+    :param int exponent: base-10 exponent of value
+    :param int precision: number of digits to be expressed, beyond 3
+    :return: (exponent, engExponent, engValue)
+    """
+    while True:
+        exponentMod = exponent % 3
+        engExponent = exponent - exponentMod
+        engValue = _scale(value, engExponent)
+
+        # only values within 1.0 of the band limit can carry, and are rounded to check
+        limit = _bandLimitT[exponentMod]
+        if abs(engValue) < limit - 1.0 or abs(round(engValue, 2 + precision - exponentMod)) < limit:
+            return exponent, engExponent, engValue
+        exponent += 1
+
+
+def _engDecompose(value, precision):
+    """
+    retrieves the base-10 exponent of a value without log10 or pow: the binary
+    exponent from frexp looks up an estimate that is exact or one low, and a single
+    comparison against the matching power of ten corrects it. The common case is
+    inlined, and the band carry and subnormal cases are left to _engFromExponent
+    :param float value: finite value to be expressed
+    :param int precision: number of digits to be expressed, beyond 3
+    :return: (exponent, engExponent, engValue)
+    """
+    if value == 0:
+        return 0, 0, 0.0
+
+    binaryIdx = math.frexp(value)[1] - _frexpMinExp
+    exponent = _frexpExponentL[binaryIdx]
+    if abs(value) >= _frexpThresholdL[binaryIdx]:
+        exponent += 1
+
+    exponentMod = exponent % 3
+    engExponent = exponent - exponentMod
+    if engExponent >= -306:
+        engValue = value / _pow10L[engExponent - _pow10MinExp]
+    else:
+        # in the subnormal range the table entries are themselves badly rounded,
+        # and the comparison may overshoot by one
+        if abs(_scale(value, exponent)) < 1.0:
+            exponent -= 1
+        return _engFromExponent(value, exponent, precision)
+
+    if abs(engValue) < _bandLimitT[exponentMod] - 1.0:
+        return exponent, engExponent, engValue
+    return _engFromExponent(value, exponent, precision)
+
+
+# ints, Decimals and Fractions are expressed exactly, from their decimal digits,
+# rather than through a float
+_exactTypesT = (int, Decimal, Fraction)
+
+# scalars that an EngNotation can be multiplied and divided by
+_scalarTypesT = (float,) + _exactTypesT
+
+# exact integer powers of ten, and a context in which Decimal scaling is exact
+_pow10IntL = [10 ** e for e in range(330)]
+_exactContext = Context(prec=MAX_PREC, Emax=MAX_EMAX, Emin=MIN_EMIN)
+
+
+def _pow10Int(exponent):
+    """
+    returns 10 ** exponent as an int
+    :param int exponent: non-negative base-10 exponent
+    :return int: the power of ten
+    """
+    if exponent < 330:
+        return _pow10IntL[exponent]
+    return 10 ** exponent
+
+
+def _intExponent(n):
+    """
+    returns the base-10 exponent of a positive int of any size. The bit length gives
+    an estimate that is exact or low, and is corrected against exact powers of ten
+    :param int n: positive int
+    :return int: base-10 exponent
+    """
+    exponent = ((n.bit_length() - 1) * 78913) >> 18
+    while n >= _pow10Int(exponent + 1):
+        exponent += 1
+    return exponent
+
+
+def _exactDigits(value, numDigits):
+    """
+    returns the sign, leading decimal digits and base-10 exponent of an exact value.
+    Ints and Decimals read their digits from str(). Fractions, and ints beyond the
+    int to str conversion limit, divide out numDigits + 1 digits, with a trailing "1"
+    standing for any non-zero remainder so that they round exactly as the full value would
+    :param int,Decimal,Fraction value: finite, non-zero value
+    :param int numDigits: number of significant digits to be expressed
+    :return: (signS, digitsS, exponent)
+    """
+    signS = '-' if value < 0 else ''
+
+    if isinstance(value, Decimal):
+        # the coefficient digits, without the sign, decimal point or exponent
+        digitsS = str(value).partition('E')[0].replace('.', '').lstrip('-0')
+        return signS, digitsS, value.adjusted()
+
+    if isinstance(value, int):
+        numerator = abs(int(value))
+        try:
+            digitsS = str(numerator)
+            return signS, digitsS, len(digitsS) - 1
+        except ValueError:
+            exponent = _intExponent(numerator)
+            quotient, remainder = divmod(numerator, _pow10Int(exponent - numDigits))
+            return signS, str(quotient) + ('1' if remainder else ''), exponent
+
+    # a Fraction: find the exponent from the numerator and denominator
+    numerator = abs(value.numerator)
+    denominator = value.denominator
+    exponent = _intExponent(numerator) - _intExponent(denominator)
+    if exponent >= 0:
+        if numerator < denominator * _pow10Int(exponent):
+            exponent -= 1
+    elif numerator * _pow10Int(-exponent) < denominator:
+        exponent -= 1
+
+    shift = numDigits - exponent
+    if shift >= 0:
+        quotient, remainder = divmod(numerator * _pow10Int(shift), denominator)
+    else:
+        quotient, remainder = divmod(numerator, denominator * _pow10Int(-shift))
+    return signS, str(quotient) + ('1' if remainder else ''), exponent
+
+
+def _roundDigits(digitsS, exponent, numDigits):
+    """
+    pads or rounds half-even a digit string to numDigits significant digits. A carry
+    into the next decade e.g. "99996" to "1000" bumps the exponent
+    :param string digitsS: leading decimal digits, as returned by _exactDigits()
+    :param int exponent: base-10 exponent
+    :param int numDigits: number of significant digits to be expressed
+    :return: (digitsS, exponent)
+    """
+    if len(digitsS) <= numDigits:
+        return digitsS + '0' * (numDigits - len(digitsS)), exponent
+    roundS = digitsS[numDigits]
+    keptS = digitsS[:numDigits]
+    if roundS >= '5' and (roundS > '5' or keptS[-1] in '13579' or digitsS[numDigits + 1:].strip('0')):
+        keptS = str(int(keptS) + 1)
+        if len(keptS) > numDigits:
+            exponent += 1
+            keptS = keptS[:numDigits]
+    return keptS, exponent
+
+
+def _exactDecompose(value, precision):
+    """
+    generates the engineering format version of an int, Decimal or Fraction without
+    float conversion, from its digits rounded to 3 + precision significant digits
+    :param int,Decimal,Fraction value: finite, non-zero value
+    :param int precision: number of digits to be expressed, beyond 3
+    :return: (exponent, engExponent, numberS) where numberS is the formatted engineering value
+    """
+    signS, digitsS, exponent = _exactDigits(value, 3 + precision)
+    digitsS, exponent = _roundDigits(digitsS, exponent, 3 + precision)
+    exponentMod = exponent % 3
+    numberS = signS + digitsS[:exponentMod + 1]
+    if len(digitsS) > exponentMod + 1:
+        numberS += '.' + digitsS[exponentMod + 1:]
+    return exponent, exponent - exponentMod, numberS
+
+
+def _exactScale(value, exponent):
+    """
+    returns value / 10 ** exponent exactly: a Decimal for a Decimal, and a Fraction
+    for an int or Fraction
+    :param int,Decimal,Fraction value: value to be scaled
+    :param int exponent: base-10 exponent
+    :return Decimal,Fraction: the scaled value
+    """
+    if isinstance(value, Decimal):
+        return value.scaleb(-exponent, _exactContext)
+    if exponent >= 0:
+        return Fraction(value, _pow10Int(exponent))
+    return Fraction(value * _pow10Int(-exponent))
+
+
+def _exactFixed(value, engExponent, decimals):
+    """
+    formats value / 10 ** engExponent exactly, rounded half-even to a fixed number of
+    decimals, as "%.<decimals>f" would format the float. A negative value that rounds
+    to zero keeps its sign, as with floats
+    :param int,Decimal,Fraction value: finite value to be expressed
+    :param int engExponent: engineering notation exponent, a multiple of three
+    :param int decimals: number of decimals
+    :return string: the formatted number
+    """
+    scaled = Fraction(_exactScale(value, engExponent))
+    digitsS = str(round(abs(scaled) * _pow10Int(decimals))).rjust(decimals + 1, '0')
+    signS = '-' if scaled < 0 else ''
+    if decimals > 0:
+        return signS + digitsS[:-decimals] + '.' + digitsS[-decimals:]
+    return signS + digitsS
+
+
+def _isFinite(value):
+    """
+    math.isfinite() for floats and exact values, without converting ints beyond the
+    float range
+    :param float,int,Decimal,Fraction value: value to be tested
+    :return boolean: true unless value is an inf or a nan
+    """
+    if value.__class__ is not float and isinstance(value, _exactTypesT):
+        return value.is_finite() if isinstance(value, Decimal) else True
+    return math.isfinite(value)
+
+
+def _mixedOp(op, a, b):
+    """
+    applies an arithmetic operator to two scalars that Python doesn't combine, a Decimal
+    with a float or a Fraction. Finite operands are promoted to Fractions, which hold
+    either exactly, so the result is exact. Fractions hold no nan or inf, so non-finite
+    operands are converted to floats instead
+    :param function op: operator e.g. operator.mul
+    :param float,int,Decimal,Fraction a: first operand
+    :param float,int,Decimal,Fraction b: second operand
+    :return float,Fraction: the result
+    """
+    if _isFinite(a) and _isFinite(b):
+        return op(Fraction(a), Fraction(b))
+    return op(float(a), float(b))
+
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+class _RenderCache:
+    """
+    A thread-safe, bounded LRU cache of rendered EngNotation strings, keyed on
+    (type, value, precision, unitS, prefixSet). NaN values share a single key, since NaN != NaN.
+    A maxsize of 0 disables the cache, and None makes it unbounded
+    """
+
+    _nanKey = object()
+
+    def __init__(self, maxsize=0):
+        """
+        initializes an empty cache
+        :param int,None maxsize: maximum number of cached strings
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._cacheD = OrderedDict()
+        self._lock = threading.Lock()
+
+    def render(self, eN):
+        """
+        returns the rendered string of an EngNotation, from the cache if present
+        :param EngNotation eN: number to be rendered
+        :return: a string representing the engineering number
+        """
+        value = eN._value
+        key = (type(value), value if value == value else self._nanKey, eN._precision, eN._unitS, eN._prefixSet)
+
+        with self._lock:
+            s = self._cacheD.get(key)
+            if s is not None:
+                self._cacheD.move_to_end(key)
+                self.hits += 1
+                return s
+            self.misses += 1
+
+        # render outside of the lock, so that other threads aren't held up
+        s = eN._render()
+
+        with self._lock:
+            self._cacheD[key] = s
+            if self.maxsize is not None and len(self._cacheD) > self.maxsize:
+                self._cacheD.popitem(last=False)
+        return s
+
+    def configure(self, maxsize):
+        """
+        changes the maximum size of the cache, evicting the least recently used
+        strings if required
+        :param int,None maxsize: maximum number of cached strings, 0 disables the cache
+        """
+        with self._lock:
+            self.maxsize = maxsize
+            if maxsize is not None:
+                while len(self._cacheD) > maxsize:
+                    self._cacheD.popitem(last=False)
+
+    def clear(self):
+        """
+        empties the cache and resets its statistics
+        """
+        with self._lock:
+            self._cacheD.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        """
+        :return CacheInfo: the cache statistics
+        """
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._cacheD))
+
+
+_renderCache = _RenderCache()
+
 
 class EngNotation:
     """
     Allows the user to express and print a number in engineering notation, with an optional units string.
     The display format is meant to follow the behavior of the HP-25/HP-42 series of calculators.
     If a unit string is passed (e.g. "Ohm"), then the quantity is printed as "33.00 mOhm"
+    Only the value, precision and unit string are stored at construction. The engineering
+    notation decomposition is computed the first time it is needed, and then cached.
+    Instances are immutable, hashable and ordered by (value, unitS), so they can be
+    sorted, bisected, deduplicated and used as dict keys directly.
     """
 
-    def __init__(self, value, precision=0, unitS='', ):
+    __slots__ = ('_value', '_precision', '_unitS', '_prefixSet', '_decompT', '_keyT')
+
+    def __init__(self, value, precision=0, unitS='', prefixSet=None):
         """
         initializes a number to be expressed in engineering notation
         :rtype: object
-        :param float,int value: value to be expressed
+        :param float,int,Decimal,Fraction value: value to be expressed
         :param int precision: number of digits to be expressed, beyond 3
         :param string unitS: optional unit string e.g. "Ohm" or "V"
+        :param PrefixSet prefixSet: optional prefix set e.g. binaryPrefixSet, SI by default
         """
-        self.value = value
-        self.precision = precision
-        self.unitS = unitS
+        self._value = value
+        self._precision = precision
+        self._unitS = unitS
+        self._prefixSet = prefixSet
+        self._decompT = None
+        self._keyT = None
 
-        # handle the inf and nan cases in the __repr__ method
-        if math.isnan(self.value) or math.isinf(self.value):
-            return
+    @property
+    def value(self):
+        """
+        :return float,int,Decimal,Fraction: the value to be expressed
+        """
+        return self._value
 
-        # retrieve the base-10 exponent and generate a mantissa between
-        # 1.0 and 9.999...
-        # the try/except handles the 0.0, nan, inf, etc cases
-        try:
-            self.exponent = int(math.log10(abs(self.value)))
-            self.mantissa = self.value / 10 ** self.exponent
-        except ValueError:
-            self.exponent = 1
-            self.mantissa = 0.0
-
-        # adjust the mantissa and exponent for numbers less than 1.0
-        if abs(self.mantissa) < 1.0:
-            self.mantissa *= 10.0
-            self.exponent -= 1
-
-        # generate the engineering format version of the input value and its exponent
-        exponentMod = self.exponent % 3
-        exponent3 = self.exponent - exponentMod
-        if exponentMod == 0:
-            self.engExponent = self.exponent
-            self.engValue = self.mantissa
-        elif exponentMod == 1:
-            self.engExponent = self.exponent - 1
-            self.engValue = self.mantissa * 10.0
-        else:  # exponentMod == 2:
-            self.engExponent = self.exponent - 2
-            self.engValue = self.mantissa * 100.0
-
-        # find the unit prefix appropriate for the engineering notation exponent
-        if exponent3 in _prefixD.keys():
-            self.prefixS = _prefixD[exponent3]
-            self.foundPrefix = True
-        else:
-            self.prefixS = "E%i" % self.engExponent
-            self.foundPrefix = False
+    @property
+    def precision(self):
+        """
+        :return int: number of digits to be expressed, beyond 3
+        """
+        return self._precision
 
-    def __repr__(self):
+    @property
+    def unitS(self):
         """
-        Returns the engineering formatted number as a string, optionally
-        with the units attached, if present
-        :return: a string representing the engineering number
+        :return string: unit string e.g. "Ohm" or "V"
         """
+        return self._unitS
 
-        # handle the inf and nan cases specially
-        if math.isnan(self.value):
-            s = 'NAN'
-            if len(self.unitS) > 0:
-                s += ' ' + self.unitS
-            return s
-
-        # true if inf or -inf
-        if math.isinf(self.value):
-            if self.value < 0:
-                s = '-INF'
+    @property
+    def prefixSet(self):
+        """
+        :return PrefixSet,None: prefix set, None for SI
+        """
+        return self._prefixSet
+
+    @property
+    def sortKey(self):
+        """
+        numeric sort key, computed on first use and cached: (isNan, value, unitS).
+        NaNs sort after every number, and NaNs with the same unit string are equal.
+        e.g. sorted(engNotationL, key=operator.attrgetter("sortKey"))
+        :return tuple: the sort key
+        """
+        keyT = self._keyT
+        if keyT is None:
+            value = self._value
+            if value.is_nan() if isinstance(value, Decimal) else value != value:
+                keyT = (True, 0, self._unitS)
             else:
-                s = 'INF'
-            if len(self.unitS) > 0:
-                s += ' ' + self.unitS
-            return s
+                keyT = (False, value, self._unitS)
+            self._keyT = keyT
+        return keyT
 
-        # format the engineering notation mantissa to the required precision
-        # the precision in the format string speaks to the number of decimal digits
-        # beyond 3.
-        numDigits = 3 + self.precision
+    def __eq__(self, other):
+        """
+        :param EngNotation other: number to compare with
+        :return boolean: true if the values and unit strings are equal
+        """
+        if not isinstance(other, EngNotation):
+            return NotImplemented
+        return (self._keyT or self.sortKey) == (other._keyT or other.sortKey)
+
+    def __lt__(self, other):
+        """
+        :param EngNotation other: number to compare with
+        :return boolean: true if the sort key is less than that of other
+        """
+        if not isinstance(other, EngNotation):
+            return NotImplemented
+        return (self._keyT or self.sortKey) < (other._keyT or other.sortKey)
+
+    def __le__(self, other):
+        """
+        :param EngNotation other: number to compare with
+        :return boolean: true if the sort key is less than or equal to that of other
+        """
+        if not isinstance(other, EngNotation):
+            return NotImplemented
+        return (self._keyT or self.sortKey) <= (other._keyT or other.sortKey)
+
+    def __gt__(self, other):
+        """
+        :param EngNotation other: number to compare with
+        :return boolean: true if the sort key is greater than that of other
+        """
+        if not isinstance(other, EngNotation):
+            return NotImplemented
+        return (self._keyT or self.sortKey) > (other._keyT or other.sortKey)
+
+    def __ge__(self, other):
+        """
+        :param EngNotation other: number to compare with
+        :return boolean: true if the sort key is greater than or equal to that of other
+        """
+        if not isinstance(other, EngNotation):
+            return NotImplemented
+        return (self._keyT or self.sortKey) >= (other._keyT or other.sortKey)
+
+    def __hash__(self):
+        """
+        :return int: hash of the value and unit string, equal for equal numbers
+        """
+        return hash(self._keyT or self.sortKey)
+
+    def __reduce__(self):
+        """
+        pickles the number by its constructor arguments, without the cached decomposition
+        :return tuple: (class, constructor arguments)
+        """
+        return self.__class__, (self._value, self._precision, self._unitS, self._prefixSet)
+
+    def _derive(self, value, unitS, shift=None):
+        """
+        creates a number for a value derived from this one, with the same precision and
+        prefix set. When the value is this number's float value scaled by 10 ** shift, a
+        power of 1000, and this number is already decomposed, the exponent is shifted
+        rather than searched for. It is checked against the powers of ten, since the
+        scaling may round across one, so the result is identical to a fresh EngNotation
+        :param float,int,Decimal,Fraction value: derived value
+        :param string unitS: unit string of the derived value
+        :param int,None shift: base-10 exponent of the scale factor, or None
+        :return EngNotation: the derived number
+        """
+        prefixSet = self._prefixSet
+        eN = EngNotation(value, self._precision, unitS, prefixSet)
+        decompT = self._decompT
+        if shift is None or decompT is None or value.__class__ is not float or self._value.__class__ is not float:
+            return eN
+        if decompT[0] is None or value == 0 or (prefixSet is not None and prefixSet.radix != 10):
+            return eN
+
+        # a power of 1000 keeps the position in the band, so the engineering exponent
+        # shifts with the exponent, unless the scaling rounded across a power of ten
+        exponent = decompT[0] + shift
+        if not (-306 <= exponent < 308
+                and _pow10L[exponent - _pow10MinExp] <= abs(value) < _pow10L[exponent + 1 - _pow10MinExp]):
+            return eN
+        engExponent = decompT[1] + shift
+        engValue = value / _pow10L[engExponent - _pow10MinExp]
+        if abs(engValue) >= _bandLimitT[exponent - engExponent] - 1.0:
+            exponent, engExponent, engValue = _engFromExponent(value, exponent, self._precision)
+
+        if prefixSet is None:
+            idx = (engExponent - _siMinExponent) // 3
+            if 0 <= idx < len(_siPrefixL):
+                eN._decompT = (exponent, engExponent, engValue, _siPrefixL[idx], True)
+                return eN
+        eN._decompT = (exponent, engExponent, engValue) + eN._prefix(engExponent)
+        return eN
+
+    def __mul__(self, other):
+        """
+        :param float,int,Decimal,Fraction other: scale factor
+        :return EngNotation: the number scaled by other, with the same unit string
+        """
+        if not isinstance(other, _scalarTypesT):
+            return NotImplemented
+        try:
+            value = self._value * other
+        except TypeError:
+            value = _mixedOp(operator.mul, self._value, other)
+        return self._derive(value, self._unitS, _pow1000Exponent(other))
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        """
+        :param float,int,Decimal,Fraction other: divisor
+        :return EngNotation: the number divided by other, with the same unit string
+        """
+        if not isinstance(other, _scalarTypesT):
+            return NotImplemented
+        try:
+            value = self._value / other
+        except TypeError:
+            value = _mixedOp(operator.truediv, self._value, other)
+        shift = _pow1000Exponent(other)
+        return self._derive(value, self._unitS, None if shift is None else -shift)
+
+    def __add__(self, other):
+        """
+        :param EngNotation other: number with the same unit string
+        :return EngNotation: the sum, with this number's precision
+        """
+        if not isinstance(other, EngNotation):
+            return NotImplemented
+        if other._unitS != self._unitS:
+            raise ValueError("cannot add %r to %r, the units differ" % (other._unitS, self._unitS))
+        try:
+            value = self._value + other._value
+        except TypeError:
+            value = _mixedOp(operator.add, self._value, other._value)
+        return self._derive(value, self._unitS)
+
+    def __sub__(self, other):
+        """
+        :param EngNotation other: number with the same unit string
+        :return EngNotation: the difference, with this number's precision
+        """
+        if not isinstance(other, EngNotation):
+            return NotImplemented
+        if other._unitS != self._unitS:
+            raise ValueError("cannot subtract %r from %r, the units differ" % (other._unitS, self._unitS))
+        try:
+            value = self._value - other._value
+        except TypeError:
+            value = _mixedOp(operator.sub, self._value, other._value)
+        return self._derive(value, self._unitS)
+
+    def to_unit(self, factor, newUnitS):
+        """
+        Converts the number to another unit e.g. EngNotation(12.3, unitS="mA").to_unit(1e-3, "A")
+        :param float,int,Decimal,Fraction factor: value of the old unit in the new unit
+        :param string newUnitS: new unit string
+        :return EngNotation: the converted number
+        """
+        try:
+            value = self._value * factor
+        except TypeError:
+            value = _mixedOp(operator.mul, self._value, factor)
+        return self._derive(value, newUnitS, _pow1000Exponent(factor))
+
+    def _decompose(self):
+        """
+        computes the engineering notation decomposition of the value on first use,
+        and caches it. The inf and nan cases are handled in the __repr__ method,
+        and their decomposition is all None
+        :return: (exponent, engExponent, engValue, prefixS, foundPrefix)
+        """
+        if self._decompT is not None:
+            return self._decompT
+
+        # ints, Decimals and Fractions take the exact path, unless the prefixes are binary
+        prefixSet = self._prefixSet
+        binary = prefixSet is not None and prefixSet.radix == 2
+        if self._value.__class__ is not float and isinstance(self._value, _exactTypesT) and not binary:
+            return self._exactDecompose()
+
+        # handle the inf and nan cases in the __repr__ method
+        if not math.isfinite(self._value):
+            self._decompT = (None, None, None, None, None)
+            return self._decompT
 
-        # format the return string based upon the number of digits req'd
-        if abs(self.engValue) < 10.0:
-            s = '{:.{}f}'.format(self.engValue, numDigits - 1)
-        elif abs(self.engValue) < 100.0:
-            s = '{:.{}f}'.format(self.engValue, numDigits - 2)
+        # retrieve the base-10 (or binary) exponent, and the engineering format
+        # version of the value and its exponent
+        if binary:
+            formatter = _getFormatter(self._precision, self._unitS, prefixSet)
+            exponent, engExponent, engValue = formatter.decompose(float(self._value))
         else:
-            s = '{:.{}f}'.format(self.engValue, numDigits - 3)
+            exponent, engExponent, engValue = _engDecompose(self._value, self._precision)
 
-        # if we found a prefix in the table e.g. "k" or "u"
-        if self.foundPrefix:
+        # the default SI set is indexed inline, the common case
+        if prefixSet is None:
+            idx = (engExponent - _siMinExponent) // 3
+            if 0 <= idx < len(_siPrefixL):
+                self._decompT = (exponent, engExponent, engValue, _siPrefixL[idx], True)
+                return self._decompT
+        self._decompT = (exponent, engExponent, engValue) + self._prefix(engExponent)
+        return self._decompT
 
-            # do we have a units string?
-            if len(self.unitS) == 0:
-                s += self.prefixS
-            else:
-                s += " " + self.prefixS + self.unitS
+    def _prefix(self, engExponent):
+        """
+        finds the unit prefix appropriate for an engineering notation exponent
+        :param int engExponent: engineering notation exponent
+        :return: (prefixS, foundPrefix)
+        """
+        prefixSet = siPrefixSet if self._prefixSet is None else self._prefixSet
+        prefixS = prefixSet.prefix(engExponent)
+        if prefixS is None:
+            return (prefixSet.fallbackS % engExponent).upper(), False
+        return prefixS, True
 
-        # we didn't find a prefix in the table
+    def _exactDecompose(self):
+        """
+        computes and caches the decomposition of an int, Decimal or Fraction value.
+        The engineering value is exact: a Decimal for a Decimal, otherwise a Fraction
+        :return: (exponent, engExponent, engValue, prefixS, foundPrefix)
+        """
+        value = self._value
+        if isinstance(value, Decimal) and not value.is_finite():
+            self._decompT = (None, None, None, None, None)
+        elif value == 0:
+            self._decompT = (0, 0, _exactScale(value, 0)) + self._prefix(0)
         else:
+            exponent, engExponent, _ = _exactDecompose(value, self._precision)
+            self._decompT = (exponent, engExponent, _exactScale(value, engExponent)) + self._prefix(engExponent)
+        return self._decompT
 
-            # do we have a units string?
-            if len(self.unitS) == 0:
-                s += "e%i" % self.engExponent
-            else:
-                s += "e%i " % self.engExponent + self.unitS
+    @property
+    def exponent(self):
+        """
+        :return int: base-10 exponent of the value
+        """
+        return self._decompose()[0]
 
-        return s
+    @property
+    def mantissa(self):
+        """
+        :return float: mantissa of the value, between 1.0 and 9.999...
+        """
+        exponent = self._decompose()[0]
+        if exponent is None:
+            return None
+        if self._prefixSet is not None and self._prefixSet.radix == 2:
+            return math.ldexp(float(self._value), -exponent)
+        if self._value.__class__ is not float and isinstance(self._value, _exactTypesT):
+            return _exactScale(self._value, exponent)
+        return _scale(self._value, exponent)
+
+    @property
+    def engExponent(self):
+        """
+        :return int: engineering notation exponent, a multiple of three
+        """
+        return self._decompose()[1]
+
+    @property
+    def engValue(self):
+        """
+        :return float: engineering notation value, between 1.0 and 999.999...
+        """
+        return self._decompose()[2]
+
+    @property
+    def prefixS(self):
+        """
+        :return string: unit prefix for the engineering notation exponent e.g. "k"
+        """
+        return self._decompose()[3]
+
+    @property
+    def foundPrefix(self):
+        """
+        :return boolean: true if the exponent was found in the prefix table
+        """
+        return self._decompose()[4]
+
+    def __repr__(self):
+        """
+        Returns the engineering formatted number as a string, optionally
+        with the units attached, if present. Uses the render cache when it is enabled
+        :return: a string representing the engineering number
+        """
+        if _renderCache.maxsize != 0:
+            return _renderCache.render(self)
+        return self._render()
+
+    def _render(self):
+        """
+        Renders the engineering formatted number as a string, with the formatter
+        compiled for this precision, unit string and prefix set
+        :return: a string representing the engineering number
+        """
+        formatter = _getFormatter(self._precision, self._unitS, self._prefixSet)
+
+        # ints, Decimals and Fractions take the exact path
+        if self._value.__class__ is not float and isinstance(self._value, _exactTypesT):
+            return formatter(self._value)
+
+        # handle the inf and nan cases specially
+        if not math.isfinite(self._value):
+            return formatter.special(self._value)
+
+        exponent, engExponent, engValue, _, _ = self._decompose()
+        return formatter.format(exponent, engExponent, engValue)
 
     def __str__(self):
         """
@@ -184,4 +943,1972 @@ class EngNotation:
         """
         return self.__repr__()
 
+    def __format__(self, specS):
+        """
+        Formats the engineering number with a format spec, so that it can be used in
+        f-strings e.g. f"{x:>12eng.2 Ohm}". See eng() for the spec mini-language.
+        The spec precision and unit override those of the number
+        :param string specS: format spec
+        :return: a string representing the engineering number
+        """
+        if not specS:
+            return self.__repr__()
+        alignS, precision, unitS = _parseSpec(specS)
+        if precision is None:
+            precision = self._precision
+        if unitS is None:
+            unitS = self._unitS
+        if precision == self._precision and unitS == self._unitS:
+            s = self.__repr__()
+        else:
+            s = _getFormatter(precision, unitS, self._prefixSet)(self._value)
+        if alignS:
+            return format(s, alignS)
+        return s
+
+    @staticmethod
+    def cache_configure(maxsize=1024):
+        """
+        Enables, resizes or disables the render cache shared by all instances.
+        The cache is disabled by default
+        :param int,None maxsize: maximum number of cached strings. 0 disables the
+            cache, and None makes it unbounded
+        """
+        _renderCache.configure(maxsize)
+
+    @staticmethod
+    def cache_clear():
+        """
+        Empties the render cache and resets its statistics
+        """
+        _renderCache.clear()
+
+    @staticmethod
+    def cache_info():
+        """
+        Reports the render cache statistics, in the style of functools.lru_cache
+        :return CacheInfo: (hits, misses, maxsize, currsize)
+        """
+        return _renderCache.info()
+
+
+class EngFormatter:
+    """
+    A reusable, callable formatter for a given precision, unit string and prefix set.
+    The nan and inf strings are compiled at construction, and the format string of
+    each exponent of the float range on its first use, into arrays indexed by exponent
+    e.g. EngFormatter(1, "Ohm")(98765432.1) returns "98.77 MOhm"
+    A binary prefix set gives a formatter for powers of two
+    e.g. EngFormatter(0, "B", binaryPrefixSet)(3 * 2 ** 20) returns "3.00 MiB"
+    """
+
+    __slots__ = ('precision', 'unitS', 'prefixSet', '_fmtT', '_fmtL', '_exactL', '_nanS', '_infS', '_negInfS')
+
+    def __new__(cls, precision=0, unitS='', prefixSet=None):
+        """
+        creates a formatter, for binary prefix sets a _BinaryEngFormatter
+        :param int precision: number of digits to be expressed, beyond 3
+        :param string unitS: optional unit string e.g. "Ohm" or "V"
+        :param PrefixSet prefixSet: optional prefix set, SI by default
+        """
+        if cls is EngFormatter and prefixSet is not None and prefixSet.radix == 2:
+            cls = _BinaryEngFormatter
+        return super().__new__(cls)
+
+    def __init__(self, precision=0, unitS='', prefixSet=None):
+        """
+        initializes the formatter
+        :param int precision: number of digits to be expressed, beyond 3
+        :param string unitS: optional unit string e.g. "Ohm" or "V"
+        :param PrefixSet prefixSet: optional prefix set, SI by default
+        """
+        self.precision = precision
+        self.unitS = unitS
+        self.prefixSet = siPrefixSet if prefixSet is None else prefixSet
+
+        # the nan and inf strings, with the unit attached if present
+        unitSuffixS = ' ' + unitS if len(unitS) > 0 else ''
+        self._nanS = 'NAN' + unitSuffixS
+        self._infS = 'INF' + unitSuffixS
+        self._negInfS = '-INF' + unitSuffixS
+
+        # the precision in the format string speaks to the number of decimal digits
+        # beyond 3. Each band (<10, <100, else) needs one less decimal digit
+        numDigits = 3 + precision
+        self._fmtT = tuple('%%.%if' % (numDigits - 1 - exponentMod) for exponentMod in range(3))
+        if self.prefixSet.radix != 10:
+            return
+
+        # the complete format string and exact layout of each base-10 exponent of the
+        # float range, indexed by exponent - _pow10MinExp. They are compiled on first
+        # use, so that a formatter is cheap to build
+        self._fmtL = [None] * len(_pow10L)
+        self._exactL = [None] * len(_pow10L)
+
+    def __call__(self, value):
+        """
+        Expresses a value in engineering notation. Ints and Decimals are expressed
+        exactly, from their str() digits, with formatExact() inlined
+        :param float,int,Decimal,Fraction value: value to be expressed
+        :return: a string representing the engineering number
+        """
+        valueClass = value.__class__
+        if valueClass is not int and valueClass is not Decimal:
+            if valueClass is not float and isinstance(value, _exactTypesT):
+                return self.formatExact(value)
+            if not math.isfinite(value):
+                return self.special(value)
+            return self.format(*_engDecompose(value, self.precision))
+
+        try:
+            digitsS = str(value)
+        except ValueError:
+            # an int beyond the int to str conversion limit
+            return self.formatExact(value)
+        if digitsS[0] == '-':
+            signS = '-'
+            digitsS = digitsS[1:]
+        else:
+            signS = ''
+        if valueClass is int:
+            exponent = len(digitsS) - 1
+        elif value.is_finite():
+            if 'E' in digitsS:
+                digitsS = digitsS.partition('E')[0]
+            digitsS = digitsS.replace('.', '').lstrip('0')
+            exponent = value.adjusted()
+        else:
+            return self.special(float(value))
+        if digitsS == '0' or not digitsS:
+            return self.format(0, 0, 0.0)
+
+        # pad, or round half-even as _roundDigits() does
+        numDigits = 3 + self.precision
+        if len(digitsS) > numDigits:
+            roundS = digitsS[numDigits]
+            keptS = digitsS[:numDigits]
+            if roundS >= '5' and (roundS > '5' or keptS[-1] in '13579' or digitsS[numDigits + 1:].strip('0')):
+                keptS = str(int(keptS) + 1)
+                if len(keptS) > numDigits:
+                    exponent += 1
+                    keptS = keptS[:numDigits]
+            digitsS = keptS
+        elif len(digitsS) < numDigits:
+            digitsS += '0' * (numDigits - len(digitsS))
+
+        exponentIdx = exponent - _pow10MinExp
+        layoutT = self._exactL[exponentIdx] if 0 <= exponentIdx < len(_pow10L) else None
+        if layoutT is None:
+            layoutT = self.exactLayout(exponent)
+        intDigits, suffixS = layoutT
+        if intDigits < numDigits:
+            return signS + digitsS[:intDigits] + '.' + digitsS[intDigits:] + suffixS
+        return signS + digitsS + suffixS
+
+    def formatExact(self, value):
+        """
+        Expresses an int, Decimal or Fraction exactly, without float conversion
+        :param int,Decimal,Fraction value: value to be expressed
+        :return: a string representing the engineering number
+        """
+        if isinstance(value, Decimal) and not value.is_finite():
+            return self.special(float(value))
+        if not value:
+            return self.format(0, 0, 0.0)
+
+        numDigits = 3 + self.precision
+        signS, digitsS, exponent = _exactDigits(value, numDigits)
+        digitsS, exponent = _roundDigits(digitsS, exponent, numDigits)
+        intDigits, suffixS = self.exactLayout(exponent)
+        if intDigits < numDigits:
+            return signS + digitsS[:intDigits] + '.' + digitsS[intDigits:] + suffixS
+        return signS + digitsS + suffixS
+
+    def exactLayout(self, exponent):
+        """
+        Returns the layout of an exactly expressed value with the given base-10 exponent
+        :param int exponent: base-10 exponent of the value
+        :return: (number of digits before the decimal point, suffix string)
+        """
+        exponentIdx = exponent - _pow10MinExp
+        if 0 <= exponentIdx < len(_pow10L) and self._exactL[exponentIdx] is not None:
+            return self._exactL[exponentIdx]
+        exponentMod = exponent % 3
+        layoutT = (exponentMod + 1, self.suffix(exponent - exponentMod))
+        if 0 <= exponentIdx < len(_pow10L):
+            self._exactL[exponentIdx] = layoutT
+        return layoutT
+
+    def format(self, exponent, engExponent, engValue):
+        """
+        Formats an engineering notation decomposition of a float, as returned by
+        _engDecompose(). The format string of each float exponent is compiled on first use
+        :param int exponent: base-10 exponent of the value
+        :param int engExponent: engineering notation exponent, a multiple of three
+        :param float engValue: engineering notation value
+        :return: a string representing the engineering number
+        """
+        fmtS = self._fmtL[exponent - _pow10MinExp]
+        if fmtS is None:
+            fmtS = self.formatString(exponent)
+        return fmtS % engValue
+
+    def suffix(self, engExponent):
+        """
+        Returns the prefix and unit suffix for an engineering notation exponent e.g. " kOhm"
+        :param int engExponent: engineering notation exponent, a multiple of three
+        :return: the suffix string
+        """
+        prefixS = self.prefixSet.prefix(engExponent)
+        if prefixS is None:
+            return self.fallbackSuffix(engExponent)
+
+        # do we have a units string?
+        if len(self.unitS) == 0:
+            return prefixS
+        return " " + prefixS + self.unitS
+
+    def fallbackSuffix(self, engExponent):
+        """
+        Returns the suffix for an exponent that isn't in the prefix set e.g. "e33 Ohm"
+        :param int engExponent: engineering notation exponent, a multiple of three
+        :return: the suffix string
+        """
+        # do we have a units string?
+        if len(self.unitS) == 0:
+            return self.prefixSet.fallbackS % engExponent
+        return self.prefixSet.fallbackS % engExponent + " " + self.unitS
+
+    def formatString(self, exponent):
+        """
+        Returns the complete format string, for values with the given base-10 exponent
+        :param int exponent: base-10 exponent of the value
+        :return: a %-style format string e.g. "%.1f kOhm"
+        """
+        exponentIdx = exponent - _pow10MinExp
+        if 0 <= exponentIdx < len(_pow10L) and self._fmtL[exponentIdx] is not None:
+            return self._fmtL[exponentIdx]
+        exponentMod = exponent % 3
+        fmtS = self._fmtT[exponentMod] + self.suffix(exponent - exponentMod).replace('%', '%%')
+        if 0 <= exponentIdx < len(_pow10L):
+            self._fmtL[exponentIdx] = fmtS
+        return fmtS
+
+    def decompose(self, value):
+        """
+        Returns the engineering notation decomposition of a finite float
+        :param float value: finite value to be expressed
+        :return: (exponent, engExponent, engValue)
+        """
+        return _engDecompose(value, self.precision)
+
+    def special(self, value):
+        """
+        Returns the string for a nan or inf value
+        :param float value: nan, inf or -inf
+        :return: "NAN", "INF" or "-INF", with the unit attached if present
+        """
+        if math.isnan(value):
+            return self._nanS
+        if value < 0:
+            return self._negInfS
+        return self._infS
+
+
+class _BinaryEngFormatter(EngFormatter):
+    """
+    An EngFormatter for a binary (radix 2) prefix set: values are scaled by a power
+    of two that is a multiple of the set's step, e.g. 1024 for IEC prefixes, and shown
+    with 3 + precision significant digits (four integer digits from 1000 to 1023).
+    ints, Decimals and Fractions are converted to float
+    """
+
+    __slots__ = ()
+
+    def __call__(self, value):
+        """
+        Expresses a value with binary prefixes
+        :param float,int,Decimal,Fraction value: value to be expressed
+        :return: a string representing the number
+        """
+        value = float(value)
+        if not math.isfinite(value):
+            return self.special(value)
+        binaryExponent, engExponent, engValue = self.decompose(value)
+        return self.format(binaryExponent, engExponent, engValue)
+
+    def decompose(self, value):
+        """
+        Returns the binary decomposition of a finite float. If rounding to the
+        precision carries to the next power of the step e.g. 1023.6 shown as "1024",
+        the power is bumped so that it is shown as "1.00Ki"
+        :param float value: finite value to be expressed
+        :return: (binary exponent, power of two of the prefix, scaled value)
+        """
+        if value == 0:
+            return 0, 0, 0.0
+        step = self.prefixSet.step
+        binaryExponent = math.frexp(value)[1] - 1
+        engExponent = binaryExponent - binaryExponent % step
+        engValue = math.ldexp(value, -engExponent)
+        if round(abs(engValue), self._decimals(engValue)) >= 2.0 ** step:
+            engExponent += step
+            engValue = math.ldexp(value, -engExponent)
+        return binaryExponent, engExponent, engValue
+
+    def _decimals(self, engValue):
+        """
+        returns the number of decimals for a scaled value, after any carry into the
+        next decade from rounding
+        :param float engValue: scaled value
+        :return int: number of decimals
+        """
+        absValue = abs(engValue)
+        intDigits = 1
+        while absValue >= 10.0 ** intDigits:
+            intDigits += 1
+        decimals = max(3 + self.precision - intDigits, 0)
+        if round(absValue, decimals) >= 10.0 ** intDigits:
+            decimals = max(decimals - 1, 0)
+        return decimals
+
+    def format(self, exponent, engExponent, engValue):
+        """
+        Formats a binary decomposition, as returned by decompose()
+        :param int exponent: binary exponent of the value
+        :param int engExponent: power of two of the prefix, a multiple of the step
+        :param float engValue: scaled value
+        :return: a string representing the number
+        """
+        return '%.*f' % (self._decimals(engValue), engValue) + self.suffix(engExponent)
+
+    def formatExact(self, value):
+        """
+        Binary prefixes have no exact path: the value is converted to float
+        :param int,Decimal,Fraction value: value to be expressed
+        :return: a string representing the number
+        """
+        return self(value)
+
+    def formatString(self, exponent):
+        """
+        Binary formatters have no per-exponent format strings
+        """
+        raise TypeError("binary prefix sets are only supported by scalar formatting")
+
+
+# formatters are looked up on every render, so the cache holds enough (precision, unit
+# string) pairs for large multi-channel tables. A formatter is cheap to build, about
+# 4 us, and takes about 10 KB once its exponents are compiled
+@functools.lru_cache(maxsize=1024)
+def _getFormatter(precision, unitS, prefixSet=None):
+    """
+    returns the formatter for a precision, unit string and prefix set, compiling it on first use
+    :param int precision: number of digits to be expressed, beyond 3
+    :param string unitS: optional unit string e.g. "Ohm" or "V"
+    :param PrefixSet prefixSet: optional prefix set, SI by default
+    :return EngFormatter: the formatter
+    """
+    return EngFormatter(precision, unitS, prefixSet)
+
+
+# format spec mini-language: [[fill]align][width][eng][.precision][ unit]
+_specRe = re.compile(r'(?:(.)?([<>^]))?(\d+)?(?:eng)?(?:\.(\d+))?(?: (.*))?\Z', re.DOTALL)
+
+
+@functools.lru_cache(maxsize=256)
+def _parseSpec(specS):
+    """
+    parses a format spec, caching the result so that repeated templates aren't re-parsed
+    :param string specS: format spec e.g. ">12eng.2 Ohm"
+    :return: (alignS, precision, unitS) where alignS is a str format spec for the
+        padding, and precision or unitS are None when not given
+    """
+    match = _specRe.match(specS)
+    if match is None:
+        raise ValueError("Invalid format specifier %r for engineering notation" % specS)
+    fillS, alignS, widthS, precisionS, unitS = match.groups()
+
+    # numbers are right aligned, unless another alignment is given
+    if widthS is None:
+        alignS = ''
+    else:
+        alignS = (fillS or '') + (alignS or '>') + widthS
+    return alignS, None if precisionS is None else int(precisionS), unitS
+
+
+def eng(value, specS=''):
+    """
+    Expresses a value in engineering notation with a format spec, the same spec that
+    EngNotation objects take in f-strings and format()
+    e.g. eng(98765432.1, ">12eng.1 Ohm") returns "  98.77 MOhm"
+    The spec is [[fill]align][width][eng][.precision][ unit] where align is <, > or ^
+    (the default is >), precision is the number of digits beyond 3 (default 0), and
+    the unit follows a single space
+    :param float,int,Decimal,Fraction value: value to be expressed
+    :param string specS: format spec
+    :return: a string representing the engineering number
+    """
+    alignS, precision, unitS = _parseSpec(specS)
+    s = _getFormatter(precision or 0, unitS or '')(value)
+    if alignS:
+        return format(s, alignS)
+    return s
+
+
+# arrays smaller than this are always formatted serially by format_array()
+parallelMinSize = 200000
+
+
+def format_array(values, precision=0, unitS='', workers=None):
+    """
+    Expresses every value of an array in engineering notation. The exponent, band
+    (<10, <100, else) and prefix choices are made for the whole array at once, and the
+    output is identical to str(EngNotation(value, precision, unitS)) for each element
+    :param array_like values: values to be expressed. Python ints, Decimals and Fractions,
+        in a list or an object array, are expressed exactly as EngNotation expresses them,
+        and every other value is converted to float64
+    :param int precision: number of digits to be expressed, beyond 3
+    :param string unitS: optional unit string e.g. "Ohm" or "V"
+    :param int,None workers: number of processes to format large arrays with. The
+        values are passed to the processes through shared memory. None or 1 formats
+        serially, as do arrays with fewer than parallelMinSize values
+    :return: numpy array of strings, with the same shape as values
+    """
+    if _numpy() is None:
+        raise ImportError("format_array() requires numpy")
+
+    # numeric arrays hold no exact values. Anything else is scanned for them, and they
+    # are formatted one by one while the floats are batched
+    if not isinstance(values, np.ndarray) or values.dtype == object:
+        objectA = np.asarray(values, dtype=object)
+        if any(issubclass(valueClass, _exactTypesT) for valueClass in set(map(type, objectA.flat)) - {float}):
+            exactA = np.fromiter((isinstance(v, _exactTypesT) for v in objectA.flat), dtype=bool,
+                                 count=objectA.size).reshape(objectA.shape)
+            formatter = _getFormatter(precision, unitS)
+            resultA = np.empty(objectA.shape, dtype=object)
+            resultA[exactA] = [formatter(v) for v in objectA[exactA].tolist()]
+            resultA[~exactA] = format_array(objectA[~exactA].astype(np.float64), precision, unitS, workers)
+            return resultA.astype(np.str_)
+        values = objectA
+
+    valueA = np.asarray(values, dtype=np.float64)
+    if workers is not None and workers > 1 and valueA.size >= parallelMinSize:
+        return _formatArrayParallel(valueA, precision, unitS, workers)
+    return _formatArray(valueA.ravel(), precision, unitS).reshape(valueA.shape)
+
+
+def _formatArray(flatA, precision, unitS):
+    """
+    formats a 1-D float64 array serially, see format_array()
+    :param numpy.ndarray flatA: values to be expressed
+    :param int precision: number of digits to be expressed, beyond 3
+    :param string unitS: optional unit string e.g. "Ohm" or "V"
+    :return: 1-D numpy array of strings
+    """
+    global _pow10A
+    if _pow10A is None:
+        _pow10A = np.array(_pow10L)
+
+    formatter = _getFormatter(precision, unitS)
+
+    # retrieve the base-10 exponent of the finite, non-zero values the same way
+    # _engDecompose does: estimate it from the binary exponent, then correct it
+    # with a comparison against the power of ten table
+    finiteIdxA = np.flatnonzero(np.isfinite(flatA) & (flatA != 0.0))
+    nzValueA = flatA[finiteIdxA]
+    absValueA = np.abs(nzValueA)
+    exponentA = ((np.frexp(absValueA)[1].astype(np.int64) - 1) * 78913) >> 18
+    exponentA += absValueA >= _pow10A[exponentA + 1 - _pow10MinExp]
+
+    # generate the engineering format version of the values and their exponents,
+    # scaling the same way as _scale(). The subnormal range is left to the scalar path
+    exponentModA = exponentA % 3
+    engExponentA = exponentA - exponentModA
+    engValueA = nzValueA / _pow10A[np.maximum(engExponentA, -306) - _pow10MinExp]
+
+    # the values that may round up into the next band, and the subnormal values,
+    # are redone by the scalar path
+    limitA = np.array(_bandLimitT)[exponentModA]
+    decimalsA = (2 + precision - exponentModA).astype(np.float64)
+    fixIdxA = np.flatnonzero((np.abs(engValueA) >= limitA - 10.0 ** -decimalsA) | (engExponentA < -306))
+    for i in fixIdxA:
+        exponentA[i], _, engValueA[i] = _engDecompose(float(nzValueA[i]), precision)
+
+    # group the finite values by exponent, so that each group is formatted with
+    # a single format string from the formatter
+    orderA = np.argsort(exponentA, kind='stable')
+    splitA = np.flatnonzero(np.diff(exponentA[orderA])) + 1
+    resultA = np.empty(flatA.size, dtype=object)
+    for groupIdxA in np.split(orderA, splitA):
+        if groupIdxA.size == 0:
+            continue
+        fmtS = formatter.formatString(int(exponentA[groupIdxA[0]]))
+        resultA[finiteIdxA[groupIdxA]] = [fmtS % v for v in engValueA[groupIdxA].tolist()]
+
+    # zeros, and the inf and nan strings
+    resultA[flatA == 0.0] = formatter(0.0)
+    resultA[np.isnan(flatA)] = formatter.special(math.nan)
+    resultA[flatA == np.inf] = formatter.special(math.inf)
+    resultA[flatA == -np.inf] = formatter.special(-math.inf)
+
+    return resultA.astype(np.str_)
+
+
+def _valueList(values):
+    """
+    returns the values to be formatted as a list. The elements of a numeric numpy array
+    become floats, as EngNotation expresses numpy scalars, while Python ints, Decimals and
+    Fractions are kept, to be expressed exactly
+    :param iterable values: values to be expressed
+    :return list: the values
+    """
+    if _isArray(values):
+        return (values if values.dtype == object else values.astype(np.float64)).tolist()
+    return list(values)
+
+
+def format_column(values, precision=0, unitS='', engExponent=None, width=None, align='>'):
+    """
+    Expresses a column of values with one common engineering exponent and prefix,
+    e.g. all in "mA", so that tables line up and can be compared at a glance. The
+    exponent is chosen once, from the largest magnitude in the column, and the
+    number of decimals is the one that gives that value 3 + precision digits.
+    Each value is then a single scale and format. The strings are padded to a
+    common width
+    :param iterable values: values to be expressed
+    :param int precision: number of digits to be expressed for the largest value, beyond 3
+    :param string unitS: optional unit string e.g. "Ohm" or "V"
+    :param int,None engExponent: common exponent, a multiple of three. None picks it
+        from the largest magnitude in the column
+    :param int,None width: width to pad every string to. None pads to the widest string
+    :param string align: "<", ">" or "^", to left, right or center align the strings
+    :return list: the formatted and padded strings
+    """
+    formatter = _getFormatter(precision, unitS)
+    valueL = _valueList(values)
+
+    # find the exponent of the largest finite magnitude, and the common exponent
+    hasExact = any(issubclass(valueClass, _exactTypesT) for valueClass in set(map(type, valueL)) - {float})
+    maxAbs = max([abs(v) for v in valueL if (_isFinite(v) if hasExact else math.isfinite(v))], default=0.0)
+    if maxAbs.__class__ is not float and isinstance(maxAbs, _exactTypesT) and maxAbs != 0:
+        maxExponent, maxEngExponent, _ = _exactDecompose(maxAbs, precision)
+    else:
+        maxExponent, maxEngExponent, _ = _engDecompose(float(maxAbs), precision)
+    if engExponent is None:
+        engExponent = maxEngExponent
+    elif engExponent % 3 != 0:
+        raise ValueError("engExponent must be a multiple of three, not %r" % engExponent)
+
+    # one format string, and one scale, for the whole column. Ints, Decimals and
+    # Fractions are scaled and rounded exactly, to the same number of decimals
+    decimals = max(0, 2 + precision - (maxExponent - engExponent))
+    suffixS = formatter.suffix(engExponent)
+    fmtS = '%.' + str(decimals) + 'f' + suffixS.replace('%', '%%')
+    if not hasExact and maxEngExponent <= engExponent <= 306 and engExponent >= -306:
+        # the common case: a normal power of ten, and no scaled value beyond 1000
+        divisor = _pow10L[engExponent - _pow10MinExp]
+        stringL = [fmtS % (v / divisor) if math.isfinite(v) else formatter.special(v) for v in valueL]
+    else:
+        stringL = []
+        for v in valueL:
+            exact = v.__class__ is not float and isinstance(v, _exactTypesT)
+            if not _isFinite(v):
+                stringL.append(formatter.special(float(v)))
+                continue
+            if not exact and -324 <= engExponent <= 306:
+                # subnormal powers of ten are scaled by _scale(), as EngNotation does
+                try:
+                    engValue = _scale(v, engExponent)
+                except OverflowError:
+                    engValue = math.inf
+                if not math.isinf(engValue):
+                    stringL.append(fmtS % engValue)
+                    continue
+            # beyond the float range, and for exact values, the value is scaled exactly
+            stringL.append(_exactFixed(v if exact else Fraction(v), engExponent, decimals) + suffixS)
+
+    # pad every string to the common width
+    if width is None:
+        width = max([len(s) for s in stringL], default=0)
+    padS = '{:' + align + str(width) + '}'
+    return [padS.format(s) for s in stringL]
+
+
+def format_into(buffer, values, precision=0, unitS='', width=None, sep=b'', align='>', offset=0):
+    """
+    Writes the engineering notation strings of many values straight into a writable
+    buffer, one fixed-width slot per value, each followed by an optional separator.
+    The strings are formatted directly as bytes (utf-8), with the same rules as
+    EngNotation, so no intermediate str objects are built, encoded and joined.
+    A numpy array of dtype "S" may also be passed, with one value per element: its
+    item size is the width, the strings are left aligned and NUL padded, and no
+    separator is allowed
+    :param bytearray,memoryview,numpy.ndarray buffer: writable buffer to write into
+    :param iterable values: values to be expressed
+    :param int precision: number of digits to be expressed, beyond 3
+    :param string unitS: optional unit string e.g. "Ohm" or "V"
+    :param int,None width: width of each slot, in bytes. Required, except for numpy arrays
+    :param bytes sep: separator written after each slot e.g. b"\\n"
+    :param string align: "<", ">" or "^", to left, right or center align the strings, space padded
+    :param int offset: position in the buffer of the first slot
+    :return int: the number of bytes written
+    """
+    if _isArray(buffer):
+        if buffer.dtype.kind != 'S' or len(sep) > 0:
+            raise ValueError("numpy buffers must have dtype 'S', and no separator")
+        if not buffer.flags.c_contiguous:
+            # reshaping a non-contiguous array would write into a copy
+            raise ValueError("numpy buffers must be C-contiguous")
+        width = buffer.dtype.itemsize
+        fillB = b'\0'
+        align = '<'
+        mv = memoryview(buffer.reshape(-1)).cast('B')
+    else:
+        if width is None:
+            raise ValueError("the slot width is required")
+        fillB = b' '
+        mv = memoryview(buffer).cast('B')
+
+    valueL = _valueList(values)
+    slot = width + len(sep)
+    size = slot * len(valueL)
+    if offset + size > len(mv):
+        raise ValueError("the buffer holds %i bytes, %i are needed" % (len(mv) - offset, size))
+
+    # fill the slots and separators, a block at a time
+    blockSlots = 4096
+    blockB = (fillB * width + sep) * blockSlots
+    for start in range(offset, offset + size, len(blockB)):
+        stop = min(start + len(blockB), offset + size)
+        mv[start:stop] = blockB[:stop - start]
+
+    # the bytes format string for each exponent, and the nan and inf strings
+    formatter = _getFormatter(precision, unitS)
+    fmtD = {}
+    specialD = {v: formatter.special(v).encode() for v in (math.inf, -math.inf)}
+    nanB = formatter.special(math.nan).encode()
+
+    pos = offset
+    for value in valueL:
+        if value.__class__ is not float and isinstance(value, _exactTypesT):
+            # ints, Decimals and Fractions are expressed exactly
+            pieceB = formatter(value).encode()
+        elif math.isfinite(value):
+            exponent, engExponent, engValue = _engDecompose(value, precision)
+            fmtB = fmtD.get(exponent)
+            if fmtB is None:
+                fmtB = fmtD[exponent] = formatter.formatString(exponent).encode()
+            pieceB = fmtB % engValue
+        else:
+            pieceB = specialD.get(value, nanB)
+
+        n = len(pieceB)
+        if n > width:
+            raise ValueError("%r needs %i bytes, the slot width is %i" % (pieceB, n, width))
+        if align == '>':
+            start = pos + width - n
+        elif align == '<':
+            start = pos
+        else:
+            start = pos + (width - n) // 2
+        mv[start:start + n] = pieceB
+        pos += slot
+
+    return size
+
+
+def _formatArrayChunk(shmName, size, start, stop, precision, unitS):
+    """
+    formats a slice of an array held in shared memory, in a worker process
+    :param string shmName: name of the shared memory block holding the float64 values
+    :param int size: number of values in the shared memory block
+    :param int start: index of the first value to format
+    :param int stop: index beyond the last value to format
+    :param int precision: number of digits to be expressed, beyond 3
+    :param string unitS: optional unit string e.g. "Ohm" or "V"
+    :return: 1-D numpy array of strings
+    """
+    from multiprocessing import shared_memory
+
+    _numpy()
+    shm = shared_memory.SharedMemory(name=shmName)
+    flatA = np.ndarray((size,), dtype=np.float64, buffer=shm.buf)
+    try:
+        return _formatArray(flatA[start:stop], precision, unitS)
+    finally:
+        del flatA
+        shm.close()
+
+
+def _formatArrayParallel(valueA, precision, unitS, workers):
+    """
+    formats an array in chunks, in a pool of worker processes, see format_array().
+    The values are copied once into shared memory instead of being pickled
+    :param numpy.ndarray valueA: float64 values to be expressed
+    :param int precision: number of digits to be expressed, beyond 3
+    :param string unitS: optional unit string e.g. "Ohm" or "V"
+    :param int workers: number of worker processes
+    :return: numpy array of strings, with the same shape as valueA
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing import shared_memory
+
+    size = valueA.size
+    shm = shared_memory.SharedMemory(create=True, size=valueA.nbytes)
+    try:
+        np.ndarray((size,), dtype=np.float64, buffer=shm.buf)[:] = valueA.ravel()
+
+        # a few chunks per worker, to even out the load
+        boundaryL = np.linspace(0, size, workers * 4 + 1).astype(int).tolist()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futureL = [
+                executor.submit(_formatArrayChunk, shm.name, size, start, stop, precision, unitS)
+                for start, stop in zip(boundaryL[:-1], boundaryL[1:]) if stop > start
+            ]
+            resultA = np.concatenate([future.result() for future in futureL])
+    finally:
+        shm.close()
+        shm.unlink()
+
+    return resultA.reshape(valueA.shape)
+
+
+# values that the async API formats one by one, rather than through format_array()
+_chunkScalarTypesT = (EngNotation,) + _exactTypesT
+
+
+def _formatChunk(chunkL, precision, unitS):
+    """
+    Expresses one chunk of values in engineering notation, for the async API.
+    A chunk of floats goes through format_array() when numpy is installed
+    :param list chunkL: values or EngNotation objects
+    :param int precision: number of digits to be expressed, beyond 3
+    :param string unitS: optional unit string e.g. "Ohm" or "V"
+    :return list: strings representing the engineering numbers
+    """
+    if not any(isinstance(value, _chunkScalarTypesT) for value in chunkL) and _numpy() is not None:
+        return format_array(np.asarray(chunkL, dtype=np.float64), precision, unitS).tolist()
+    formatter = _getFormatter(precision, unitS)
+    return [repr(value) if isinstance(value, EngNotation) else formatter(value) for value in chunkL]
+
+
+async def aiter_format(values, precision=0, unitS='', chunk_size=10000, executor=None):
+    """
+    Expresses values in engineering notation, chunk by chunk, without blocking the
+    event loop: between chunks it yields to the loop, or each chunk runs in an executor
+    e.g. async for chunkL in aiter_format(values, unitS="V"): ...
+    :param iterable values: values, or EngNotation objects which keep their own precision and unit
+    :param int precision: number of digits to be expressed, beyond 3
+    :param string unitS: optional unit string e.g. "Ohm" or "V"
+    :param int chunk_size: number of values formatted between yields to the loop
+    :param concurrent.futures.Executor executor: optional executor to run the chunks in
+    :return: an async generator of lists of strings
+    """
+    import asyncio
+
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    loop = asyncio.get_running_loop()
+    valueI = iter(values)
+    while True:
+        chunkL = list(itertools.islice(valueI, chunk_size))
+        if not chunkL:
+            return
+        if executor is None:
+            yield _formatChunk(chunkL, precision, unitS)
+            await asyncio.sleep(0)
+        else:
+            yield await loop.run_in_executor(executor, _formatChunk, chunkL, precision, unitS)
+
+
+async def aformat_many(values, precision=0, unitS='', chunk_size=10000, executor=None):
+    """
+    Expresses values in engineering notation without blocking the event loop.
+    See aiter_format()
+    e.g. stringL = await aformat_many(values, unitS="V")
+    :param iterable values: values, or EngNotation objects which keep their own precision and unit
+    :param int precision: number of digits to be expressed, beyond 3
+    :param string unitS: optional unit string e.g. "Ohm" or "V"
+    :param int chunk_size: number of values formatted between yields to the loop
+    :param concurrent.futures.Executor executor: optional executor to run the chunks in
+    :return list: strings representing the engineering numbers
+    """
+    resultL = []
+    async for chunkL in aiter_format(values, precision, unitS, chunk_size, executor):
+        resultL.extend(chunkL)
+    return resultL
+
+
+def parse_eng(s, unitS=None):
+    """
+    Parses a string in the format produced by EngNotation e.g. "98.77 MOhm",
+    "-420.00000000e-27 J", "1.00k" or "NAN V", back into its value and unit string.
+    Without a unit hint, a unit string that starts with a prefix letter is taken to
+    be prefixed, so "1.00 Pa" parses as (1e15, "a"). Pass unitS="Pa" to remove the
+    ambiguity
+    :param string s: string to be parsed
+    :param string,None unitS: optional expected unit string e.g. "Ohm"
+    :return: (float value, unit string)
+    """
+    numS, _, tailS = s.strip().partition(' ')
+
+    # separate the prefix and the unit string, if any
+    if len(tailS) > 0:
+        if unitS is not None:
+            if not tailS.endswith(unitS) or len(unitS) == 0:
+                raise ValueError("expected unit %r in %r" % (unitS, s))
+            prefixS = tailS[:len(tailS) - len(unitS)]
+        elif len(tailS) > 1 and tailS[0] in _prefixExpD:
+            prefixS = tailS[0]
+            unitS = tailS[1:]
+        else:
+            prefixS = ''
+            unitS = tailS
+    else:
+        if unitS:
+            raise ValueError("expected unit %r in %r" % (unitS, s))
+        unitS = ''
+        prefixS = numS[-1:]
+        if prefixS in _prefixExpD:
+            numS = numS[:-1]
+        else:
+            prefixS = ''
+
+    # append the prefix exponent to the mantissa, so that the value is converted
+    # with a single correctly rounded float()
+    if len(prefixS) > 0:
+        expS = _prefixExpD.get(prefixS)
+        if expS is None:
+            raise ValueError("unknown prefix %r in %r" % (prefixS, s))
+        numS += expS
+
+    return float(numS), unitS
+
+
+def parse_eng_many(strings, unitS=None):
+    """
+    Parses many strings in the format produced by EngNotation, see parse_eng()
+    :param iterable,numpy.ndarray strings: strings to be parsed. A numpy array of
+        str or bytes may be passed
+    :param string,None unitS: optional expected unit string e.g. "Ohm"
+    :return: a list of (value, unit string) tuples or, for a numpy array, a
+        (float64 value array, unit string array) tuple with the shape of strings
+    """
+    if _isArray(strings):
+        stringL = strings.ravel().tolist()
+        if strings.dtype.kind == 'S':
+            stringL = [b.decode('ascii') for b in stringL]
+        parsedL = [parse_eng(s, unitS) for s in stringL]
+        valueA = np.array([p[0] for p in parsedL], dtype=np.float64).reshape(strings.shape)
+        unitA = np.array([p[1] for p in parsedL], dtype=np.str_).reshape(strings.shape)
+        return valueA, unitA
+
+    return [parse_eng(s, unitS) for s in strings]
+
+
+class _EngSeriesAccessor:
+    """
+    The pandas Series.eng accessor, see register_pandas_accessors()
+    """
+
+    def __init__(self, series):
+        """
+        :param pandas.Series series: the series the accessor is attached to
+        """
+        self._series = series
+
+    def format(self, precision=0, unitS='', workers=None):
+        """
+        Expresses every value of the series in engineering notation, with the batch formatter
+        e.g. df["R"].eng.format(precision=1, unitS="Ohm")
+        :param int precision: number of digits to be expressed, beyond 3
+        :param string unitS: optional unit string e.g. "Ohm" or "V"
+        :param int,None workers: number of processes, see format_array()
+        :return pandas.Series: the formatted strings, with the same index and name
+        """
+        import pandas as pd
+
+        # object series may hold ints, Decimals and Fractions, which format_array() expresses exactly
+        valueA = self._series.to_numpy(dtype=object if self._series.dtype == object else np.float64,
+                                       na_value=np.nan)
+        return pd.Series(
+            format_array(valueA, precision, unitS, workers=workers),
+            index=self._series.index, name=self._series.name, dtype=object)
+
+    def parse(self, unitS=None):
+        """
+        Parses a series of engineering notation strings, see parse_eng(). Missing
+        values (None, NaN, NA) and other non-string entries become NaN
+        :param string,None unitS: optional expected unit string e.g. "Ohm"
+        :return pandas.Series: the float values, with the same index and name
+        """
+        import pandas as pd
+
+        stringA = self._series.to_numpy(dtype=object)
+        isStringA = np.fromiter((isinstance(s, str) for s in stringA), dtype=bool, count=stringA.size)
+        valueA = np.full(stringA.shape, np.nan)
+        valueA[isStringA] = parse_eng_many(stringA[isStringA], unitS)[0]
+        return pd.Series(valueA, index=self._series.index, name=self._series.name)
+
+
+class _EngDataFrameAccessor:
+    """
+    The pandas DataFrame.eng accessor, see register_pandas_accessors()
+    """
+
+    def __init__(self, df):
+        """
+        :param pandas.DataFrame df: the data frame the accessor is attached to
+        """
+        self._df = df
+
+    def format(self, unitD, precision=0, workers=None):
+        """
+        Expresses the chosen columns in engineering notation
+        e.g. df.eng.format({"R": "Ohm", "C": "F"}, precision=1)
+        :param dict unitD: unit string for each column to be formatted
+        :param int,dict precision: number of digits beyond 3, for all columns or per column
+        :param int,None workers: number of processes, see format_array()
+        :return pandas.DataFrame: a copy of the data frame, with the columns formatted
+        """
+        resultDf = self._df.copy()
+        for column, unitS in unitD.items():
+            columnPrecision = precision.get(column, 0) if isinstance(precision, dict) else precision
+            resultDf[column] = self._df[column].eng.format(columnPrecision, unitS, workers=workers)
+        return resultDf
+
+    def parse(self, columns, unitS=None):
+        """
+        Parses the chosen columns of engineering notation strings, see parse_eng()
+        :param list,dict columns: columns to be parsed, or a dict of the expected
+            unit string for each column
+        :param string,None unitS: optional expected unit string for every column
+        :return pandas.DataFrame: a copy of the data frame, with the columns parsed
+        """
+        resultDf = self._df.copy()
+        for column in columns:
+            columnUnitS = columns[column] if isinstance(columns, dict) else unitS
+            resultDf[column] = self._df[column].eng.parse(columnUnitS)
+        return resultDf
+
+
+def register_pandas_accessors():
+    """
+    Registers the "eng" accessor on pandas Series and DataFrames, so that e.g.
+    df["R"].eng.format(precision=1, unitS="Ohm"), df.eng.format({"R": "Ohm", "C": "F"})
+    and df["R"].eng.parse() work. pandas is only imported when this is called.
+    Formatting is batched through format_array(), and nan/inf are rendered
+    exactly as by EngNotation
+    """
+    import pandas as pd
+
+    if _numpy() is None:
+        raise ImportError("the pandas accessors require numpy")
+    if getattr(pd.Series, 'eng', None) is not _EngSeriesAccessor:
+        pd.api.extensions.register_series_accessor('eng')(_EngSeriesAccessor)
+        pd.api.extensions.register_dataframe_accessor('eng')(_EngDataFrameAccessor)
+
+
+class EngStream:
+    """
+    A stateful formatter for a sequence of readings from one channel. The current
+    engineering exponent and prefix are remembered, and reused while new values stay
+    in their range, so the exponent search only runs when a value crosses a band edge.
+    With hysteresis, the prefix is kept until a value is beyond the range by that
+    fraction, which stops the prefix flickering for values close to an edge e.g.
+    "999 mV", "1.00 V", "998 mV". Without hysteresis, the strings are identical to EngNotation,
+    ints, Decimals and Fractions included
+    """
+
+    __slots__ = ('precision', 'unitS', 'hysteresis', '_formatter', '_engExponent', '_suffixS',
+                 '_loLimit', '_mid1Limit', '_mid2Limit', '_hiLimit', '_loKeep', '_hiKeep', '_divisor')
+
+    def __init__(self, precision=0, unitS='', hysteresis=0.0):
+        """
+        initializes the stream formatter
+        :param int precision: number of digits to be expressed, beyond 3
+        :param string unitS: optional unit string e.g. "Ohm" or "V"
+        :param float hysteresis: fraction beyond the range of the current prefix that a
+            value must reach before the prefix changes e.g. 0.05. 0.0 disables it
+        """
+        self.precision = precision
+        self.unitS = unitS
+        self.hysteresis = hysteresis
+        self._formatter = _getFormatter(precision, unitS)
+        self.reset()
+
+    def reset(self):
+        """
+        Forgets the current exponent, so that the next value picks a new one
+        """
+        self._engExponent = None
+        self._loLimit = self._hiLimit = self._loKeep = self._hiKeep = 0.0
+
+    def _setExponent(self, engExponent):
+        """
+        makes an engineering exponent current, with its prefix and the limits of its range
+        :param int engExponent: engineering notation exponent, a multiple of three
+        """
+        self._engExponent = engExponent
+        self._suffixS = self._formatter.suffix(engExponent)
+        self._divisor = _pow10L[engExponent - _pow10MinExp]
+        self._loLimit = self._divisor
+        self._mid1Limit = _pow10L[engExponent + 1 - _pow10MinExp]
+        self._mid2Limit = _pow10L[engExponent + 2 - _pow10MinExp]
+        self._hiLimit = _pow10L[engExponent + 3 - _pow10MinExp]
+        self._loKeep = self._loLimit * (1.0 - self.hysteresis)
+        self._hiKeep = self._hiLimit * (1.0 + self.hysteresis)
+
+    def _exact(self, value):
+        """
+        Expresses an int, Decimal or Fraction reading exactly, as EngNotation does,
+        with the same prefix and hysteresis rules as a float reading
+        :param int,Decimal,Fraction value: value to be expressed
+        :return: a string representing the engineering number
+        """
+        if not value or not _isFinite(value):
+            return self._formatter(value)
+
+        # beyond the range of the current prefix, but within the hysteresis
+        absValue = abs(value)
+        if self._loKeep <= absValue < self._hiKeep and not self._loLimit <= absValue < self._hiLimit:
+            decimals = self.precision + (2 if absValue < self._loLimit else 0)
+            return _exactFixed(value, self._engExponent, decimals) + self._suffixS
+
+        _, engExponent, _ = _exactDecompose(value, self.precision)
+        if engExponent != self._engExponent and -306 <= engExponent <= 306:
+            self._setExponent(engExponent)
+        return self._formatter(value)
+
+    def __call__(self, value):
+        """
+        Expresses the next reading in engineering notation
+        :param float,int,Decimal,Fraction value: value to be expressed
+        :return: a string representing the engineering number
+        """
+        if value.__class__ is not float and isinstance(value, _exactTypesT):
+            return self._exact(value)
+        absValue = abs(value)
+
+        # within the range of the current prefix
+        if self._loLimit <= absValue < self._hiLimit:
+            engExponent = self._engExponent
+            exponent = engExponent
+            if absValue >= self._mid1Limit:
+                exponent += 1 if absValue < self._mid2Limit else 2
+            engValue = value / self._divisor
+
+            # values that may round up into the next band take the full path
+            if abs(engValue) < _bandLimitT[exponent - engExponent] - 1.0:
+                return self._formatter.format(exponent, engExponent, engValue)
+
+        # beyond the range, but within the hysteresis
+        elif self._loKeep <= absValue < self._hiKeep:
+            engValue = value / self._divisor
+            fmtS = self._formatter._fmtT[0 if absValue < self._loLimit else 2]
+            return fmtS % engValue + self._suffixS
+
+        # zero, nan and inf don't change the prefix
+        if value == 0 or not math.isfinite(value):
+            return self._formatter(value)
+
+        # find the new exponent and prefix, and the limits of their range
+        exponent, engExponent, engValue = _engDecompose(value, self.precision)
+        if engExponent != self._engExponent and engExponent >= -306:
+            self._setExponent(engExponent)
+        return self._formatter.format(exponent, engExponent, engValue)
+
+
+class EngArray:
+    """
+    A columnar container of many quantities: a float64 value array, an int8 precision
+    array, and indices into a table of interned unit strings. It takes far less
+    memory than a list of EngNotation objects, renders with the batch formatter,
+    slices without copying, and saves to a compact binary file that can be loaded
+    back or memory-mapped. Indexing an element returns an EngNotation
+    e.g. EngArray([1e3, 2e-3], precision=1, unitS=["Ohm", "F"])
+    """
+
+    _magicB = b'ENGARR01'
+    _headerS = '<8sQQQ'
+
+    __slots__ = ('values', 'precisions', 'unitIndices', 'units')
+
+    def __init__(self, values, precision=0, unitS=''):
+        """
+        initializes the array. Requires numpy
+        :param array_like values: values to be expressed, converted to float64. Ints, Decimals
+            and Fractions are rounded to the nearest float, and expressed as floats
+            e.g. EngArray([1015]) renders "1.01k" where EngNotation(1015) renders "1.02k"
+        :param int,array_like precision: number of digits beyond 3, for all values or per value
+        :param string,list unitS: unit string for all values, or a list with one per value
+        """
+        if _numpy() is None:
+            raise ImportError("EngArray requires numpy")
+
+        self.values = np.asarray(values, dtype=np.float64).ravel()
+        self.precisions = np.broadcast_to(np.asarray(precision, dtype=np.int8), self.values.shape).copy()
+
+        # intern the unit strings into a table
+        if isinstance(unitS, str):
+            self.units = [unitS]
+            self.unitIndices = np.zeros(self.values.shape, dtype=np.uint16)
+        else:
+            self.units, unitIdxA = np.unique(np.asarray(unitS, dtype=np.str_), return_inverse=True)
+            self.units = self.units.tolist()
+            self.unitIndices = unitIdxA.ravel().astype(np.uint16 if len(self.units) <= 65536 else np.uint32)
+            if self.unitIndices.shape != self.values.shape:
+                raise ValueError("unitS must hold one unit string per value")
+
+    @classmethod
+    def _fromColumns(cls, values, precisions, unitIndices, units):
+        """
+        builds an array around existing columns, without copying them
+        :return EngArray: the array
+        """
+        engArray = cls.__new__(cls)
+        engArray.values = values
+        engArray.precisions = precisions
+        engArray.unitIndices = unitIndices
+        engArray.units = units
+        return engArray
+
+    @classmethod
+    def from_engnotations(cls, engNotations):
+        """
+        Builds an array from EngNotation objects
+        :param iterable engNotations: EngNotation objects
+        :return EngArray: the array
+        """
+        engNotationL = list(engNotations)
+        return cls(
+            [eN.value for eN in engNotationL],
+            [eN.precision for eN in engNotationL],
+            [eN.unitS for eN in engNotationL],
+        )
+
+    def __len__(self):
+        """
+        :return int: number of quantities
+        """
+        return self.values.shape[0]
+
+    def __getitem__(self, index):
+        """
+        Returns one quantity as an EngNotation, or a slice or selection of the array.
+        Slices share the columns of this array
+        :param int,slice,array_like index: index, slice, or integer or boolean index array
+        :return EngNotation,EngArray: the quantity, or the sub-array
+        """
+        if isinstance(index, (int, np.integer)):
+            return EngNotation(
+                float(self.values[index]), int(self.precisions[index]), self.units[self.unitIndices[index]])
+        return EngArray._fromColumns(
+            self.values[index], self.precisions[index], self.unitIndices[index], self.units)
+
+    def __iter__(self):
+        """
+        :return: an iterator over the quantities, as EngNotation objects
+        """
+        for i in range(len(self)):
+            yield self[i]
+
+    def __repr__(self):
+        """
+        :return: a string representing the array
+        """
+        return 'EngArray([%s])' % ', '.join(self.format().tolist())
+
+    def format(self):
+        """
+        Expresses every quantity in engineering notation, with the batch formatter.
+        Each (precision, unit) group is formatted at once
+        :return: numpy array of strings
+        """
+        resultA = np.empty(self.values.shape, dtype=object)
+        keyA = self.precisions.astype(np.int64) * (len(self.units) + 1) + self.unitIndices
+        for key in np.unique(keyA).tolist():
+            maskA = keyA == key
+            precision, unitIdx = divmod(key, len(self.units) + 1)
+            resultA[maskA] = format_array(self.values[maskA], precision, self.units[unitIdx])
+        return resultA.astype(np.str_)
+
+    def save(self, path):
+        """
+        Saves the array to a compact binary file: a header, the unit table as JSON,
+        then the value, precision and unit index columns, each 8-byte aligned
+        :param string path: file path
+        """
+        unitB = json.dumps(self.units).encode('utf-8')
+        with open(path, 'wb') as f:
+            f.write(struct.pack(self._headerS, self._magicB, len(self), len(unitB), self.unitIndices.itemsize))
+            f.write(unitB)
+            for columnA in (self.values, self.precisions, self.unitIndices):
+                f.write(b'\0' * (-f.tell() % 8))
+                f.write(np.ascontiguousarray(columnA).tobytes())
+
+    @classmethod
+    def load(cls, path, mmap=False):
+        """
+        Loads an array saved with save()
+        :param string path: file path
+        :param boolean mmap: memory-map the columns read-only, rather than reading them
+        :return EngArray: the array
+        """
+        if _numpy() is None:
+            raise ImportError("EngArray requires numpy")
+        with open(path, 'rb') as f:
+            headerB = f.read(struct.calcsize(cls._headerS))
+            magicB, n, unitSize, unitIdxItemsize = struct.unpack(cls._headerS, headerB)
+            if magicB != cls._magicB:
+                raise ValueError("%s is not an EngArray file" % path)
+            units = json.loads(f.read(unitSize).decode('utf-8'))
+
+        columnL = []
+        offset = len(headerB) + unitSize
+        for dtype in (np.float64, np.int8, np.uint16 if unitIdxItemsize == 2 else np.uint32):
+            offset += -offset % 8
+            if mmap:
+                columnL.append(np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=(n,)))
+            else:
+                columnL.append(np.fromfile(path, dtype=dtype, count=n, offset=offset))
+            offset += n * np.dtype(dtype).itemsize
+        return cls._fromColumns(columnL[0], columnL[1], columnL[2], units)
+
+
+class EngCodeTable:
+    """
+    A lookup table of the display strings of quantized ADC codes, through a linear
+    calibration: code -> EngNotation(gain * code + offset, precision, unitS). The strings
+    are rendered a page of codes at a time, on first use, and at most maxPages pages
+    are kept, least recently used first out. After that, formatting a code, or a numpy
+    array of codes, is an index into the table. A table may be shared between threads
+    e.g. EngCodeTable(2.5 / 65536, 0.0, 0, 65535, precision=1, unitS="V")(32768) returns "1.250 V"
+    """
+
+    __slots__ = ('gain', 'offset', 'minCode', 'maxCode', 'precision', 'unitS', 'pageSize', 'maxPages',
+                 '_bounded', '_pageD', '_lock')
+
+    def __init__(self, gain, offset=0.0, minCode=0, maxCode=65535, precision=0, unitS='', pageSize=4096,
+                 maxPages=16):
+        """
+        initializes an empty table
+        :param float gain: calibration gain, value per code
+        :param float offset: calibration offset, the value of code 0
+        :param int minCode: smallest code
+        :param int maxCode: largest code
+        :param int precision: number of digits to be expressed, beyond 3
+        :param string unitS: optional unit string e.g. "Ohm" or "V"
+        :param int pageSize: number of codes rendered at once
+        :param int,None maxPages: maximum number of pages kept, None for no limit
+        """
+        if maxCode < minCode:
+            raise ValueError("maxCode must not be less than minCode")
+        if pageSize < 1 or (maxPages is not None and maxPages < 1):
+            raise ValueError("pageSize and maxPages must be at least 1")
+        self.gain = gain
+        self.offset = offset
+        self.minCode = minCode
+        self.maxCode = maxCode
+        self.precision = precision
+        self.unitS = unitS
+        self.pageSize = pageSize
+        self.maxPages = maxPages
+
+        # the least recently used order is only kept if pages can be evicted
+        self._bounded = maxPages is not None and maxPages * pageSize < maxCode - minCode + 1
+        self._pageD = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """
+        :return int: number of codes in the table
+        """
+        return self.maxCode - self.minCode + 1
+
+    def _page(self, pageIdx):
+        """
+        returns a page of strings, rendering it if it isn't in the table
+        :param int pageIdx: page index
+        :return list: [list of strings, numpy array of the strings or None]
+        """
+        # a bounded table evicts pages, so its lookup and least recently used bookkeeping
+        # are done under the lock. An unbounded table only ever gains pages
+        if self._bounded:
+            with self._lock:
+                pageT = self._pageD.get(pageIdx)
+                if pageT is not None:
+                    self._pageD.move_to_end(pageIdx)
+                    return pageT
+        else:
+            pageT = self._pageD.get(pageIdx)
+            if pageT is not None:
+                return pageT
+
+        # render outside of the lock, so that other threads aren't held up. Float
+        # calibrations go through the batch formatter, which is identical to EngNotation
+        firstCode = self.minCode + pageIdx * self.pageSize
+        lastCode = min(firstCode + self.pageSize, self.maxCode + 1)
+        if isinstance(self.gain, float) and isinstance(self.offset, float) and _numpy() is not None:
+            valueA = self.gain * np.arange(firstCode, lastCode, dtype=np.float64) + self.offset
+            pageL = format_array(valueA, self.precision, self.unitS).tolist()
+        else:
+            formatter = _getFormatter(self.precision, self.unitS)
+            pageL = [formatter(self.gain * code + self.offset) for code in range(firstCode, lastCode)]
+        pageT = [pageL, None]
+
+        with self._lock:
+            self._pageD[pageIdx] = pageT
+            if self._bounded and len(self._pageD) > self.maxPages:
+                self._pageD.popitem(last=False)
+        return pageT
+
+    def __call__(self, code):
+        """
+        Returns the display string of a code
+        :param int code: raw ADC code
+        :return: a string representing the engineering number
+        """
+        idx = code - self.minCode
+        if not 0 <= idx <= self.maxCode - self.minCode:
+            raise ValueError("code %i is outside of %i..%i" % (code, self.minCode, self.maxCode))
+        pageIdx, pageOffset = divmod(idx, self.pageSize)
+        pageT = None if self._bounded else self._pageD.get(pageIdx)
+        if pageT is None:
+            pageT = self._page(pageIdx)
+        return pageT[0][pageOffset]
+
+    def format(self, codes):
+        """
+        Returns the display strings of an array of codes. Requires numpy
+        :param array_like codes: raw ADC codes
+        :return: numpy array of strings, with the same shape as codes
+        """
+        if _numpy() is None:
+            raise ImportError("EngCodeTable.format() requires numpy")
+
+        idxA = np.asarray(codes, dtype=np.int64) - self.minCode
+        if idxA.size and (idxA.min() < 0 or idxA.max() > self.maxCode - self.minCode):
+            raise ValueError("codes must be within %i..%i" % (self.minCode, self.maxCode))
+        pageIdxA, pageOffsetA = np.divmod(idxA.ravel(), self.pageSize)
+
+        # gather from each page in turn, with the strings of the page as an array
+        pageL = []
+        for pageIdx in np.unique(pageIdxA).tolist():
+            pageT = self._page(pageIdx)
+            if pageT[1] is None:
+                pageT[1] = np.array(pageT[0])
+            pageL.append((pageIdx, pageT[1]))
+        if len(pageL) == 1:
+            return pageL[0][1][pageOffsetA].reshape(idxA.shape)
+        resultA = np.empty(pageOffsetA.shape, dtype=np.result_type(*[pageA.dtype for _, pageA in pageL]))
+        for pageIdx, pageA in pageL:
+            maskA = pageIdxA == pageIdx
+            resultA[maskA] = pageA[pageOffsetA[maskA]]
+        return resultA.reshape(idxA.shape)
+
+    def clear(self):
+        """
+        Empties the table
+        """
+        with self._lock:
+            self._pageD.clear()
+
+
+class EngLazy:
+    """
+    A log argument that defers engineering notation to the moment the record is
+    formatted, so disabled log calls cost only the creation of this small object
+    e.g. log.debug("I=%s", EngLazy(i, 1, "A"))
+    """
+
+    __slots__ = ('value', 'precision', 'unitS')
+
+    def __init__(self, value, precision=0, unitS=''):
+        """
+        initializes the lazy argument
+        :param float,int value: value to be expressed
+        :param int precision: number of digits to be expressed, beyond 3
+        :param string unitS: optional unit string e.g. "Ohm" or "V"
+        """
+        self.value = value
+        self.precision = precision
+        self.unitS = unitS
+
+    def __str__(self):
+        """
+        :return: a string representing the engineering number
+        """
+        return _getFormatter(self.precision, self.unitS)(self.value)
+
+    __repr__ = __str__
+
+
+_engLogTypesT = (EngLazy, EngNotation)
+
+
+class _EngLogString(str):
+    """
+    A rendered log argument. Like EngNotation, its repr is the string itself, so %r
+    doesn't quote it
+    """
+
+    __repr__ = str.__str__
+
+
+class EngLogFormatter(logging.Formatter):
+    """
+    A logging.Formatter that renders EngLazy and EngNotation arguments of a record
+    when the record is formatted. Engineering notation arguments take %s or %r. The
+    record itself is left unchanged, so other handlers and formatters see the original
+    arguments
+    """
+
+    def format(self, record):
+        """
+        Renders the engineering notation arguments, then formats the record
+        :param logging.LogRecord record: the log record
+        :return: the formatted record
+        """
+        argsT = record.args
+        if isinstance(argsT, tuple):
+            if not any(isinstance(arg, _engLogTypesT) for arg in argsT):
+                return super().format(record)
+            renderedArgs = tuple(_EngLogString(arg) if isinstance(arg, _engLogTypesT) else arg for arg in argsT)
+        elif isinstance(argsT, dict):
+            if not any(isinstance(arg, _engLogTypesT) for arg in argsT.values()):
+                return super().format(record)
+            renderedArgs = {
+                keyS: _EngLogString(arg) if isinstance(arg, _engLogTypesT) else arg for keyS, arg in argsT.items()}
+        else:
+            return super().format(record)
+
+        # the rendered arguments are swapped in only while this formatter runs
+        record.args = renderedArgs
+        try:
+            return super().format(record)
+        finally:
+            record.args = argsT
+
+
+def _documentFormatters(schema, precision, unitS):
+    """
+    compiles a document schema into formatters. Schema keys containing "." are
+    dotted paths from the document root (list levels don't add to a path), and other
+    keys match that key at any depth. Schema values are a unit string, or a
+    (precision, unitS) tuple
+    :param dict schema: key or path -> unit string or (precision, unitS)
+    :param int precision: default number of digits to be expressed, beyond 3
+    :param string unitS: default unit string
+    :return: (path -> formatter dict, key -> formatter dict, default formatter)
+    """
+    pathD = {}
+    keyD = {}
+    for keyS, specT in (schema or {}).items():
+        if isinstance(specT, str):
+            formatter = _getFormatter(precision, specT)
+        else:
+            formatter = _getFormatter(*specT)
+        if '.' in keyS:
+            pathD[keyS] = formatter
+        else:
+            keyD[keyS] = formatter
+    return pathD, keyD, _getFormatter(precision, unitS)
+
+
+def _isNumericLeaf(node):
+    """
+    :param node: a document node
+    :return boolean: true for numbers, other than booleans
+    """
+    return isinstance(node, (float, int, Decimal, Fraction)) and not isinstance(node, bool)
+
+
+def _formatNode(node, pathS, keyS, formattersT):
+    """
+    returns a copy of a document node with its numeric leaves formatted
+    :param node: dict, list, tuple or leaf
+    :param string pathS: dotted path of the node
+    :param string keyS: key of the node in its parent dict, None at the root
+    :param tuple formattersT: as returned by _documentFormatters()
+    :return: the formatted copy
+    """
+    if isinstance(node, dict):
+        return {childKeyS: _formatNode(child, pathS + '.' + str(childKeyS) if pathS else str(childKeyS),
+                                       childKeyS, formattersT)
+                for childKeyS, child in node.items()}
+    if isinstance(node, (list, tuple)):
+        return [_formatNode(child, pathS, keyS, formattersT) for child in node]
+    if _isNumericLeaf(node):
+        pathD, keyD, defaultFormatter = formattersT
+        formatter = pathD.get(pathS) or keyD.get(keyS) or defaultFormatter
+        return formatter(node)
+    return node
+
+
+def _iterNodeJson(node, pathS, keyS, formattersT):
+    """
+    generates the JSON text of a document node, with its numeric leaves formatted
+    :param node: dict, list, tuple or leaf
+    :param string pathS: dotted path of the node
+    :param string keyS: key of the node in its parent dict, None at the root
+    :param tuple formattersT: as returned by _documentFormatters()
+    :return: a generator of JSON text pieces
+    """
+    if isinstance(node, dict):
+        separatorS = '{'
+        for childKeyS, child in node.items():
+            childKeyS = str(childKeyS)
+            yield separatorS + _encodeJsonString(childKeyS) + ': '
+            yield from _iterNodeJson(child, pathS + '.' + childKeyS if pathS else childKeyS, childKeyS, formattersT)
+            separatorS = ', '
+        yield '{}' if separatorS == '{' else '}'
+    elif isinstance(node, (list, tuple)):
+        separatorS = '['
+        for child in node:
+            yield separatorS
+            yield from _iterNodeJson(child, pathS, keyS, formattersT)
+            separatorS = ', '
+        yield '[]' if separatorS == '[' else ']'
+    elif _isNumericLeaf(node):
+        pathD, keyD, defaultFormatter = formattersT
+        formatter = pathD.get(pathS) or keyD.get(keyS) or defaultFormatter
+        yield _encodeJsonString(formatter(node))
+    else:
+        yield json.dumps(node)
+
+
+_encodeJsonString = json.encoder.encode_basestring_ascii
+
+
+def format_document(document, schema=None, precision=0, unitS=''):
+    """
+    Returns a copy of a nested dict/list structure with every numeric leaf replaced
+    by its engineering notation string
+    e.g. format_document({"run": [{"vout": 3.3e-3}]}, {"vout": (1, "V")}) returns {"run": [{"vout": "3.300 mV"}]}
+    :param dict,list document: nested structure of dicts, lists and leaves
+    :param dict schema: key or dotted path -> unit string or (precision, unitS). Keys
+        with a "." are paths from the root, e.g. "run.vout", and list levels don't
+        add to a path. Other keys match at any depth
+    :param int precision: number of digits beyond 3, for leaves not in the schema
+    :param string unitS: unit string for leaves not in the schema
+    :return: the formatted copy
+    """
+    return _formatNode(document, '', None, _documentFormatters(schema, precision, unitS))
+
+
+def iter_document_json(document, schema=None, precision=0, unitS=''):
+    """
+    Generates the JSON text of a nested structure with its numeric leaves formatted,
+    piece by piece, without building the formatted document. See format_document()
+    :param dict,list document: nested structure of dicts, lists and leaves
+    :param dict schema: key or dotted path -> unit string or (precision, unitS)
+    :param int precision: number of digits beyond 3, for leaves not in the schema
+    :param string unitS: unit string for leaves not in the schema
+    :return: a generator of JSON text pieces
+    """
+    return _iterNodeJson(document, '', None, _documentFormatters(schema, precision, unitS))
+
+
+def write_document(document, outFile, schema=None, precision=0, unitS=''):
+    """
+    Writes the JSON text of a nested structure with its numeric leaves formatted to
+    a file, incrementally. See format_document()
+    :param dict,list document: nested structure of dicts, lists and leaves
+    :param file outFile: text file to write to
+    :param dict schema: key or dotted path -> unit string or (precision, unitS)
+    :param int precision: number of digits beyond 3, for leaves not in the schema
+    :param string unitS: unit string for leaves not in the schema
+    """
+    pieceL = []
+    for pieceS in iter_document_json(document, schema, precision, unitS):
+        pieceL.append(pieceS)
+        if len(pieceL) >= 4096:
+            outFile.write(''.join(pieceL))
+            pieceL.clear()
+    outFile.write(''.join(pieceL))
+
+
+def format_json_stream(inFile, outFile, schema=None, precision=0, unitS=''):
+    """
+    Formats a stream of JSON records, one per line (JSON Lines), writing each record
+    with its numeric leaves formatted as soon as it is read. See format_document()
+    :param file inFile: text file of JSON records, one per line
+    :param file outFile: text file to write the formatted records to
+    :param dict schema: key or dotted path -> unit string or (precision, unitS)
+    :param int precision: number of digits beyond 3, for leaves not in the schema
+    :param string unitS: unit string for leaves not in the schema
+    :return int: number of records
+    """
+    formattersT = _documentFormatters(schema, precision, unitS)
+    recordCount = 0
+    for lineS in inFile:
+        if not lineS.strip():
+            continue
+        outFile.write(''.join(_iterNodeJson(json.loads(lineS), '', None, formattersT)))
+        outFile.write('\n')
+        recordCount += 1
+    return recordCount
+
+
+# opt-in instrumentation. Enabling it swaps instrumented versions of the
+# construction and render methods into the classes, so that when it is
+# disabled the hot paths are exactly the uninstrumented ones
+
+EngStats = namedtuple('EngStats', ['constructions', 'renders', 'prefixHits', 'fallbacks', 'nonFinite', 'seconds'])
+
+
+class _Instrumentation:
+    """
+    The counters, callback and original methods of the instrumentation
+    """
+
+    def __init__(self):
+        """
+        initializes disabled instrumentation, with zeroed counters
+        """
+        self.enabled = False
+        self.callback = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._originalD = {}
+        self.reset()
+
+    def reset(self):
+        """
+        zeroes the counters
+        """
+        with self._lock:
+            self.constructions = 0
+            self.renders = 0
+            self.prefixHitD = {}
+            self.fallbacks = 0
+            self.nonFinite = 0
+            self.seconds = 0.0
+
+    def record(self, value, precision, unitS, prefixSet, engExponent, resultS, seconds):
+        """
+        counts one render, and passes it to the callback if there is one
+        :param value: value that was rendered
+        :param int precision: number of digits expressed, beyond 3
+        :param string unitS: unit string
+        :param PrefixSet prefixSet: prefix set the value was rendered with
+        :param int,None engExponent: engineering notation exponent, None for nan and inf
+        :param string resultS: rendered string
+        :param float seconds: time spent rendering
+        """
+        prefixS = None if engExponent is None else prefixSet.prefix(engExponent)
+        with self._lock:
+            self.renders += 1
+            self.seconds += seconds
+            if engExponent is None:
+                self.nonFinite += 1
+            elif prefixS is not None:
+                self.prefixHitD[prefixS] = self.prefixHitD.get(prefixS, 0) + 1
+            else:
+                self.fallbacks += 1
+        if self.callback is not None:
+            self.callback(value, precision, unitS, resultS, seconds)
+
+
+_instrumentation = _Instrumentation()
+
+
+def _valueEngExponent(formatter, value):
+    """
+    returns the engineering notation exponent a formatter renders a value with
+    :param EngFormatter formatter: the formatter
+    :param float,int,Decimal,Fraction value: value to be expressed
+    :return int,None: engineering notation exponent, None for nan and inf
+    """
+    precision = formatter.precision
+    if formatter.prefixSet.radix == 2:
+        value = float(value)
+        return formatter.decompose(value)[1] if math.isfinite(value) else None
+    if value.__class__ is not float and isinstance(value, _exactTypesT):
+        if isinstance(value, Decimal) and not value.is_finite():
+            return None
+        if not value:
+            return 0
+        return _exactDecompose(value, precision)[1]
+    if not math.isfinite(value):
+        return None
+    return _engDecompose(value, precision)[1]
+
+
+def _instrumentedInit(self, value, precision=0, unitS='', prefixSet=None):
+    """
+    EngNotation.__init__, counting constructions
+    """
+    with _instrumentation._lock:
+        _instrumentation.constructions += 1
+    _instrumentation._originalD['init'](self, value, precision, unitS, prefixSet)
+
+
+def _instrumentedRepr(self):
+    """
+    EngNotation.__repr__, counting and timing renders, render cache hits included
+    """
+    local = _instrumentation._local
+    if getattr(local, 'active', False):
+        return _instrumentation._originalD['repr'](self)
+    local.active = True
+    try:
+        startTime = time.perf_counter()
+        resultS = _instrumentation._originalD['repr'](self)
+        seconds = time.perf_counter() - startTime
+    finally:
+        local.active = False
+    _instrumentation.record(
+        self.value, self.precision, self.unitS, self.prefixSet or siPrefixSet, self._decompose()[1], resultS, seconds)
+    return resultS
+
+
+def _instrumentedCall(self, value):
+    """
+    EngFormatter.__call__, counting and timing renders
+    """
+    local = _instrumentation._local
+    if getattr(local, 'active', False):
+        return _instrumentation._originalD['call'](self, value)
+    local.active = True
+    try:
+        startTime = time.perf_counter()
+        resultS = _instrumentation._originalD['call'](self, value)
+        seconds = time.perf_counter() - startTime
+    finally:
+        local.active = False
+    _instrumentation.record(
+        value, self.precision, self.unitS, self.prefixSet, _valueEngExponent(self, value), resultS, seconds)
+    return resultS
+
+
+def _instrumentedStreamCall(self, value):
+    """
+    EngStream.__call__, counting and timing renders. A reading that the hysteresis
+    keeps in the current prefix is recorded with that prefix
+    """
+    local = _instrumentation._local
+    if getattr(local, 'active', False):
+        return _instrumentation._originalD['stream'](self, value)
+    keptExponent = None
+    if self._engExponent is not None and _isFinite(value):
+        absValue = abs(value)
+        if self._loKeep <= absValue < self._hiKeep and not self._loLimit <= absValue < self._hiLimit:
+            keptExponent = self._engExponent
+    local.active = True
+    try:
+        startTime = time.perf_counter()
+        resultS = _instrumentation._originalD['stream'](self, value)
+        seconds = time.perf_counter() - startTime
+    finally:
+        local.active = False
+    engExponent = _valueEngExponent(self._formatter, value) if keptExponent is None else keptExponent
+    _instrumentation.record(value, self.precision, self.unitS, siPrefixSet, engExponent, resultS, seconds)
+    return resultS
+
+
+def enable_instrumentation(callback=None):
+    """
+    Enables counting and timing of EngNotation constructions, and of renders by
+    EngNotation (render cache hits included), EngFormatter and EngStream, and the
+    paths built on them e.g. eng() and format(). The batch (array) formatters aren't
+    instrumented. When disabled, the instrumentation costs nothing
+    :param callable callback: optional hook, called after every render as
+        callback(value, precision, unitS, resultS, seconds)
+    """
+    with _instrumentation._lock:
+        _instrumentation.callback = callback
+        if _instrumentation.enabled:
+            return
+        _instrumentation._originalD = {
+            'init': EngNotation.__init__, 'repr': EngNotation.__repr__, 'call': EngFormatter.__call__,
+            'stream': EngStream.__call__}
+        EngNotation.__init__ = _instrumentedInit
+        EngNotation.__repr__ = _instrumentedRepr
+        EngFormatter.__call__ = _instrumentedCall
+        EngStream.__call__ = _instrumentedStreamCall
+        _instrumentation.enabled = True
+
+
+def disable_instrumentation():
+    """
+    Disables the instrumentation, restoring the uninstrumented methods. The counters are kept
+    """
+    with _instrumentation._lock:
+        if not _instrumentation.enabled:
+            return
+        EngNotation.__init__ = _instrumentation._originalD['init']
+        EngNotation.__repr__ = _instrumentation._originalD['repr']
+        EngFormatter.__call__ = _instrumentation._originalD['call']
+        EngStream.__call__ = _instrumentation._originalD['stream']
+        _instrumentation.callback = None
+        _instrumentation.enabled = False
+
+
+def stats():
+    """
+    Reports the instrumentation counters
+    :return EngStats: (constructions, renders, prefixHits, fallbacks, nonFinite, seconds)
+        where prefixHits maps each prefix in the prefix table to its render count,
+        fallbacks counts renders in the "e%i" form, and seconds is the time spent rendering
+    """
+    with _instrumentation._lock:
+        return EngStats(
+            _instrumentation.constructions, _instrumentation.renders, dict(_instrumentation.prefixHitD),
+            _instrumentation.fallbacks, _instrumentation.nonFinite, _instrumentation.seconds)
+
+
+def reset_stats():
+    """
+    Zeroes the instrumentation counters
+    """
+    _instrumentation.reset()
+
+
+def _formatField(formatter, fieldS):
+    """
+    formats a numeric text field, passing anything that isn't a number through
+    :param EngFormatter formatter: formatter for the field
+    :param string fieldS: text field e.g. "0.0123"
+    :return: the formatted field e.g. "12.3m"
+    """
+    try:
+        value = float(fieldS)
+    except ValueError:
+        return fieldS
+    return formatter(value)
+
+
+def main(argv=None):
+    """
+    Command-line filter: reads numbers from a file or stdin, one per line or in
+    chosen CSV columns, and writes them in engineering notation. The input is
+    processed in fixed-size chunks, so arbitrarily large files stream through in
+    constant memory. Fields that aren't numbers (e.g. headers) are passed through
+    e.g. python -m engNotation -c 2,3 --units V,A -p 1 log.csv
+    :param list argv: command-line arguments, defaults to sys.argv[1:]
+    :return int: exit status
+    """
+    import argparse
+    import csv
+
+    parser = argparse.ArgumentParser(
+        prog='python -m engNotation',
+        description='Expresses numbers in engineering notation.')
+    parser.add_argument('input', nargs='?', default='-',
+                        help='input file, "-" or omitted for stdin')
+    parser.add_argument('-o', '--output', default='-',
+                        help='output file, "-" or omitted for stdout')
+    parser.add_argument('-p', '--precision', type=int, default=0,
+                        help='number of digits to be expressed, beyond 3')
+    parser.add_argument('-u', '--unit', default='',
+                        help='unit string for every formatted value e.g. "Ohm"')
+    parser.add_argument('-c', '--columns',
+                        help='comma separated, 1-based CSV columns to format. '
+                             'Without it, each line holds one number')
+    parser.add_argument('--units',
+                        help='comma separated unit strings, one per column in --columns')
+    parser.add_argument('-d', '--delimiter', default=',',
+                        help='CSV delimiter, default ","')
+    parser.add_argument('--chunk-size', dest='chunkSize', type=int, default=65536,
+                        help='number of lines read and written at a time')
+    parser.add_argument('--stats', action='store_true',
+                        help='report the number of rows and rows/s on stderr')
+    args = parser.parse_args(argv)
+
+    # 1-based CSV columns, checked before any file is opened
+    columnL = None
+    if args.columns is not None:
+        try:
+            columnL = [int(c) - 1 for c in args.columns.split(',')]
+        except ValueError:
+            parser.error('--columns must be comma separated column numbers')
+        if min(columnL) < 0:
+            parser.error('--columns are numbered from 1')
+        if args.units is not None and len(args.units.split(',')) != len(columnL):
+            parser.error('--units needs one unit string per column in --columns')
+    if args.chunkSize < 1:
+        parser.error('--chunk-size must be at least 1')
+
+    # unreadable or unwritable paths are reported as usage errors, not tracebacks
+    if args.input == '-':
+        inFile = io.TextIOWrapper(sys.stdin.buffer, newline='')
+    else:
+        try:
+            inFile = open(args.input, newline='')
+        except OSError as e:
+            parser.error("can't open '%s': %s" % (args.input, e.strerror))
+    if args.output == '-':
+        outFile = io.TextIOWrapper(sys.stdout.buffer, newline='', write_through=True)
+    else:
+        try:
+            outFile = open(args.output, 'w', newline='')
+        except OSError as e:
+            if args.input == '-':
+                inFile.detach()
+            else:
+                inFile.close()
+            parser.error("can't open '%s': %s" % (args.output, e.strerror))
+
+    startTime = time.perf_counter()
+    rowCount = 0
+    try:
+        # one number per line
+        if columnL is None:
+            formatter = EngFormatter(args.precision, args.unit)
+            while True:
+                lineL = list(itertools.islice(inFile, args.chunkSize))
+                if len(lineL) == 0:
+                    break
+                outFile.write('\n'.join(_formatField(formatter, lineS.strip()) for lineS in lineL))
+                outFile.write('\n')
+                rowCount += len(lineL)
+
+        # chosen CSV columns, each with its own formatter
+        else:
+            unitL = [args.unit] * len(columnL) if args.units is None else args.units.split(',')
+            formatterL = [(c, EngFormatter(args.precision, u)) for c, u in zip(columnL, unitL)]
+
+            reader = csv.reader(inFile, delimiter=args.delimiter)
+            bufferIO = io.StringIO()
+            writer = csv.writer(bufferIO, delimiter=args.delimiter, lineterminator='\n')
+            while True:
+                rowL = list(itertools.islice(reader, args.chunkSize))
+                if len(rowL) == 0:
+                    break
+                for row in rowL:
+                    for c, formatter in formatterL:
+                        if c < len(row):
+                            row[c] = _formatField(formatter, row[c])
+                writer.writerows(rowL)
+                outFile.write(bufferIO.getvalue())
+                bufferIO.seek(0)
+                bufferIO.truncate()
+                rowCount += len(rowL)
+    finally:
+        outFile.flush()
+
+        # the wrappers around stdin and stdout are detached rather than closed, so
+        # that the process's own streams stay open once they are garbage collected
+        if args.input == '-':
+            inFile.detach()
+        else:
+            inFile.close()
+        if args.output == '-':
+            outFile.detach()
+        else:
+            outFile.close()
+
+    if args.stats:
+        elapsed = time.perf_counter() - startTime
+        sys.stderr.write('%i rows in %.3f s, %s rows/s\n' % (
+            rowCount, elapsed, EngNotation(rowCount / elapsed if elapsed > 0 else math.inf)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
+
 # ===========================================================================
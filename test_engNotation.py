@@ -29,10 +29,43 @@ __version__ = "0.0.2"
 #  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 #  SOFTWARE.
 
+import asyncio
+import bisect
+import contextlib
+import io
+import json
+import logging
 import math
-from unittest import TestCase
+import operator
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from fractions import Fraction
+from unittest import TestCase, skipIf
 
-from engNotation import EngNotation
+import bench_engNotation
+import engNotation
+from engNotation import (
+    aformat_many, aiter_format, binaryPrefixSet, disable_instrumentation, enable_instrumentation, eng, EngArray,
+    EngCodeTable, EngFormatter, EngLazy, engPrefixSet, EngLogFormatter, EngNotation, EngStream, format_array,
+    format_column, format_document, format_into, format_json_stream, iter_document_json, main, parse_eng,
+    parse_eng_many, PrefixSet, register_pandas_accessors, reset_stats, siPrefixSet, stats, write_document,
+)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
 
 testL = [
     {'val': 0, 'unitS': '', 'precision': 0, 'resultS': '0.00'},
@@ -60,14 +93,14 @@ testL = [
     {'val': -10, 'unitS': '', 'precision': 0, 'resultS': '-10.0'},
     {'val': -1, 'unitS': '', 'precision': 0, 'resultS': '-1.00'},
 
-    {'val': 2.718281828e-26, 'unitS': '', 'precision': 0, 'resultS': '27.2e-27'},
-    {'val': 2.718281828e-25, 'unitS': '', 'precision': 0, 'resultS': '272e-27'},
-    {'val': 2.718281828e-24, 'unitS': '', 'precision': 0, 'resultS': '2.72e-24'},
-    {'val': 2.718281828e-23, 'unitS': '', 'precision': 0, 'resultS': '27.2e-24'},
-    {'val': 2.718281828e-22, 'unitS': '', 'precision': 0, 'resultS': '272e-24'},
-    {'val': 2.718281828e-21, 'unitS': '', 'precision': 0, 'resultS': '2.72e-21'},
-    {'val': 2.718281828e-20, 'unitS': '', 'precision': 0, 'resultS': '27.2e-21'},
-    {'val': 2.718281828e-19, 'unitS': '', 'precision': 0, 'resultS': '272e-21'},
+    {'val': 2.718281828e-26, 'unitS': '', 'precision': 0, 'resultS': '27.2r'},
+    {'val': 2.718281828e-25, 'unitS': '', 'precision': 0, 'resultS': '272r'},
+    {'val': 2.718281828e-24, 'unitS': '', 'precision': 0, 'resultS': '2.72y'},
+    {'val': 2.718281828e-23, 'unitS': '', 'precision': 0, 'resultS': '27.2y'},
+    {'val': 2.718281828e-22, 'unitS': '', 'precision': 0, 'resultS': '272y'},
+    {'val': 2.718281828e-21, 'unitS': '', 'precision': 0, 'resultS': '2.72z'},
+    {'val': 2.718281828e-20, 'unitS': '', 'precision': 0, 'resultS': '27.2z'},
+    {'val': 2.718281828e-19, 'unitS': '', 'precision': 0, 'resultS': '272z'},
     {'val': 2.718281828e-18, 'unitS': '', 'precision': 0, 'resultS': '2.72a'},
     {'val': 2.718281828e-17, 'unitS': '', 'precision': 0, 'resultS': '27.2a'},
     {'val': 2.718281828e-16, 'unitS': '', 'precision': 0, 'resultS': '272a'},
@@ -106,20 +139,20 @@ testL = [
     {'val': 2.718281828e+17, 'unitS': '', 'precision': 0, 'resultS': '272P'},
     {'val': 2.718281828e+19, 'unitS': '', 'precision': 0, 'resultS': '27.2E'},
     {'val': 2.718281828e+20, 'unitS': '', 'precision': 0, 'resultS': '272E'},
-    {'val': 2.718281828e+21, 'unitS': '', 'precision': 0, 'resultS': '2.72e21'},
-    {'val': 2.718281828e+22, 'unitS': '', 'precision': 0, 'resultS': '27.2e21'},
-    {'val': 2.718281828e+23, 'unitS': '', 'precision': 0, 'resultS': '272e21'},
-    {'val': 2.718281828e+24, 'unitS': '', 'precision': 0, 'resultS': '2.72e24'},
-    {'val': 2.718281823e+25, 'unitS': '', 'precision': 0, 'resultS': '27.2e24'},
-
-    {'val': 1.234568e-26, 'unitS': 'A', 'precision': 0, 'resultS': "12.3e-27 A"},
-    {'val': 1.234568e-25, 'unitS': 'A', 'precision': 0, 'resultS': "123e-27 A"},
-    {'val': 1.234568e-24, 'unitS': 'A', 'precision': 0, 'resultS': "1.23e-24 A"},
-    {'val': 1.234568e-23, 'unitS': 'A', 'precision': 0, 'resultS': "12.3e-24 A"},
-    {'val': 1.234568e-22, 'unitS': 'A', 'precision': 0, 'resultS': "123e-24 A"},
-    {'val': 1.234568e-21, 'unitS': 'A', 'precision': 0, 'resultS': "1.23e-21 A"},
-    {'val': 1.234568e-20, 'unitS': 'A', 'precision': 0, 'resultS': "12.3e-21 A"},
-    {'val': 1.234568e-19, 'unitS': 'A', 'precision': 0, 'resultS': "123e-21 A"},
+    {'val': 2.718281828e+21, 'unitS': '', 'precision': 0, 'resultS': '2.72Z'},
+    {'val': 2.718281828e+22, 'unitS': '', 'precision': 0, 'resultS': '27.2Z'},
+    {'val': 2.718281828e+23, 'unitS': '', 'precision': 0, 'resultS': '272Z'},
+    {'val': 2.718281828e+24, 'unitS': '', 'precision': 0, 'resultS': '2.72Y'},
+    {'val': 2.718281823e+25, 'unitS': '', 'precision': 0, 'resultS': '27.2Y'},
+
+    {'val': 1.234568e-26, 'unitS': 'A', 'precision': 0, 'resultS': "12.3 rA"},
+    {'val': 1.234568e-25, 'unitS': 'A', 'precision': 0, 'resultS': "123 rA"},
+    {'val': 1.234568e-24, 'unitS': 'A', 'precision': 0, 'resultS': "1.23 yA"},
+    {'val': 1.234568e-23, 'unitS': 'A', 'precision': 0, 'resultS': "12.3 yA"},
+    {'val': 1.234568e-22, 'unitS': 'A', 'precision': 0, 'resultS': "123 yA"},
+    {'val': 1.234568e-21, 'unitS': 'A', 'precision': 0, 'resultS': "1.23 zA"},
+    {'val': 1.234568e-20, 'unitS': 'A', 'precision': 0, 'resultS': "12.3 zA"},
+    {'val': 1.234568e-19, 'unitS': 'A', 'precision': 0, 'resultS': "123 zA"},
     {'val': 1.234568e-18, 'unitS': 'A', 'precision': 0, 'resultS': "1.23 aA"},
     {'val': 1.234568e-17, 'unitS': 'A', 'precision': 0, 'resultS': "12.3 aA"},
     {'val': 1.234568e-16, 'unitS': 'A', 'precision': 0, 'resultS': "123 aA"},
@@ -159,20 +192,20 @@ testL = [
     {'val': 1.234568e+18, 'unitS': 'A', 'precision': 0, 'resultS': "1.23 EA"},
     {'val': 1.234568e+19, 'unitS': 'A', 'precision': 0, 'resultS': "12.3 EA"},
     {'val': 1.234568e+20, 'unitS': 'A', 'precision': 0, 'resultS': "123 EA"},
-    {'val': 1.234568e+21, 'unitS': 'A', 'precision': 0, 'resultS': "1.23e21 A"},
-    {'val': 1.234568e+22, 'unitS': 'A', 'precision': 0, 'resultS': "12.3e21 A"},
-    {'val': 1.234568e+23, 'unitS': 'A', 'precision': 0, 'resultS': "123e21 A"},
-    {'val': 1.234568e+24, 'unitS': 'A', 'precision': 0, 'resultS': "1.23e24 A"},
-    {'val': 1.234568e+25, 'unitS': 'A', 'precision': 0, 'resultS': "12.3e24 A"},
-
-    {'val': 9.87654321e-26, 'unitS': 'Ohm', 'precision': 1, 'resultS': '98.77e-27 Ohm'},
-    {'val': 9.87654321e-25, 'unitS': 'Ohm', 'precision': 1, 'resultS': '987.7e-27 Ohm'},
-    {'val': 9.87654321e-24, 'unitS': 'Ohm', 'precision': 1, 'resultS': '9.877e-24 Ohm'},
-    {'val': 9.87654321e-23, 'unitS': 'Ohm', 'precision': 1, 'resultS': '98.77e-24 Ohm'},
-    {'val': 9.87654321e-22, 'unitS': 'Ohm', 'precision': 1, 'resultS': '987.7e-24 Ohm'},
-    {'val': 9.87654321e-21, 'unitS': 'Ohm', 'precision': 1, 'resultS': '9.877e-21 Ohm'},
-    {'val': 9.87654321e-20, 'unitS': 'Ohm', 'precision': 1, 'resultS': '98.77e-21 Ohm'},
-    {'val': 9.87654321e-19, 'unitS': 'Ohm', 'precision': 1, 'resultS': '987.7e-21 Ohm'},
+    {'val': 1.234568e+21, 'unitS': 'A', 'precision': 0, 'resultS': "1.23 ZA"},
+    {'val': 1.234568e+22, 'unitS': 'A', 'precision': 0, 'resultS': "12.3 ZA"},
+    {'val': 1.234568e+23, 'unitS': 'A', 'precision': 0, 'resultS': "123 ZA"},
+    {'val': 1.234568e+24, 'unitS': 'A', 'precision': 0, 'resultS': "1.23 YA"},
+    {'val': 1.234568e+25, 'unitS': 'A', 'precision': 0, 'resultS': "12.3 YA"},
+
+    {'val': 9.87654321e-26, 'unitS': 'Ohm', 'precision': 1, 'resultS': '98.77 rOhm'},
+    {'val': 9.87654321e-25, 'unitS': 'Ohm', 'precision': 1, 'resultS': '987.7 rOhm'},
+    {'val': 9.87654321e-24, 'unitS': 'Ohm', 'precision': 1, 'resultS': '9.877 yOhm'},
+    {'val': 9.87654321e-23, 'unitS': 'Ohm', 'precision': 1, 'resultS': '98.77 yOhm'},
+    {'val': 9.87654321e-22, 'unitS': 'Ohm', 'precision': 1, 'resultS': '987.7 yOhm'},
+    {'val': 9.87654321e-21, 'unitS': 'Ohm', 'precision': 1, 'resultS': '9.877 zOhm'},
+    {'val': 9.87654321e-20, 'unitS': 'Ohm', 'precision': 1, 'resultS': '98.77 zOhm'},
+    {'val': 9.87654321e-19, 'unitS': 'Ohm', 'precision': 1, 'resultS': '987.7 zOhm'},
     {'val': 9.87654321e-18, 'unitS': 'Ohm', 'precision': 1, 'resultS': '9.877 aOhm'},
     {'val': 9.87654321e-17, 'unitS': 'Ohm', 'precision': 1, 'resultS': '98.77 aOhm'},
     {'val': 9.87654321e-16, 'unitS': 'Ohm', 'precision': 1, 'resultS': '987.7 aOhm'},
@@ -212,20 +245,20 @@ testL = [
     {'val': 9.87654321e+18, 'unitS': 'Ohm', 'precision': 1, 'resultS': '9.877 EOhm'},
     {'val': 9.87654321e+19, 'unitS': 'Ohm', 'precision': 1, 'resultS': '98.77 EOhm'},
     {'val': 9.87654321e+20, 'unitS': 'Ohm', 'precision': 1, 'resultS': '987.7 EOhm'},
-    {'val': 9.87654321e+21, 'unitS': 'Ohm', 'precision': 1, 'resultS': '9.877e21 Ohm'},
-    {'val': 9.87654321e+22, 'unitS': 'Ohm', 'precision': 1, 'resultS': '98.77e21 Ohm'},
-    {'val': 9.87654321e+23, 'unitS': 'Ohm', 'precision': 1, 'resultS': '987.7e21 Ohm'},
-    {'val': 9.87654321e+24, 'unitS': 'Ohm', 'precision': 1, 'resultS': '9.877e24 Ohm'},
-    {'val': 9.87654321e+25, 'unitS': 'Ohm', 'precision': 1, 'resultS': '98.77e24 Ohm'},
-
-    {'val': -9.87654321e-26, 'unitS': 'Ohm', 'precision': 1, 'resultS': '-98.77e-27 Ohm'},
-    {'val': -9.87654321e-25, 'unitS': 'Ohm', 'precision': 1, 'resultS': '-987.7e-27 Ohm'},
-    {'val': -9.87654321e-24, 'unitS': 'Ohm', 'precision': 1, 'resultS': '-9.877e-24 Ohm'},
-    {'val': -9.87654321e-23, 'unitS': 'Ohm', 'precision': 1, 'resultS': '-98.77e-24 Ohm'},
-    {'val': -9.87654321e-22, 'unitS': 'Ohm', 'precision': 1, 'resultS': '-987.7e-24 Ohm'},
-    {'val': -9.87654321e-21, 'unitS': 'Ohm', 'precision': 1, 'resultS': '-9.877e-21 Ohm'},
-    {'val': -9.87654321e-20, 'unitS': 'Ohm', 'precision': 1, 'resultS': '-98.77e-21 Ohm'},
-    {'val': -9.87654321e-19, 'unitS': 'Ohm', 'precision': 1, 'resultS': '-987.7e-21 Ohm'},
+    {'val': 9.87654321e+21, 'unitS': 'Ohm', 'precision': 1, 'resultS': '9.877 ZOhm'},
+    {'val': 9.87654321e+22, 'unitS': 'Ohm', 'precision': 1, 'resultS': '98.77 ZOhm'},
+    {'val': 9.87654321e+23, 'unitS': 'Ohm', 'precision': 1, 'resultS': '987.7 ZOhm'},
+    {'val': 9.87654321e+24, 'unitS': 'Ohm', 'precision': 1, 'resultS': '9.877 YOhm'},
+    {'val': 9.87654321e+25, 'unitS': 'Ohm', 'precision': 1, 'resultS': '98.77 YOhm'},
+
+    {'val': -9.87654321e-26, 'unitS': 'Ohm', 'precision': 1, 'resultS': '-98.77 rOhm'},
+    {'val': -9.87654321e-25, 'unitS': 'Ohm', 'precision': 1, 'resultS': '-987.7 rOhm'},
+    {'val': -9.87654321e-24, 'unitS': 'Ohm', 'precision': 1, 'resultS': '-9.877 yOhm'},
+    {'val': -9.87654321e-23, 'unitS': 'Ohm', 'precision': 1, 'resultS': '-98.77 yOhm'},
+    {'val': -9.87654321e-22, 'unitS': 'Ohm', 'precision': 1, 'resultS': '-987.7 yOhm'},
+    {'val': -9.87654321e-21, 'unitS': 'Ohm', 'precision': 1, 'resultS': '-9.877 zOhm'},
+    {'val': -9.87654321e-20, 'unitS': 'Ohm', 'precision': 1, 'resultS': '-98.77 zOhm'},
+    {'val': -9.87654321e-19, 'unitS': 'Ohm', 'precision': 1, 'resultS': '-987.7 zOhm'},
     {'val': -9.87654321e-18, 'unitS': 'Ohm', 'precision': 1, 'resultS': '-9.877 aOhm'},
     {'val': -9.87654321e-17, 'unitS': 'Ohm', 'precision': 1, 'resultS': '-98.77 aOhm'},
     {'val': -9.87654321e-16, 'unitS': 'Ohm', 'precision': 1, 'resultS': '-987.7 aOhm'},
@@ -265,15 +298,15 @@ testL = [
     {'val': -9.87654321e+18, 'unitS': 'Ohm', 'precision': 1, 'resultS': '-9.877 EOhm'},
     {'val': -9.87654321e+19, 'unitS': 'Ohm', 'precision': 1, 'resultS': '-98.77 EOhm'},
     {'val': -9.87654321e+20, 'unitS': 'Ohm', 'precision': 1, 'resultS': '-987.7 EOhm'},
-    {'val': -9.87654321e+21, 'unitS': 'Ohm', 'precision': 1, 'resultS': '-9.877e21 Ohm'},
-    {'val': -9.87654321e+22, 'unitS': 'Ohm', 'precision': 1, 'resultS': '-98.77e21 Ohm'},
-    {'val': -9.87654321e+23, 'unitS': 'Ohm', 'precision': 1, 'resultS': '-987.7e21 Ohm'},
-    {'val': -9.87654321e+24, 'unitS': 'Ohm', 'precision': 1, 'resultS': '-9.877e24 Ohm'},
-    {'val': -9.87654321e+25, 'unitS': 'Ohm', 'precision': 1, 'resultS': '-98.77e24 Ohm'},
-
-    {'val': 1e-26, 'unitS': 'V', 'precision': 4, 'resultS': '10.00000e-27 V'},
-    {'val': 1e-23, 'unitS': 'V', 'precision': 4, 'resultS': '10.00000e-24 V'},
-    {'val': 1e-20, 'unitS': 'V', 'precision': 4, 'resultS': '10.00000e-21 V'},
+    {'val': -9.87654321e+21, 'unitS': 'Ohm', 'precision': 1, 'resultS': '-9.877 ZOhm'},
+    {'val': -9.87654321e+22, 'unitS': 'Ohm', 'precision': 1, 'resultS': '-98.77 ZOhm'},
+    {'val': -9.87654321e+23, 'unitS': 'Ohm', 'precision': 1, 'resultS': '-987.7 ZOhm'},
+    {'val': -9.87654321e+24, 'unitS': 'Ohm', 'precision': 1, 'resultS': '-9.877 YOhm'},
+    {'val': -9.87654321e+25, 'unitS': 'Ohm', 'precision': 1, 'resultS': '-98.77 YOhm'},
+
+    {'val': 1e-26, 'unitS': 'V', 'precision': 4, 'resultS': '10.00000 rV'},
+    {'val': 1e-23, 'unitS': 'V', 'precision': 4, 'resultS': '10.00000 yV'},
+    {'val': 1e-20, 'unitS': 'V', 'precision': 4, 'resultS': '10.00000 zV'},
     {'val': 1e-17, 'unitS': 'V', 'precision': 4, 'resultS': '10.00000 aV'},
     {'val': 1e-14, 'unitS': 'V', 'precision': 4, 'resultS': '10.00000 fV'},
     {'val': 1e-11, 'unitS': 'V', 'precision': 4, 'resultS': '10.00000 pV'},
@@ -287,11 +320,11 @@ testL = [
     {'val': 10000000000000.0, 'unitS': 'V', 'precision': 4, 'resultS': '10.00000 TV'},
     {'val': 1e+16, 'unitS': 'V', 'precision': 4, 'resultS': '10.00000 PV'},
     {'val': 1e+19, 'unitS': 'V', 'precision': 4, 'resultS': '10.00000 EV'},
-    {'val': 1e+22, 'unitS': 'V', 'precision': 4, 'resultS': '10.00000e21 V'},
-    {'val': 1e+25, 'unitS': 'V', 'precision': 4, 'resultS': '10.00000e24 V'},
+    {'val': 1e+22, 'unitS': 'V', 'precision': 4, 'resultS': '10.00000 ZV'},
+    {'val': 1e+25, 'unitS': 'V', 'precision': 4, 'resultS': '10.00000 YV'},
 
-    {'val': 4.2e-25, 'unitS': 'J', 'precision': 8, 'resultS': '420.00000000e-27 J'},
-    {'val': 4.2e-20, 'unitS': 'J', 'precision': 8, 'resultS': '42.000000000e-21 J'},
+    {'val': 4.2e-25, 'unitS': 'J', 'precision': 8, 'resultS': '420.00000000 rJ'},
+    {'val': 4.2e-20, 'unitS': 'J', 'precision': 8, 'resultS': '42.000000000 zJ'},
     {'val': 4.2e-15, 'unitS': 'J', 'precision': 8, 'resultS': '4.2000000000 fJ'},
     {'val': 4.2e-10, 'unitS': 'J', 'precision': 8, 'resultS': '420.00000000 pJ'},
     {'val': 4.2e-05, 'unitS': 'J', 'precision': 8, 'resultS': '42.000000000 uJ'},
@@ -300,10 +333,10 @@ testL = [
     {'val': 42000000000.0, 'unitS': 'J', 'precision': 8, 'resultS': '42.000000000 GJ'},
     {'val': 4200000000000000.0, 'unitS': 'J', 'precision': 8, 'resultS': '4.2000000000 PJ'},
     {'val': 4.2e+20, 'unitS': 'J', 'precision': 8, 'resultS': '420.00000000 EJ'},
-    {'val': 4.2e+25, 'unitS': 'J', 'precision': 8, 'resultS': '42.000000000e24 J'},
+    {'val': 4.2e+25, 'unitS': 'J', 'precision': 8, 'resultS': '42.000000000 YJ'},
 
-    {'val': -4.2e-25, 'unitS': 'J', 'precision': 8, 'resultS': '-420.00000000e-27 J'},
-    {'val': -4.2e-20, 'unitS': 'J', 'precision': 8, 'resultS': '-42.000000000e-21 J'},
+    {'val': -4.2e-25, 'unitS': 'J', 'precision': 8, 'resultS': '-420.00000000 rJ'},
+    {'val': -4.2e-20, 'unitS': 'J', 'precision': 8, 'resultS': '-42.000000000 zJ'},
     {'val': -4.2e-15, 'unitS': 'J', 'precision': 8, 'resultS': '-4.2000000000 fJ'},
     {'val': -4.2e-10, 'unitS': 'J', 'precision': 8, 'resultS': '-420.00000000 pJ'},
     {'val': -4.2e-05, 'unitS': 'J', 'precision': 8, 'resultS': '-42.000000000 uJ'},
@@ -312,7 +345,7 @@ testL = [
     {'val': -42000000000.0, 'unitS': 'J', 'precision': 8, 'resultS': '-42.000000000 GJ'},
     {'val': -4200000000000000.0, 'unitS': 'J', 'precision': 8, 'resultS': '-4.2000000000 PJ'},
     {'val': -4.2e+20, 'unitS': 'J', 'precision': 8, 'resultS': '-420.00000000 EJ'},
-    {'val': -4.2e+25, 'unitS': 'J', 'precision': 8, 'resultS': '-42.000000000e24 J'},
+    {'val': -4.2e+25, 'unitS': 'J', 'precision': 8, 'resultS': '-42.000000000 YJ'},
 
 ]
 
@@ -452,4 +485,891 @@ class TestEngNotation(TestCase):
         #     print(s)
         #     thisExp += 5
 
+    def test_decomposition(self):
+        """
+        test the lazily computed engineering notation decomposition
+        :return boolean: assertion results
+        """
+        eN = EngNotation(-12345.6, precision=1, unitS='V')
+        self.assertFalse(hasattr(eN, '__dict__'))
+        self.assertEqual(eN.exponent, 4)
+        self.assertAlmostEqual(eN.mantissa, -1.23456)
+        self.assertEqual(eN.engExponent, 3)
+        self.assertAlmostEqual(eN.engValue, -12.3456)
+        self.assertEqual(eN.prefixS, 'k')
+        self.assertTrue(eN.foundPrefix)
+        self.assertEqual(str(eN), '-12.35 kV')
+
+        eN = EngNotation(math.nan)
+        self.assertIsNone(eN.engValue)
+        self.assertEqual(str(eN), 'NAN')
+
+    def test_rounding_carry(self):
+        """
+        test values that round up into the next band or prefix, and exact powers of ten
+        :return boolean: assertion results
+        """
+        carryL = [
+            (999.4, 0, '999'),
+            (999.95, 0, '1.00k'),
+            (-999.96, 0, '-1.00k'),
+            (9.996, 0, '10.0'),
+            (99.96, 0, '100'),
+            (9.9996, 1, '10.00'),
+            (999999.9, 1, '1.000M'),
+            (0.0009999996, 0, '1.00m'),
+            (9.99e-19, 0, '999z'),
+            (9.999e-19, 0, '1.00a'),
+            (1e-3, 0, '1.00m'),
+            (1e22, 0, '10.0Z'),
+            (5e-324, 0, '4.94e-324'),
+        ]
+        for val, precision, resultS in carryL:
+            self.assertEqual(str(EngNotation(val, precision=precision)), resultS)
+
+        for exponent in range(-300, 300):
+            eN = EngNotation(float('1e%i' % exponent))
+            self.assertEqual(eN.exponent, exponent)
+            self.assertEqual(eN.mantissa, 1.0)
+
+    def test_eng_formatter(self):
+        """
+        test the reusable formatter against the known good strings
+        :return boolean: assertion results
+        """
+        for thisTestD in testL:
+            formatter = EngFormatter(precision=thisTestD['precision'], unitS=thisTestD['unitS'])
+            self.assertEqual(formatter(thisTestD['val']), thisTestD['resultS'])
+
+        # unit strings containing format characters are passed through verbatim
+        formatter = EngFormatter(1, '%')
+        self.assertEqual(formatter(0.5), '500.0 m%')
+        self.assertEqual(formatter(5e30), '5.000 Q%')
+        self.assertEqual(formatter(5e33), '5.000e33 %')
+        self.assertEqual(formatter(math.nan), 'NAN %')
+
+    def test_parse_eng(self):
+        """
+        test that every known good string parses back to its value and unit
+        :return boolean: assertion results
+        """
+        for thisTestD in testL:
+            val, unitS = parse_eng(thisTestD['resultS'])
+            self.assertEqual(unitS, thisTestD['unitS'])
+            eN = EngNotation(val, precision=thisTestD['precision'], unitS=unitS)
+            self.assertEqual(str(eN), thisTestD['resultS'])
+
+        self.assertEqual(parse_eng('98.77 MOhm'), (98.77e6, 'Ohm'))
+        self.assertEqual(parse_eng('2.5m'), (2.5e-3, ''))
+        self.assertEqual(parse_eng('2.5 m'), (2.5, 'm'))
+        self.assertEqual(parse_eng('3.3 \u00b5F'), (3.3e-6, 'F'))
+        self.assertEqual(parse_eng('1.00 Pa'), (1e15, 'a'))
+        self.assertEqual(parse_eng('1.00 Pa', unitS='Pa'), (1.0, 'Pa'))
+        self.assertEqual(parse_eng('1.00 kPa', unitS='Pa'), (1e3, 'Pa'))
+        self.assertEqual(parse_eng('-INF V'), (-math.inf, 'V'))
+        self.assertRaises(ValueError, parse_eng, '1.00 Ohm', 'V')
+        self.assertRaises(ValueError, parse_eng, '1.00 xV', 'V')
+        self.assertRaises(ValueError, parse_eng, 'volts')
+
+        self.assertEqual(parse_eng_many(['1.00k', '22.0 mA']), [(1e3, ''), (22e-3, 'A')])
+        if np is not None:
+            valueA, unitA = parse_eng_many(np.array([['1.00k', '22.0 mA'], ['NAN', '3 V']]))
+            self.assertEqual(valueA.shape, (2, 2))
+            self.assertEqual(valueA[0, 1], 22e-3)
+            self.assertTrue(math.isnan(valueA[1, 0]))
+            self.assertEqual(unitA.tolist(), [['', 'A'], ['', 'V']])
+            valueA, unitA = parse_eng_many(np.array([b'1.5u', b'2k']))
+            self.assertEqual(valueA.tolist(), [1.5e-6, 2e3])
+
+    def test_main(self):
+        """
+        test the command-line filter, one number per line and in CSV columns
+        :return boolean: assertion results
+        """
+        with tempfile.TemporaryDirectory() as dirS:
+            inS = os.path.join(dirS, 'in.txt')
+            outS = os.path.join(dirS, 'out.txt')
+
+            with open(inS, 'w') as f:
+                f.write('1000\n0.0023\nvolts\n-5e-9\nnan\n')
+            self.assertEqual(main([inS, '-o', outS, '-p', '1', '-u', 'V', '--chunk-size', '2']), 0)
+            with open(outS) as f:
+                self.assertEqual(f.read(), '1.000 kV\n2.300 mV\nvolts\n-5.000 nV\nNAN V\n')
+
+            with open(inS, 'w') as f:
+                f.write('t,v,i\n1,0.5,0.002\n2,1e3,-4e-7\n')
+            self.assertEqual(main([inS, '-o', outS, '-c', '2,3', '--units', 'V,A', '--chunk-size', '1']), 0)
+            with open(outS) as f:
+                self.assertEqual(f.read(), 't,v,i\n1,500 mV,2.00 mA\n2,1.00 kV,-400 nA\n')
+
+            # column numbers start at 1
+            with contextlib.redirect_stderr(io.StringIO()):
+                self.assertRaises(SystemExit, main, [inS, '-o', outS, '-c', '0'])
+                self.assertRaises(SystemExit, main, [inS, '-o', outS, '-c', '2,x'])
+
+            # chunk sizes below 1 and paths that can't be opened are usage errors
+            for argL in ([inS, '-o', outS, '--chunk-size', '0'], [inS, '-o', outS, '--chunk-size', '-1'],
+                         [os.path.join(dirS, 'missing.txt'), '-o', outS],
+                         [inS, '-o', os.path.join(dirS, 'missing', 'out.txt')]):
+                errorIO = io.StringIO()
+                with contextlib.redirect_stderr(errorIO):
+                    with self.assertRaises(SystemExit) as context:
+                        main(argL)
+                self.assertEqual(context.exception.code, 2)
+                self.assertIn('error:', errorIO.getvalue())
+                self.assertNotIn('Traceback', errorIO.getvalue())
+            with open(outS) as f:
+                self.assertEqual(f.read(), 't,v,i\n1,500 mV,2.00 mA\n2,1.00 kV,-400 nA\n')
+
+        # stdin and stdout stay usable after main() returns
+        codeS = "import engNotation; engNotation.main(['--stats', '-u', 'V']); print('done')"
+        result = subprocess.run([sys.executable, '-c', codeS], input='1000\n2e-3\n', capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout, '1.00 kV\n2.00 mV\ndone\n')
+        self.assertIn('2 rows in', result.stderr)
+
+    def test_format_column(self):
+        """
+        test formatting a column with one common exponent and prefix
+        :return boolean: assertion results
+        """
+        self.assertEqual(
+            format_column([0.0123, -0.0045, 0.1234, math.nan], unitS='A'),
+            [' 12 mA', ' -4 mA', '123 mA', ' NAN A'],
+        )
+        self.assertEqual(
+            format_column([0.0123, -0.0045, 0.1234], precision=2, unitS='A', align='<'),
+            ['12.30 mA ', '-4.50 mA ', '123.40 mA'],
+        )
+        self.assertEqual(format_column([1, 2.5, 30], engExponent=-3, unitS='V'), [' 1000 mV', ' 2500 mV', '30000 mV'])
+        self.assertEqual(format_column([4.2e34, 1e33], width=8), [' 42.0e33', '  1.0e33'])
+        self.assertEqual(format_column([999.96, 1.0]), ['1.00k', '0.00k'])
+        self.assertEqual(format_column([]), [])
+        self.assertRaises(ValueError, format_column, [1.0], engExponent=2)
+
+        # subnormal columns scale as EngNotation does, and extreme exponents are scaled exactly
+        self.assertEqual(format_column([5e-324]), ['4.94e-324'])
+        for value in (3.92e-321, -7.686797498464834e-309, 9.99e-320, 2.2250738585072014e-308, 1e-310):
+            for precision in (0, 1, 3, 12):
+                self.assertEqual(format_column([value], precision), [str(EngNotation(value, precision))])
+        self.assertEqual(format_column([0.001], engExponent=-330), [str(round(Fraction(0.001) * 10 ** 330)) + 'e-330'])
+        self.assertEqual(format_column([1e300], engExponent=-30), [str(int(1e300) * 10 ** 30) + 'q'])
+
+    def test_eng_stream(self):
+        """
+        test the stream formatter, with and without hysteresis
+        :return boolean: assertion results
+        """
+        for thisTestD in testL:
+            stream = EngStream(precision=thisTestD['precision'], unitS=thisTestD['unitS'])
+            self.assertEqual(stream(thisTestD['val']), thisTestD['resultS'])
+
+        # a slowly drifting reading crossing decades, with a few jumps and special values
+        stream = EngStream(precision=1, unitS='V')
+        val = 1e-4
+        for i in range(5000):
+            val *= 1.003
+            for v in (val, -val, 0.0, math.nan, val * 1e7) if i % 500 == 0 else (val,):
+                self.assertEqual(stream(v), str(EngNotation(v, precision=1, unitS='V')))
+
+        stream = EngStream(unitS='V', hysteresis=0.05)
+        readingL = [stream(v) for v in (0.9995, 1.02, 0.999, 0.97, 0.94, 1.0, 1040.0, 1060.0, 990.0)]
+        self.assertEqual(readingL, [
+            '1.00 V', '1.02 V', '1.00 V', '0.97 V', '940 mV', '1000 mV', '1.04 kV', '1.06 kV', '0.99 kV',
+        ])
+        stream.reset()
+        self.assertEqual(stream(990.0), '990 V')
+
+    def test_format_into(self):
+        """
+        test formatting into fixed-width slots of preallocated buffers
+        :return boolean: assertion results
+        """
+        width = 24
+        buffer = bytearray(len(testL) * (width + 1))
+        for thisTestD in testL:
+            buffer[:] = b'x' * len(buffer)
+            written = format_into(
+                buffer, [thisTestD['val']] * len(testL), precision=thisTestD['precision'],
+                unitS=thisTestD['unitS'], width=width, sep=b'\n',
+            )
+            self.assertEqual(written, len(buffer))
+            self.assertEqual(bytes(buffer), ('%24s\n' % thisTestD['resultS']).encode() * len(testL))
+
+        buffer = bytearray(b'#' * 14)
+        self.assertEqual(format_into(memoryview(buffer), [1.5, -2e3], width=6, align='<', offset=1), 12)
+        self.assertEqual(bytes(buffer), b'#1.50  -2.00k#')
+        self.assertRaises(ValueError, format_into, bytearray(8), [1.5, 2.5], width=5)
+        self.assertRaises(ValueError, format_into, bytearray(8), [1.5e-30], unitS='Ohm', width=8)
+
+        if np is not None:
+            stringA = np.zeros(3, dtype='S10')
+            self.assertEqual(format_into(stringA, np.array([1e3, -np.inf, 4.2e-25]), unitS='J'), 30)
+            self.assertEqual(stringA.tolist(), [b'1.00 kJ', b'-INF J', b'420 rJ'])
+
+            # 2-D arrays are written in C order, and non-contiguous arrays are rejected
+            # rather than written into a copy
+            stringA = np.zeros((2, 2), dtype='S8')
+            self.assertEqual(format_into(stringA, [1, 2e3, 3e6, 4e9]), 32)
+            self.assertEqual(stringA.tolist(), [[b'1.00', b'2.00k'], [b'3.00M', b'4.00G']])
+            for bufferA in (np.zeros((2, 2), dtype='S8', order='F'), np.zeros((2, 2), dtype='S8').T,
+                            np.zeros(4, dtype='S8')[::2]):
+                self.assertRaises(ValueError, format_into, bufferA, [1.0, 2.0])
+                self.assertEqual(bufferA.tolist(), np.zeros(bufferA.shape, dtype='S8').tolist())
+
+    @skipIf(np is None, "numpy is not installed")
+    def test_eng_array(self):
+        """
+        test the columnar EngArray: rendering, indexing, slicing and binary save/load
+        :return boolean: assertion results
+        """
+        engArray = EngArray(
+            [thisTestD['val'] for thisTestD in testL],
+            precision=[thisTestD['precision'] for thisTestD in testL],
+            unitS=[thisTestD['unitS'] for thisTestD in testL],
+        )
+        resultL = [thisTestD['resultS'] for thisTestD in testL]
+        self.assertEqual(engArray.format().tolist(), resultL)
+        self.assertEqual([str(eN) for eN in engArray], resultL)
+        self.assertEqual(str(engArray[3]), resultL[3])
+        self.assertEqual(engArray.precisions.dtype, np.int8)
+
+        subArray = engArray[2:10:3]
+        self.assertTrue(np.shares_memory(subArray.values, engArray.values))
+        self.assertEqual(subArray.format().tolist(), resultL[2:10:3])
+
+        copied = EngArray.from_engnotations(EngNotation(v, 2, 'V') for v in (1e3, float('nan'), -2.5e-7))
+        self.assertEqual(copied.units, ['V'])
+        self.assertEqual(copied.format().tolist(), ['1.0000 kV', 'NAN V', '-250.00 nV'])
+
+        with tempfile.TemporaryDirectory() as tmpDirS:
+            pathS = os.path.join(tmpDirS, 'values.eng')
+            engArray.save(pathS)
+            for mmap in (False, True):
+                loaded = EngArray.load(pathS, mmap=mmap)
+                self.assertEqual(loaded.units, engArray.units)
+                self.assertEqual(loaded.format().tolist(), resultL)
+                self.assertEqual(str(loaded[-1]), resultL[-1])
+                del loaded
+
+            badS = os.path.join(tmpDirS, 'bad.eng')
+            with open(badS, 'wb') as f:
+                f.write(b'\0' * 64)
+            self.assertRaises(ValueError, EngArray.load, badS)
+
+    def test_logging(self):
+        """
+        test the lazy log argument and the log formatter
+        :return boolean: assertion results
+        """
+        for thisTestD in testL:
+            lazy = EngLazy(thisTestD['val'], precision=thisTestD['precision'], unitS=thisTestD['unitS'])
+            self.assertEqual(str(lazy), thisTestD['resultS'])
+
+        stream = io.StringIO()
+        handler = logging.StreamHandler(stream)
+        handler.setFormatter(EngLogFormatter('%(levelname)s %(message)s'))
+        log = logging.getLogger('test_engNotation.logging')
+        log.propagate = False
+        log.addHandler(handler)
+        log.setLevel(logging.INFO)
+        try:
+            # a disabled call never renders its argument
+            unrenderable = EngLazy(object())
+            log.debug("I=%s", unrenderable)
+            log.info("I=%s R=%s n=%d", EngLazy(1.234e-3, 1, 'A'), EngNotation(98.77e6, 1, 'Ohm'), 3)
+            log.info("%(v)s %(x).1f", {'v': EngLazy(2.2e-9, 0, 'F'), 'x': 0.25})
+        finally:
+            log.removeHandler(handler)
+        self.assertEqual(stream.getvalue(), "INFO I=1.234 mA R=98.77 MOhm n=3\nINFO 2.20 nF 0.2\n")
+
+        # a second handler with a plain formatter sees the record's original arguments
+        plainStream = io.StringIO()
+        plainHandler = logging.StreamHandler(plainStream)
+        plainHandler.setFormatter(logging.Formatter('%(message)s'))
+        stream.seek(0)
+        stream.truncate()
+        recordL = []
+        log.addHandler(handler)
+        log.addHandler(plainHandler)
+        log.addFilter(lambda record: recordL.append(record) or True)
+        try:
+            value = EngNotation(1e-3, 0, 'V')
+            log.info("V=%r", value)
+            log.info("%(v)s", {'v': value})
+        finally:
+            log.removeHandler(handler)
+            log.removeHandler(plainHandler)
+            log.filters.clear()
+        self.assertEqual(stream.getvalue(), "INFO V=1.00 mV\nINFO 1.00 mV\n")
+        self.assertEqual(plainStream.getvalue(), "V=1.00 mV\n1.00 mV\n")
+        self.assertIs(recordL[0].args[0], value)
+        self.assertIs(recordL[1].args['v'], value)
+
+    def test_async_format(self):
+        """
+        test the chunked async formatting against EngNotation.__repr__
+        :return boolean: assertion results
+        """
+        for thisTestD in testL:
+            valueL = [thisTestD['val']] * 7
+            resultL = asyncio.run(aformat_many(
+                valueL, precision=thisTestD['precision'], unitS=thisTestD['unitS'], chunk_size=3))
+            self.assertEqual(resultL, [thisTestD['resultS']] * 7)
+
+        engNotationL = [EngNotation(thisTestD['val'], thisTestD['precision'], thisTestD['unitS'])
+                        for thisTestD in testL]
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            resultL = asyncio.run(aformat_many(engNotationL, chunk_size=4, executor=executor))
+        self.assertEqual(resultL, [thisTestD['resultS'] for thisTestD in testL])
+
+        async def collect():
+            return [chunkL async for chunkL in aiter_format(range(5), unitS='V', chunk_size=2)]
+        self.assertEqual(asyncio.run(collect()), [['0.00 V', '1.00 V'], ['2.00 V', '3.00 V'], ['4.00 V']])
+        self.assertRaises(ValueError, asyncio.run, aformat_many([1.0], chunk_size=0))
+
+    def test_exact_values(self):
+        """
+        test the exact path for ints, Decimals and Fractions
+        :return boolean: assertion results
+        """
+        for thisTestD in testL:
+            if not math.isfinite(thisTestD['val']):
+                continue
+            for value in (Decimal(repr(thisTestD['val'])), Fraction(repr(thisTestD['val']))):
+                eN = EngNotation(value, precision=thisTestD['precision'], unitS=thisTestD['unitS'])
+                self.assertEqual(str(eN), thisTestD['resultS'])
+                formatter = EngFormatter(thisTestD['precision'], thisTestD['unitS'])
+                self.assertEqual(formatter(value), thisTestD['resultS'])
+                self.assertEqual(formatter.formatExact(value), thisTestD['resultS'])
+
+        # ties round half-even on the exact value
+        self.assertEqual(str(EngNotation(Decimal('1.015'))), '1.02')
+        self.assertEqual(str(EngNotation(Decimal('1.025'))), '1.02')
+        self.assertEqual(str(EngNotation(1015, unitS='m')), '1.02 km')
+        self.assertEqual(str(EngNotation(Decimal('999.5'))), '1.00k')
+        self.assertEqual(str(EngNotation(Decimal('-999.4999999999999999999999999'))), '-999')
+        self.assertEqual(str(EngNotation(Fraction(1, 3), 1, 'V')), '333.3 mV')
+        self.assertEqual(str(EngNotation(Fraction(-2, 3), 1, 'V')), '-666.7 mV')
+        self.assertEqual(str(EngNotation(True)), '1.00')
+
+        # beyond the float range, and beyond the int to str conversion limit
+        self.assertEqual(str(EngNotation(10 ** 400, unitS='J')), '10.0e399 J')
+        self.assertEqual(str(EngNotation(-3 * 10 ** 6000 - 5 * 10 ** 5996 - 1, precision=1)), '-3.001e6000')
+        self.assertEqual(str(EngNotation(Decimal('2.5e-400'))), '250e-402')
+        self.assertEqual(str(EngNotation(Decimal('-0'), unitS='V')), '0.00 V')
+        self.assertEqual(str(EngNotation(Decimal('NaN'), unitS='V')), 'NAN V')
+        self.assertEqual(str(EngNotation(Decimal('-Infinity'))), '-INF')
+
+        eN = EngNotation(Decimal('12345.678'), precision=1, unitS='V')
+        self.assertEqual((eN.exponent, eN.engExponent, eN.prefixS, eN.foundPrefix), (4, 3, 'k', True))
+        self.assertEqual(eN.engValue, Decimal('12.345678'))
+        self.assertEqual(eN.mantissa, Decimal('1.2345678'))
+        self.assertEqual(EngNotation(10 ** 30 + 1).engValue, Fraction(10 ** 30 + 1, 10 ** 30))
+        self.assertIsNone(EngNotation(Decimal('NaN')).exponent)
+
+        # every other path expresses the exact types as EngNotation does, not through a float
+        exactL = [1015, Decimal('1.015'), Fraction(1015, 1000), 10 ** 400, -2 * 10 ** 309, Decimal('NaN'), 0]
+        refL = [str(EngNotation(value, unitS='V')) for value in exactL]
+        self.assertEqual(refL[:2], ['1.02 kV', '1.02 V'])
+        stream = EngStream(unitS='V')
+        self.assertEqual([stream(value) for value in exactL], refL)
+        buffer = bytearray(16 * len(exactL))
+        self.assertEqual(format_into(buffer, exactL, unitS='V', width=16), len(buffer))
+        self.assertEqual([buffer[i:i + 16].decode().strip() for i in range(0, len(buffer), 16)], refL)
+        self.assertEqual(asyncio.run(aformat_many(exactL, unitS='V', chunk_size=3)), refL)
+        if np is not None:
+            self.assertEqual(format_array(exactL, unitS='V').tolist(), refL)
+            self.assertEqual(format_array(np.array([exactL, exactL], dtype=object), unitS='V').tolist(), [refL, refL])
+
+        stream = EngStream(unitS='V', hysteresis=0.05)
+        readingL = [stream(v) for v in (1.0, Decimal('1.015'), Decimal('0.9995'), Fraction(97, 100), 1015, 1045)]
+        self.assertEqual(readingL, ['1.00 V', '1.02 V', '1.00 V', '0.97 V', '1015 V', '1045 V'])
+
+        self.assertEqual(format_column([1015, Decimal('2.5'), Fraction(1, 3), -1]),
+                         [' 1.02k', ' 0.00k', ' 0.00k', '-0.00k'])
+        self.assertEqual(format_column([Decimal('1.015'), 2.5, Decimal('-Infinity')]), ['1.02', '2.50', '-INF'])
+        self.assertEqual(format_column([10 ** 400, 1.0, Fraction(5 * 10 ** 399)]),
+                         ['10.0e399', ' 0.0e399', ' 5.0e399'])
+
+    def test_format_spec(self):
+        """
+        test __format__ and eng() with the format spec mini-language
+        :return boolean: assertion results
+        """
+        for thisTestD in testL:
+            eN = EngNotation(thisTestD['val'], precision=thisTestD['precision'], unitS=thisTestD['unitS'])
+            self.assertEqual(f"{eN}", thisTestD['resultS'])
+            self.assertEqual(format(eN, '>30'), '%30s' % thisTestD['resultS'])
+            specS = 'eng.%i %s' % (thisTestD['precision'], thisTestD['unitS'])
+            self.assertEqual(f"{EngNotation(thisTestD['val']):{specS}}", thisTestD['resultS'])
+            self.assertEqual(eng(thisTestD['val'], specS), thisTestD['resultS'])
+
+        x = EngNotation(98765432.1, 1, 'Ohm')
+        self.assertEqual(f"{x:eng.2 Ohm}", '98.765 MOhm')
+        self.assertEqual(f"{x:.0}", '98.8 MOhm')
+        self.assertEqual(f"{x: V}", '98.77 MV')
+        self.assertEqual(f"{x:<12eng}|", '98.77 MOhm  |')
+        self.assertEqual(f"{x:*^14.0 V}", '***98.8 MV****')
+        self.assertEqual(eng(98765432.1, '>12eng.1 Ohm'), '  98.77 MOhm')
+        self.assertEqual(eng(1.5e-3), '1.50m')
+        self.assertEqual(eng(0.5, ' %'), '500 m%')
+        self.assertRaises(ValueError, format, x, 'eng.x')
+        self.assertRaises(ValueError, eng, 1.0, '12f')
+
+    def test_benchmark(self):
+        """
+        test the benchmark suite: JSON results, and failure on a regression against a baseline
+        :return boolean: assertion results
+        """
+        with tempfile.TemporaryDirectory() as tmpDirS:
+            resultS = os.path.join(tmpDirS, 'result.json')
+            argL = ['--size', '20', '--repeat', '1', '--number', '1', '-k', 'in_range', '-o', resultS]
+            self.assertEqual(bench_engNotation.main(argL), 0)
+            with open(resultS) as f:
+                resultD = json.load(f)
+            self.assertIn('repr/in_range/p0', resultD['results'])
+            self.assertGreater(resultD['results']['formatter/in_range']['values_per_s'], 0)
+
+            # a baseline that is ten times faster fails the comparison
+            for thisD in resultD['results'].values():
+                thisD['values_per_s'] *= 10.0
+            baselineS = os.path.join(tmpDirS, 'baseline.json')
+            with open(baselineS, 'w') as f:
+                json.dump(resultD, f)
+            self.assertEqual(bench_engNotation.main(argL + ['--compare', baselineS, '--threshold', '50']), 1)
+
+        rowL, regressedL = bench_engNotation.compare(
+            {'results': {'a': {'values_per_s': 80.0}, 'b': {'values_per_s': 95.0}, 'c': {'values_per_s': 1.0}}},
+            {'results': {'a': {'values_per_s': 100.0}, 'b': {'values_per_s': 100.0}}}, 10.0)
+        self.assertEqual([row[0] for row in rowL], ['a', 'b'])
+        self.assertEqual(regressedL, ['a'])
+
+    def test_instrumentation(self):
+        """
+        test the instrumentation counters, callback, and that disabling restores the original methods
+        :return boolean: assertion results
+        """
+        originalInit = EngNotation.__init__
+        renderL = []
+        reset_stats()
+        enable_instrumentation(lambda *argT: renderL.append(argT))
+        try:
+            for thisTestD in testL:
+                eN = EngNotation(thisTestD['val'], precision=thisTestD['precision'], unitS=thisTestD['unitS'])
+                self.assertEqual(str(eN), thisTestD['resultS'])
+            formatter = EngFormatter(1, 'V')
+            self.assertEqual(formatter(2.5e-3), '2.500 mV')
+            self.assertEqual(formatter(Decimal('1e33')), '1.000e33 V')
+            self.assertEqual(eng(float('nan')), 'NAN')
+        finally:
+            disable_instrumentation()
+        self.assertIs(EngNotation.__init__, originalInit)
+
+        engStats = stats()
+        self.assertEqual(engStats.constructions, len(testL))
+        self.assertEqual(engStats.renders, len(testL) + 3)
+        self.assertEqual(len(renderL), engStats.renders)
+        self.assertEqual(renderL[-3][:4], (2.5e-3, 1, 'V', '2.500 mV'))
+        nonFinite = sum(1 for thisTestD in testL if not math.isfinite(thisTestD['val'])) + 1
+        self.assertEqual(engStats.nonFinite, nonFinite)
+        fallbacks = sum(1 for thisTestD in testL if 'e' in thisTestD['resultS'].split(' ')[0]) + 1
+        self.assertEqual(engStats.fallbacks, fallbacks)
+        self.assertEqual(sum(engStats.prefixHits.values()), engStats.renders - nonFinite - fallbacks)
+        self.assertGreaterEqual(engStats.prefixHits['m'], 1)
+        self.assertGreater(engStats.seconds, 0.0)
+
+        # disabled, nothing is counted
+        str(EngNotation(1.0))
+        self.assertEqual(stats().renders, engStats.renders)
+        reset_stats()
+        self.assertEqual(stats(), (0, 0, {}, 0, 0, 0.0))
+
+        # stream readings and render cache hits are renders too
+        originalRepr = EngNotation.__repr__
+        maxsize = engNotation._renderCache.maxsize
+        enable_instrumentation()
+        try:
+            stream = EngStream(unitS='V', hysteresis=0.05)
+            self.assertEqual([stream(v) for v in (1.5, 2.5, 0.97, 1e3, 2e3, math.inf)],
+                             ['1.50 V', '2.50 V', '0.97 V', '1000 V', '2.00 kV', 'INF V'])
+            self.assertEqual(stats().renders, 6)
+            self.assertEqual(stats().prefixHits, {'': 4, 'k': 1})
+            EngNotation.cache_configure(16)
+            eN = EngNotation(4.7e3, 0, 'Ohm')
+            self.assertEqual([str(eN) for _ in range(5)], ['4.70 kOhm'] * 5)
+            self.assertEqual(EngNotation.cache_info().hits, 4)
+            self.assertEqual(stats().renders, 11)
+            self.assertEqual(stats().prefixHits['k'], 6)
+        finally:
+            disable_instrumentation()
+            EngNotation.cache_configure(maxsize)
+            EngNotation.cache_clear()
+            reset_stats()
+        self.assertIs(EngNotation.__repr__, originalRepr)
+
+    def test_format_document(self):
+        """
+        test formatting nested documents and JSON record streams with a schema
+        :return boolean: assertion results
+        """
+        document = {
+            'station': 'A1', 'ok': True, 'count': 3,
+            'runs': [{'vout': 3.3e-3, 'iout': [1e-6, 2e-6], 'temp': None}, {'vout': math.nan, 'extra': {}}],
+            'meta': {'gain': 1000.0, 'tags': []},
+        }
+        schema = {'vout': (1, 'V'), 'iout': 'A', 'meta.gain': (0, '')}
+        expectedD = {
+            'station': 'A1', 'ok': True, 'count': '3.00 ?',
+            'runs': [
+                {'vout': '3.300 mV', 'iout': ['1.00 uA', '2.00 uA'], 'temp': None}, {'vout': 'NAN V', 'extra': {}},
+            ],
+            'meta': {'gain': '1.00k', 'tags': []},
+        }
+        self.assertEqual(format_document(document, schema, unitS='?'), expectedD)
+        self.assertEqual(json.loads(''.join(iter_document_json(document, schema, unitS='?'))), expectedD)
+        outFile = io.StringIO()
+        write_document(document, outFile, schema, unitS='?')
+        self.assertEqual(json.loads(outFile.getvalue()), expectedD)
+
+        # every leaf of the test table, with its own unit and precision
+        leafD = {'v%i' % i: thisTestD['val'] for i, thisTestD in enumerate(testL)}
+        leafSchema = {'v%i' % i: (thisTestD['precision'], thisTestD['unitS']) for i, thisTestD in enumerate(testL)}
+        self.assertEqual(list(format_document([leafD], leafSchema)[0].values()), [d['resultS'] for d in testL])
+
+        inFile = io.StringIO('{"vout": 1.5, "id": "x"}\n\n[1, 2e9]\n')
+        outFile = io.StringIO()
+        self.assertEqual(format_json_stream(inFile, outFile, schema), 2)
+        self.assertEqual(outFile.getvalue(), '{"vout": "1.500 V", "id": "x"}\n["1.00", "2.00G"]\n')
+
+    def test_prefix_sets(self):
+        """
+        test the full SI prefix range, and the binary and prefix-free prefix sets
+        :return boolean: assertion results
+        """
+        self.assertEqual(str(EngNotation(1.5e30, 1, 'V')), '1.500 QV')
+        self.assertEqual(str(EngNotation(2.7e-26, 1, 'V')), '27.00 rV')
+        self.assertEqual(str(EngNotation(1.5e-30, 1, 'm')), '1.500 qm')
+        self.assertEqual(str(EngNotation(1e33, 1, 'V')), '1.000e33 V')
+        self.assertEqual(str(EngNotation(1e-33)), '1.00e-33')
+        eN = EngNotation(1e-33)
+        self.assertEqual((eN.prefixS, eN.foundPrefix), ('E-33', False))
+        self.assertEqual([siPrefixSet.prefix(e) for e in (-33, -30, -3, 0, 30, 33)], [None, 'q', 'm', '', 'Q', None])
+
+        # binary prefixes, powers of two, with a "p" fallback below the set
+        self.assertEqual(str(EngNotation(3 * 2 ** 20, 0, 'B', binaryPrefixSet)), '3.00 MiB')
+        self.assertEqual(str(EngNotation(1023.7, 0, 'B', binaryPrefixSet)), '1.00 KiB')
+        self.assertEqual(str(EngNotation(0.5, 0, 'B', binaryPrefixSet)), '512p-10 B')
+        eN = EngNotation(3 * 2 ** 20, 0, 'B', binaryPrefixSet)
+        self.assertEqual((eN.exponent, eN.engExponent, eN.prefixS, eN.foundPrefix, eN.mantissa),
+                         (21, 20, 'Mi', True, 1.5))
+        self.assertEqual(format(EngNotation(2048, 1, 'B', binaryPrefixSet)), '2.000 KiB')
+        formatter = EngFormatter(2, 'B', binaryPrefixSet)
+        self.assertEqual(formatter(-1.5 * 2 ** 30), '-1.5000 GiB')
+        self.assertEqual(formatter(math.inf), 'INF B')
+
+        # no prefixes, pure engineering notation
+        self.assertEqual(str(EngNotation(1e3, prefixSet=engPrefixSet)), '1.00e3')
+        self.assertEqual(EngFormatter(0, 'V', engPrefixSet)(4.2e-5), '42.0e-6 V')
+        self.assertEqual(EngFormatter(0, 'V', engPrefixSet)(4.2), '4.20 V')
+
+        self.assertEqual(str(EngNotation(1.5e6, 0, 'W', PrefixSet({0: '', 6: 'M'}))), '1.50 MW')
+        self.assertEqual(str(EngNotation(1.5e3, 0, 'W', PrefixSet({0: '', 6: 'M'}))), '1.50e3 W')
+        self.assertRaises(ValueError, PrefixSet, {0: ''}, radix=16)
+        self.assertRaises(ValueError, PrefixSet, {0: ''}, step=4)
+        self.assertRaises(ValueError, PrefixSet, {0: '', 5: 'X'})
+
+    def test_immutable_ordering(self):
+        """
+        test that EngNotation is immutable, hashable and ordered by (value, unitS)
+        :return boolean: assertion results
+        """
+        eN = EngNotation(1.5, 1, 'V')
+        self.assertRaises(AttributeError, setattr, eN, 'value', 2.0)
+        self.assertRaises(AttributeError, setattr, eN, 'unitS', 'A')
+        self.assertRaises(AttributeError, setattr, eN, 'other', 0)
+        self.assertEqual((eN.value, eN.precision, eN.unitS, eN.prefixSet), (1.5, 1, 'V', None))
+
+        # equality and hashing ignore the precision, and agree across numeric types
+        self.assertEqual(EngNotation(1, 0, 'V'), EngNotation(1.0, 2, 'V'))
+        self.assertEqual(hash(EngNotation(1, 0, 'V')), hash(EngNotation(Decimal('1.0'), 0, 'V')))
+        self.assertNotEqual(EngNotation(1, 0, 'V'), EngNotation(1, 0, 'A'))
+        self.assertNotEqual(EngNotation(1, 0, 'V'), 1)
+        self.assertEqual(EngNotation(0.0), EngNotation(-0.0))
+        self.assertEqual(EngNotation(math.nan, 0, 'V'), EngNotation(float('nan'), 0, 'V'))
+        self.assertEqual(len({EngNotation(v, 0, 'V') for v in (1, 1.0, 1e3, math.nan, Decimal('NaN'))}), 3)
+        self.assertEqual({EngNotation(2.2e-3, 0, 'F'): 'C1'}[EngNotation(0.0022, 3, 'F')], 'C1')
+
+        # NaNs sort last, after every number
+        valueL = [3, math.nan, -2.5, Decimal('1e3'), Fraction(1, 3), -math.inf, 1e-30]
+        sortedL = sorted(EngNotation(value, 0, 'V') for value in valueL)
+        self.assertEqual([str(eN) for eN in sortedL],
+                         ['-INF V', '-2.50 V', '1.00 qV', '333 mV', '3.00 V', '1.00 kV', 'NAN V'])
+        self.assertEqual(sorted(sortedL[::-1], key=operator.attrgetter('sortKey')), sortedL)
+        self.assertEqual(sortedL[2].sortKey, (False, 1e-30, 'V'))
+        self.assertLess(EngNotation(1, 0, 'A'), EngNotation(1, 0, 'V'))
+        self.assertGreaterEqual(EngNotation(2, 0, 'A'), EngNotation(1, 0, 'V'))
+        self.assertEqual(bisect.bisect_left(sortedL, EngNotation(1, 0, 'V')), 4)
+        self.assertRaises(TypeError, operator.lt, EngNotation(1), 2)
+
+        # pickling keeps the constructor arguments, not the cached decomposition
+        eN = EngNotation(2048, 1, 'B', binaryPrefixSet)
+        self.assertEqual(str(eN), '2.000 KiB')
+        eN2 = pickle.loads(pickle.dumps(eN))
+        self.assertEqual((eN2, eN2.precision, str(eN2)), (eN, 1, '2.000 KiB'))
+        for thisTestD in testL:
+            eN = EngNotation(thisTestD['val'], thisTestD['precision'], thisTestD['unitS'])
+            self.assertEqual(str(pickle.loads(pickle.dumps(eN))), thisTestD['resultS'])
+
+    def test_code_table(self):
+        """
+        test the lookup table of quantized ADC codes against EngNotation
+        :return boolean: assertion results
+        """
+        gain, offset = 2.5 / 65536, -1.25
+        table = EngCodeTable(gain, offset, 0, 65535, precision=1, unitS='V')
+        self.assertEqual(len(table), 65536)
+        self.assertEqual((table(0), table(32768), table(65535)), ('-1.250 V', '0.000 V', '1.250 V'))
+        for code in range(65536):
+            self.assertEqual(table(code), repr(EngNotation(gain * code + offset, 1, 'V')))
+        self.assertRaises(ValueError, table, -1)
+        self.assertRaises(ValueError, table, 65536)
+        self.assertRaises(ValueError, EngCodeTable, gain, offset, 10, 9)
+
+        # a bounded table evicts the least recently used pages
+        table = EngCodeTable(1e-3, 0.0, -512, 511, unitS='A', pageSize=100, maxPages=2)
+        for code in (-512, 0, 511, 0, -512):
+            self.assertEqual(table(code), repr(EngNotation(1e-3 * code, 0, 'A')))
+        self.assertEqual(list(table._pageD), [5, 0])
+        table.clear()
+        self.assertEqual(len(table._pageD), 0)
+
+        # threads sharing a bounded table, which keeps evicting pages
+        table = EngCodeTable(1e-3, 0.0, 0, 4095, unitS='A', pageSize=16, maxPages=3)
+
+        def worker(seed):
+            codeL = [(seed * 7919 + i * 104729) % 4096 for i in range(2000)]
+            return all(table(code) == repr(EngNotation(1e-3 * code, 0, 'A')) for code in codeL)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            self.assertTrue(all(executor.map(worker, range(8))))
+        self.assertLessEqual(len(table._pageD), 3)
+
+        # exact calibrations give the same strings as EngNotation on the exact values
+        table = EngCodeTable(Fraction(1, 3), 7, 0, 1023, precision=2, unitS='Ohm')
+        for code in (0, 1, 2, 512, 1023):
+            self.assertEqual(table(code), repr(EngNotation(Fraction(1, 3) * code + 7, 2, 'Ohm')))
+
+        if np is not None:
+            table = EngCodeTable(gain, offset, 0, 65535, precision=1, unitS='V', pageSize=1024, maxPages=8)
+            codeA = np.random.default_rng(3).integers(0, 65536, (50, 40))
+            resultA = table.format(codeA)
+            self.assertEqual(resultA.shape, codeA.shape)
+            self.assertEqual(resultA.tolist(), format_array(gain * codeA + offset, 1, 'V').tolist())
+            self.assertEqual(table.format(np.array([5, 6], dtype=np.uint16)).tolist(), [table(5), table(6)])
+            self.assertRaises(ValueError, table.format, [0, 65536])
+
+    def test_arithmetic(self):
+        """
+        test scaled arithmetic and unit conversion against a fresh EngNotation of the result
+        :return boolean: assertion results
+        """
+        eN = EngNotation(12.3, 1, 'mA')
+        self.assertEqual(str(eN.to_unit(1e-3, 'A')), '12.30 mA')
+        self.assertEqual(str(eN * 1000), '12.30 kmA')
+        self.assertEqual(str(eN / 1e3), '12.30 mmA')
+        self.assertEqual(str(2 * eN), '24.60 mA')
+        self.assertEqual(str(eN + EngNotation(1, 0, 'mA')), '13.30 mA')
+        self.assertEqual(str(eN - EngNotation(20, 0, 'mA')), '-7.700 mA')
+        self.assertEqual((EngNotation(Fraction(123, 10), 1, 'mA') * Fraction(1, 3)).value, Fraction(41, 10))
+        self.assertEqual(str(EngNotation(Decimal('1.5'), 0, 'V') * Decimal('1e6')), '1.50 MV')
+        self.assertEqual(EngNotation(1.5, 2, 'V', binaryPrefixSet).to_unit(2048, 'B').prefixSet, binaryPrefixSet)
+
+        # a Decimal mixed with a float or a Fraction is promoted to Fractions, exactly
+        self.assertEqual((EngNotation(1.5) * Decimal(2)).value, Fraction(3))
+        self.assertEqual(str(Decimal(2) * EngNotation(1.5, 0, 'V')), '3.00 V')
+        self.assertEqual(str(EngNotation(Decimal('1.5'), 0, 'mA').to_unit(1e-3, 'A')), '1.50 mA')
+        self.assertEqual(EngNotation(Decimal('1.5'), 0, 'mA').to_unit(1e-3, 'A').value, Fraction(1.5) * Fraction(1e-3))
+        self.assertEqual((EngNotation(Decimal('1.5')) * Fraction(1, 3)).value, Fraction(1, 2))
+        self.assertEqual((EngNotation(Fraction(1, 3)) / Decimal('0.5')).value, Fraction(2, 3))
+        self.assertEqual((EngNotation(Decimal('0.1'), 0, 'V') + EngNotation(0.2, 0, 'V')).value,
+                         Fraction(1, 10) + Fraction(0.2))
+        self.assertEqual(str(EngNotation(0.3, 0, 'V') - EngNotation(Decimal('0.1'), 0, 'V')), '200 mV')
+        self.assertEqual(str(EngNotation(Decimal('NaN'), 0, 'V') * 2.0), 'NAN V')
+        self.assertEqual(str(EngNotation(Decimal('1.5'), 0, 'V') * math.inf), 'INF V')
+        self.assertRaises(ValueError, operator.add, eN, EngNotation(1, 0, 'A'))
+        self.assertRaises(TypeError, operator.mul, eN, eN)
+        self.assertRaises(TypeError, operator.add, eN, 1.0)
+        self.assertRaises(TypeError, operator.truediv, eN, 'x')
+
+        # powers of 1000 reuse the decomposition, which must match a fresh one, also
+        # where the scaling rounds across a power of ten or carries into the next band
+        valueL = [thisTestD['val'] for thisTestD in testL]
+        valueL += [float('%s5e%i' % ('9' * (3 + precision), exponent)) for precision in range(4)
+                   for exponent in range(-12, 12)]
+        valueL += [math.nextafter(float('1e%i' % exponent), 0.0) for exponent in range(-40, 40)]
+        for value in valueL:
+            for precision in (0, 1, 3):
+                eN = EngNotation(value, precision, 'V')
+                str(eN)
+                for factor in (1e3, 1e-3, 1e6, 1e-9, 1000, 2.5, 10):
+                    for derived, derivedValue in ((eN * factor, value * factor), (eN / factor, value / factor),
+                                                  (eN.to_unit(factor, 'W'), value * factor)):
+                        fresh = EngNotation(derivedValue, precision, derived.unitS)
+                        self.assertEqual(repr(derived), repr(fresh))
+                        self.assertEqual(derived._decompose(), fresh._decompose())
+        eN = EngNotation(4.7, 0, 'V')
+        self.assertIsNone((eN * 1e3)._decompT)
+        str(eN)
+        self.assertEqual((eN * 1e3)._decompT, (3, 3, 4.7, 'k', True))
+
+    def test_lazy_imports(self):
+        """
+        test that importing the module doesn't import numpy or asyncio, which are imported on first use
+        :return boolean: assertion results
+        """
+        codeS = ("import sys, engNotation; print(sorted({'numpy', 'asyncio', 'argparse'} & set(sys.modules))); "
+                 "engNotation.format_column([1.0]); print('numpy' in sys.modules)")
+        result = subprocess.run([sys.executable, '-c', codeS], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout, '[]\nFalse\n')
+
+    def test_render_cache(self):
+        """
+        test the LRU render cache, its statistics and eviction
+        :return boolean: assertion results
+        """
+        try:
+            EngNotation.cache_configure(maxsize=3)
+            EngNotation.cache_clear()
+            for thisTestD in testL:
+                eN = EngNotation(thisTestD['val'], precision=thisTestD['precision'], unitS=thisTestD['unitS'])
+                self.assertEqual(str(eN), thisTestD['resultS'])
+                self.assertEqual(str(eN), thisTestD['resultS'])
+            info = EngNotation.cache_info()
+            self.assertGreaterEqual(info.hits, len(testL))
+            self.assertEqual(info.hits + info.misses, 2 * len(testL))
+            self.assertEqual(info.currsize, 3)
+
+            # NaN keys hit, even though NaN != NaN
+            EngNotation.cache_clear()
+            for _ in range(5):
+                self.assertEqual(str(EngNotation(math.nan, unitS='V')), 'NAN V')
+            self.assertEqual(EngNotation.cache_info().hits, 4)
+
+            # the least recently used string is evicted
+            EngNotation.cache_clear()
+            for val in (1.0, 2.0, 3.0, 1.0, 4.0, 2.0):
+                str(EngNotation(val))
+            self.assertEqual(EngNotation.cache_info()[:2], (1, 5))
+
+            # the cache is shared between threads
+            EngNotation.cache_configure(maxsize=None)
+            EngNotation.cache_clear()
+
+            def renderAll():
+                for val in range(1000):
+                    self.assertEqual(str(EngNotation(val * 1e-3, unitS='A')), str(EngNotation(val * 1e-3, 0, 'A')))
+
+            threadL = [threading.Thread(target=renderAll) for _ in range(4)]
+            for thread in threadL:
+                thread.start()
+            for thread in threadL:
+                thread.join()
+            info = EngNotation.cache_info()
+            self.assertEqual(info.hits + info.misses, 8000)
+            self.assertEqual(info.currsize, 1000)
+
+        # disable the cache
+        finally:
+            EngNotation.cache_configure(maxsize=0)
+            EngNotation.cache_clear()
+        str(EngNotation(1.0))
+        self.assertEqual(EngNotation.cache_info(), (0, 0, 0, 0))
+
+    @skipIf(np is None, "numpy is not installed")
+    def test_format_array(self):
+        """
+        test that the batch formatter matches the scalar formatter
+        :return boolean: assertion results
+        """
+        for thisTestD in testL:
+            resultA = format_array(
+                np.array([thisTestD['val']] * 3),
+                precision=thisTestD['precision'],
+                unitS=thisTestD['unitS'],
+            )
+            self.assertEqual(resultA.shape, (3,))
+            for s in resultA:
+                self.assertEqual(s, thisTestD['resultS'])
+
+        # a 2-D array of random values, spanning more decades than the prefix table
+        rng = np.random.default_rng(42)
+        valueA = rng.choice([-1.0, 1.0], (100, 50)) * 10.0 ** rng.uniform(-30, 30, (100, 50))
+        resultA = format_array(valueA, precision=2, unitS='Ohm')
+        self.assertEqual(resultA.shape, valueA.shape)
+        for val, s in zip(valueA.ravel(), resultA.ravel()):
+            self.assertEqual(s, str(EngNotation(float(val), precision=2, unitS='Ohm')))
+
+    @skipIf(np is None, "numpy is not installed")
+    def test_format_array_parallel(self):
+        """
+        test that the multi-process batch formatter matches the serial formatter
+        :return boolean: assertion results
+        """
+        rng = np.random.default_rng(7)
+        valueA = rng.choice([-1.0, 1.0], (40, 25)) * 10.0 ** rng.uniform(-25, 25, (40, 25))
+        valueA[3, 4] = np.nan
+        valueA[5, 6] = -np.inf
+        valueA[7, 8] = 0.0
+
+        parallelMinSize = engNotation.parallelMinSize
+        try:
+            engNotation.parallelMinSize = 100
+            resultA = format_array(valueA, precision=1, unitS='V', workers=2)
+        finally:
+            engNotation.parallelMinSize = parallelMinSize
+        self.assertEqual(resultA.shape, valueA.shape)
+        self.assertEqual(resultA.tolist(), format_array(valueA, precision=1, unitS='V').tolist())
+
+    @skipIf(pd is None or np is None, "pandas is not installed")
+    def test_pandas_accessors(self):
+        """
+        test the pandas Series.eng and DataFrame.eng accessors
+        :return boolean: assertion results
+        """
+        register_pandas_accessors()
+        df = pd.DataFrame(
+            {'R': [1e3, np.nan, 4.7e-3], 'C': [1e-9, -np.inf, 2.2e-6], 'n': [1, 2, 3]},
+            index=['a', 'b', 'c'],
+        )
+
+        resultS = df['R'].eng.format(precision=1, unitS='Ohm')
+        self.assertEqual(resultS.tolist(), ['1.000 kOhm', 'NAN Ohm', '4.700 mOhm'])
+        self.assertEqual(resultS.index.tolist(), ['a', 'b', 'c'])
+        self.assertEqual(resultS.name, 'R')
+
+        resultDf = df.eng.format({'R': 'Ohm', 'C': 'F'}, precision={'R': 1})
+        self.assertEqual(resultDf['C'].tolist(), ['1.00 nF', '-INF F', '2.20 uF'])
+        self.assertEqual(resultDf['n'].tolist(), [1, 2, 3])
+        for column in ('R', 'C'):
+            for val, s in zip(df[column], resultDf[column]):
+                eN = EngNotation(val, precision=1 if column == 'R' else 0, unitS='Ohm' if column == 'R' else 'F')
+                self.assertEqual(s, str(eN))
+
+        parsedDf = resultDf.eng.parse({'R': 'Ohm', 'C': 'F'})
+        self.assertEqual(parsedDf['C'].tolist()[::2], [1e-9, 2.2e-6])
+        self.assertTrue(math.isnan(parsedDf['R']['b']))
+        self.assertEqual(resultDf['R'].eng.parse().tolist()[0], 1e3)
+
+        # missing values and non-string entries parse as NaN
+        stringS = pd.Series(['1.00 kOhm', None, np.nan, pd.NA, 2.5, '2.2 mOhm'], name='R')
+        parsedS = stringS.eng.parse('Ohm')
+        self.assertEqual(parsedS.name, 'R')
+        self.assertEqual(parsedS.tolist()[::5], [1e3, 2.2e-3])
+        self.assertTrue(parsedS.iloc[1:5].isna().all())
+        self.assertTrue(pd.Series([None, None], dtype=object).eng.parse().isna().all())
+
 # ===========================================================================
@@ -0,0 +1,531 @@
+"""
+Differential equivalence and fuzz tests for engNotation.py engineering notation number
+pretty-printer. The reference is an independent oracle, written here in exact rational
+arithmetic without any of the module's tables or shortcuts: EngNotation.__repr__ and
+every alternate path (reusable formatters, format specs, the render cache, the stream
+formatter, ADC code tables, the batch, in-place, columnar, parallel and async formatters,
+scaled arithmetic, and the parser round trip) must produce exactly the same strings.
+The values are every decade of the float range, exact powers of ten, rounding-carry
+edges, subnormals, huge ints, Decimals, Fractions, +-0, NaN/INF, and randomized values,
+each at precisions 0 to 12. The number of randomized values comes from the environment
+e.g. ENG_FUZZ_COUNT=2000000 python -m pytest -s test_engNotation_equivalence.py
+"""
+
+__author__ = "K.J. McClaning"
+__created__ = "2022-08-04"
+__updated__ = "2022-08-04"
+__version__ = "0.0.2"
+
+#  MIT License
+#
+#  Copyright (c) 2022 K.J.McClaning
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+import asyncio
+import math
+import os
+import random
+import struct
+import sys
+import time
+from decimal import Decimal
+from fractions import Fraction
+from unittest import TestCase, skipIf
+
+import engNotation
+from engNotation import (
+    aformat_many, eng, EngArray, EngCodeTable, EngFormatter, EngNotation, EngStream, format_array, format_into,
+    parse_eng, parse_eng_many,
+)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# number of randomized values, on top of the edge cases, and the seed they are drawn with
+fuzzCount = int(os.environ.get('ENG_FUZZ_COUNT', '5000'))
+fuzzSeed = int(os.environ.get('ENG_FUZZ_SEED', '2022'))
+
+precisionL = list(range(13))
+unitS = 'V'
+
+# the SI prefixes, spelled out independently of engNotation._prefixD
+_oraclePrefixD = {
+    -30: 'q', -27: 'r', -24: 'y', -21: 'z', -18: 'a', -15: 'f', -12: 'p', -9: 'n', -6: 'u', -3: 'm', 0: '',
+    3: 'k', 6: 'M', 9: 'G', 12: 'T', 15: 'P', 18: 'E', 21: 'Z', 24: 'Y', 27: 'R', 30: 'Q',
+}
+
+
+def _oracleExponent(value):
+    """
+    finds the base-10 exponent of a finite, non-zero value exactly: from the Decimal
+    conversion, which is exact for floats, ints and Decimals, or by comparing a Fraction
+    against powers of ten
+    :param float,int,Decimal,Fraction value: value
+    :return int: floor(log10(abs(value)))
+    """
+    if not isinstance(value, Fraction):
+        return Decimal(value).adjusted()
+    absValue = abs(value)
+    exponent = len(str(absValue.numerator)) - len(str(absValue.denominator))
+    while Fraction(10) ** exponent > absValue:
+        exponent -= 1
+    while Fraction(10) ** (exponent + 1) <= absValue:
+        exponent += 1
+    return exponent
+
+
+def _oracle(value, precision, unitS):
+    """
+    the reference string of a value, computed independently of engNotation. A float
+    is divided by the correctly rounded power of ten of its engineering exponent,
+    computed exactly and rounded once to a float, or scaled exactly below 1e-307 where
+    that power of ten is subnormal, then printed with 3 + precision digits; when the
+    printed number outgrows its band e.g. "1000" the exponent is bumped and the value
+    redone. An int, Decimal or Fraction is rounded half-even, on its exact value, to 3 +
+    precision significant digits
+    :param float,int,Decimal,Fraction value: value to be expressed
+    :param int precision: number of digits to be expressed, beyond 3
+    :param string unitS: unit string
+    :return string: the engineering notation string
+    """
+    unitSuffixS = ' ' + unitS if unitS else ''
+    if isinstance(value, Decimal) and not value.is_finite():
+        value = float(value)
+    if isinstance(value, float) and math.isnan(value):
+        return 'NAN' + unitSuffixS
+    if isinstance(value, float) and math.isinf(value):
+        return ('-INF' if value < 0 else 'INF') + unitSuffixS
+
+    numDigits = 3 + precision
+    exactValue = Fraction(value)
+    if exactValue == 0:
+        numberS = '%.*f' % (numDigits - 1, 0.0)
+        engExponent = 0
+    elif isinstance(value, float):
+        exponent = _oracleExponent(value)
+        while True:
+            engExponent = exponent - exponent % 3
+            if engExponent >= -307:
+                engValue = float(exactValue / Fraction(float('1e%i' % engExponent)))
+            else:
+                engValue = float(exactValue * 10 ** -engExponent)
+            numberS = '%.*f' % (numDigits - 1 - exponent % 3, engValue)
+            if len(numberS.lstrip('-').partition('.')[0]) <= exponent % 3 + 1:
+                break
+            exponent += 1
+    else:
+        exponent = _oracleExponent(value)
+        digits = round(abs(exactValue) / Fraction(10) ** (exponent + 1 - numDigits))
+        if digits == 10 ** numDigits:
+            exponent += 1
+            digits //= 10
+        engExponent = exponent - exponent % 3
+        digitsS = str(digits)
+        intDigits = exponent % 3 + 1
+        numberS = ('-' if exactValue < 0 else '') + digitsS[:intDigits]
+        if len(digitsS) > intDigits:
+            numberS += '.' + digitsS[intDigits:]
+
+    if engExponent in _oraclePrefixD:
+        return numberS + (' ' + _oraclePrefixD[engExponent] + unitS if unitS else _oraclePrefixD[engExponent])
+    return numberS + 'e%i' % engExponent + unitSuffixS
+
+
+def _edgeFloats():
+    """
+    builds the float edge cases: signed zeros, NaN/INF, the float extremes, every
+    decade with its exact power of ten and neighbours, and the rounding-carry edges
+    :return list: floats
+    """
+    valueL = [0.0, -0.0, math.nan, math.inf, -math.inf, 5e-324, 2.225073858507201e-308, 2.2250738585072014e-308,
+              sys.float_info.max, 1.0, 999.5, 999.95, 9.995, 99.95, 0.9995]
+
+    # every decade, with its exact power of ten and the floats on either side of it
+    for exponent in range(-324, 309):
+        power = float('1e%i' % exponent)
+        valueL += [power, math.nextafter(power, 0.0), math.nextafter(power, math.inf), 1.5 * power, 9.99 * power]
+
+    # the carry edges, where rounding to 3 + precision digits moves the value into
+    # the next band or prefix: 9.995, 99.95, 999.5 ... and the floats on either side
+    for precision in precisionL:
+        for exponent in range(-36, 36):
+            edge = float('%s5e%i' % ('9' * (3 + precision), exponent))
+            valueL += [edge, math.nextafter(edge, 0.0), math.nextafter(edge, math.inf)]
+
+    return valueL + [-value for value in valueL]
+
+
+def _randomFloats(rng, count):
+    """
+    draws randomized floats from several distributions
+    :param random.Random rng: random number generator
+    :param int count: number of values
+    :return list: floats
+    """
+    valueL = []
+    for _ in range(count):
+        kind = rng.randrange(5)
+        if kind == 0:
+            # log-uniform over the whole float range
+            value = 10 ** rng.uniform(-307, 308)
+        elif kind == 1:
+            # any bit pattern, including subnormals, NaN and INF
+            value = struct.unpack('<d', struct.pack('<Q', rng.getrandbits(64)))[0]
+        elif kind == 2:
+            # subnormals
+            value = struct.unpack('<d', struct.pack('<Q', rng.getrandbits(52)))[0]
+        elif kind == 3:
+            # short decimals, many of them exact ties at some precision
+            value = float('%i5e%i' % (rng.randrange(10 ** rng.randrange(16)), rng.randrange(-40, 40)))
+        else:
+            # the prefix range
+            value = 10 ** rng.uniform(-33, 33)
+        valueL.append(value if rng.random() < 0.5 else -value)
+    return valueL
+
+
+def _exactValues(rng, count):
+    """
+    builds ints, including huge ones, Decimals and Fractions
+    :param random.Random rng: random number generator
+    :param int count: number of randomized values
+    :return list: ints, Decimals and Fractions
+    """
+    valueL = [0, -0, 1, -1, True, Decimal('0'), Decimal('-0'), Decimal('NaN'), Decimal('Infinity'),
+              Decimal('-Infinity'), Fraction(0), Fraction(1, 3), Fraction(-2, 3)]
+    for exponent in range(0, 420, 7):
+        valueL += [10 ** exponent, 10 ** exponent - 1, 10 ** exponent + 1, -(10 ** exponent) // 7]
+        valueL += [Decimal('9.995e%i' % exponent), Decimal('-1e-%i' % exponent), Fraction(1, 10 ** exponent + 7)]
+    for _ in range(count):
+        kind = rng.randrange(3)
+        if kind == 0:
+            value = rng.randrange(10 ** rng.randrange(1, 400))
+        elif kind == 1:
+            value = Decimal('%ie%i' % (rng.randrange(10 ** rng.randrange(1, 30)), rng.randrange(-500, 500)))
+        else:
+            value = Fraction(rng.randrange(1, 10 ** 20), rng.randrange(1, 10 ** 20))
+        valueL.append(value if rng.random() < 0.5 else -value)
+    return valueL
+
+
+class TestEngNotationEquivalence(TestCase):
+    """
+    Differential tests of EngNotation.__repr__ and the alternate formatting paths against the oracle
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        builds the values, and the oracle strings of each at every precision
+        """
+        rng = random.Random(fuzzSeed)
+        cls.floatL = _edgeFloats() + _randomFloats(rng, fuzzCount)
+        cls.exactL = _exactValues(rng, fuzzCount // 10)
+        cls.ratesD = {}
+
+        startTime = time.perf_counter()
+        cls.floatRefD = {precision: [_oracle(value, precision, unitS) for value in cls.floatL]
+                         for precision in precisionL}
+        cls.exactRefD = {precision: [_oracle(value, precision, unitS) for value in cls.exactL]
+                         for precision in precisionL}
+        cls._rate('oracle', len(cls.floatL + cls.exactL) * len(precisionL), time.perf_counter() - startTime)
+
+    @classmethod
+    def tearDownClass(cls):
+        """
+        reports the throughput of each path, in values per second
+        """
+        print('\nEngNotation equivalence, %i values x %i precisions'
+              % (len(cls.floatL) + len(cls.exactL), len(precisionL)), file=sys.stderr)
+        for pathS, rate in cls.ratesD.items():
+            print('  %-22s %12.0f values/s' % (pathS, rate), file=sys.stderr)
+
+    @classmethod
+    def _rate(cls, pathS, count, seconds):
+        """
+        records the throughput of a path
+        :param string pathS: name of the path
+        :param int count: number of values formatted
+        :param float seconds: time taken
+        """
+        cls.ratesD[pathS] = count / seconds if seconds > 0 else math.inf
+
+    def _assertPath(self, pathS, valueL, refL, resultL, precision):
+        """
+        asserts that a path agrees with the reference, reporting the first difference
+        :param string pathS: name of the path
+        :param list valueL: the values
+        :param list refL: the reference strings
+        :param list resultL: the strings produced by the path
+        :param int precision: the precision the values were formatted with
+        """
+        self.assertEqual(len(resultL), len(refL), pathS)
+        for value, refS, resultS in zip(valueL, refL, resultL):
+            if resultS != refS:
+                self.fail('%s: %r at precision %i gave %r, expected %r' % (pathS, value, precision, resultS, refS))
+
+    def test_repr(self):
+        """
+        test EngNotation.__repr__, for floats and the exact types
+        :return boolean: assertion results
+        """
+        valueL = self.floatL + self.exactL
+        seconds = 0.0
+        for precision in precisionL:
+            refL = self.floatRefD[precision] + self.exactRefD[precision]
+            startTime = time.perf_counter()
+            resultL = [repr(EngNotation(value, precision, unitS)) for value in valueL]
+            seconds += time.perf_counter() - startTime
+            self._assertPath('EngNotation', valueL, refL, resultL, precision)
+        self._rate('EngNotation', len(valueL) * len(precisionL), seconds)
+
+    def test_formatter(self):
+        """
+        test EngFormatter, for floats and the exact types
+        :return boolean: assertion results
+        """
+        for valueL, refD in ((self.floatL, self.floatRefD), (self.exactL, self.exactRefD)):
+            seconds = 0.0
+            for precision in precisionL:
+                formatter = EngFormatter(precision, unitS)
+                startTime = time.perf_counter()
+                resultL = [formatter(value) for value in valueL]
+                seconds += time.perf_counter() - startTime
+                self._assertPath('EngFormatter', valueL, refD[precision], resultL, precision)
+            self._rate('EngFormatter' if valueL is self.floatL else 'EngFormatter (exact)',
+                       len(valueL) * len(precisionL), seconds)
+
+    def test_format_spec(self):
+        """
+        test eng() and format() with the equivalent format spec
+        :return boolean: assertion results
+        """
+        valueL = self.floatL + self.exactL
+        seconds = 0.0
+        for precision in precisionL:
+            refL = self.floatRefD[precision] + self.exactRefD[precision]
+            specS = '.%i %s' % (precision, unitS)
+            startTime = time.perf_counter()
+            resultL = [eng(value, specS) for value in valueL]
+            seconds += time.perf_counter() - startTime
+            self._assertPath('eng()', valueL, refL, resultL, precision)
+            resultL = [format(EngNotation(value, precision, unitS)) for value in valueL]
+            self._assertPath('format()', valueL, refL, resultL, precision)
+        self._rate('eng()', len(valueL) * len(precisionL), seconds)
+
+    def test_render_cache(self):
+        """
+        test the render cache, small enough that values are evicted, on misses and hits
+        :return boolean: assertion results
+        """
+        valueL = self.floatL + self.exactL
+        maxsize = engNotation._renderCache.maxsize
+        try:
+            EngNotation.cache_configure(4096)
+            seconds = 0.0
+            for precision in precisionL:
+                refL = self.floatRefD[precision] + self.exactRefD[precision]
+                for _ in range(2):
+                    startTime = time.perf_counter()
+                    resultL = [repr(EngNotation(value, precision, unitS)) for value in valueL]
+                    seconds += time.perf_counter() - startTime
+                    self._assertPath('render cache', valueL, refL, resultL, precision)
+            self.assertGreater(EngNotation.cache_info().hits, 0)
+        finally:
+            EngNotation.cache_configure(maxsize)
+            EngNotation.cache_clear()
+        self._rate('render cache', 2 * len(valueL) * len(precisionL), seconds)
+
+    def test_stream(self):
+        """
+        test the stream formatter without hysteresis, which must match the oracle string
+        for string, on the values as drawn, with floats and exact types interleaved, and
+        sorted by magnitude, so that most values stay within the range of the current prefix
+        :return boolean: assertion results
+        """
+        valueL = self.floatL + self.exactL
+        magnitudeL = [math.inf if isinstance(v, int) and v.bit_length() > 1000 else abs(float(v)) for v in valueL]
+        orderL = sorted(range(len(valueL)), key=lambda i: (magnitudeL[i], i))
+        seconds = 0.0
+        for precision in precisionL:
+            refL = self.floatRefD[precision] + self.exactRefD[precision]
+            stream = EngStream(precision, unitS)
+            startTime = time.perf_counter()
+            resultL = [stream(value) for value in valueL]
+            seconds += time.perf_counter() - startTime
+            self._assertPath('EngStream', valueL, refL, resultL, precision)
+            stream.reset()
+            resultL = [stream(valueL[i]) for i in orderL]
+            self._assertPath('EngStream (sorted)', [valueL[i] for i in orderL], [refL[i] for i in orderL], resultL,
+                             precision)
+        self._rate('EngStream', len(valueL) * len(precisionL), seconds)
+
+    def test_code_table(self):
+        """
+        test ADC code tables, with float calibrations through the batch formatter and exact
+        calibrations through the exact path, each code against the oracle of gain * code + offset
+        :return boolean: assertion results
+        """
+        rng = random.Random(fuzzSeed)
+        calibrationL = [(2.5 / 4096, -1.25), (1e-9, 0.0), (3.3e-6, 1e-3), (7, 0),
+                        (Decimal('0.0000381'), Decimal('-1.25')), (Fraction(5, 4096), Fraction(-5, 2))]
+        codeL = sorted(set([0, 1, 2047, 2048, 4095] + [rng.randrange(4096) for _ in range(600)]))
+        seconds = 0.0
+        for gain, offset in calibrationL:
+            valueL = [gain * code + offset for code in codeL]
+            for precision in (0, 1, 4, 12):
+                table = EngCodeTable(gain, offset, 0, 4095, precision, unitS, pageSize=256, maxPages=4)
+                startTime = time.perf_counter()
+                resultL = [table(code) for code in codeL]
+                seconds += time.perf_counter() - startTime
+                refL = [_oracle(value, precision, unitS) for value in valueL]
+                self._assertPath('EngCodeTable %r' % gain, valueL, refL, resultL, precision)
+                if np is not None:
+                    resultL = table.format(np.array(codeL)).tolist()
+                    self._assertPath('EngCodeTable.format %r' % gain, valueL, refL, resultL, precision)
+        self._rate('EngCodeTable', len(codeL) * len(calibrationL) * 4, seconds)
+
+    @skipIf(np is None, "numpy is not installed")
+    def test_format_array(self):
+        """
+        test the batch formatter, and EngArray with per-value precisions
+        :return boolean: assertion results
+        """
+        valueA = np.array(self.floatL)
+        seconds = 0.0
+        for precision in precisionL:
+            startTime = time.perf_counter()
+            resultL = format_array(valueA, precision, unitS).tolist()
+            seconds += time.perf_counter() - startTime
+            self._assertPath('format_array', self.floatL, self.floatRefD[precision], resultL, precision)
+        self._rate('format_array', len(self.floatL) * len(precisionL), seconds)
+
+        # a list mixing floats with ints, Decimals and Fractions, which are expressed exactly
+        valueL = self.floatL + self.exactL
+        for precision in precisionL:
+            refL = self.floatRefD[precision] + self.exactRefD[precision]
+            self._assertPath('format_array (exact)', valueL, refL, format_array(valueL, precision, unitS).tolist(),
+                             precision)
+
+        precisionA = np.arange(len(self.floatL)) % len(precisionL)
+        startTime = time.perf_counter()
+        resultL = EngArray(valueA, precisionA, unitS).format().tolist()
+        self._rate('EngArray.format', len(self.floatL), time.perf_counter() - startTime)
+        refL = [self.floatRefD[precision][i] for i, precision in enumerate(precisionA.tolist())]
+        self._assertPath('EngArray.format', self.floatL, refL, resultL, -1)
+
+    @skipIf(np is None, "numpy is not installed")
+    def test_format_array_parallel(self):
+        """
+        test the multi-process batch formatter
+        :return boolean: assertion results
+        """
+        valueA = np.array(self.floatL)
+        parallelMinSize = engNotation.parallelMinSize
+        try:
+            engNotation.parallelMinSize = 0
+            seconds = 0.0
+            for precision in (0, 5, 12):
+                startTime = time.perf_counter()
+                resultL = format_array(valueA, precision, unitS, workers=2).tolist()
+                seconds += time.perf_counter() - startTime
+                self._assertPath('format_array parallel', self.floatL, self.floatRefD[precision], resultL, precision)
+        finally:
+            engNotation.parallelMinSize = parallelMinSize
+        self._rate('format_array parallel', 3 * len(self.floatL), seconds)
+
+    def test_format_into(self):
+        """
+        test the in-place bytes formatter, for floats and the exact types
+        :return boolean: assertion results
+        """
+        width = 32
+        valueL = self.floatL + self.exactL
+        buffer = bytearray((width + 1) * len(valueL))
+        seconds = 0.0
+        for precision in precisionL:
+            refL = self.floatRefD[precision] + self.exactRefD[precision]
+            startTime = time.perf_counter()
+            format_into(buffer, valueL, precision, unitS, width=width, sep=b'\n', align='<')
+            seconds += time.perf_counter() - startTime
+            resultL = [lineS.rstrip(' ') for lineS in buffer.decode().split('\n')[:-1]]
+            self._assertPath('format_into', valueL, refL, resultL, precision)
+        self._rate('format_into', len(valueL) * len(precisionL), seconds)
+
+    def test_async_format(self):
+        """
+        test the async formatter, on float chunks and mixed chunks
+        :return boolean: assertion results
+        """
+        valueL = self.floatL + self.exactL
+        seconds = 0.0
+        for precision in precisionL:
+            refL = self.floatRefD[precision] + self.exactRefD[precision]
+            startTime = time.perf_counter()
+            resultL = asyncio.run(aformat_many(valueL, precision, unitS, chunk_size=4096))
+            seconds += time.perf_counter() - startTime
+            self._assertPath('aformat_many', valueL, refL, resultL, precision)
+        self._rate('aformat_many', len(valueL) * len(precisionL), seconds)
+
+    def test_parse_round_trip(self):
+        """
+        test that parsing a string and expressing the value again gives the same string
+        :return boolean: assertion results
+        """
+        seconds = 0.0
+        for precision in precisionL:
+            refL = self.floatRefD[precision]
+            startTime = time.perf_counter()
+            parsedL = parse_eng_many(refL, unitS)
+            seconds += time.perf_counter() - startTime
+            self.assertEqual(repr(parsedL[:1000]), repr([parse_eng(refS, unitS) for refS in refL[:1000]]))
+
+            # subnormals carry too few digits to round trip, and values that round up
+            # past the largest float, e.g. "180e306 V", parse as INF
+            keepL = [i for i, (value, _) in enumerate(parsedL)
+                     if (math.isfinite(value) and (value == 0 or abs(value) >= sys.float_info.min))
+                     or refL[i].lstrip('-')[0] in 'IN']
+            resultL = [repr(EngNotation(parsedL[i][0], precision, parsedL[i][1])) for i in keepL]
+            self._assertPath('parse round trip', [self.floatL[i] for i in keepL], [refL[i] for i in keepL], resultL,
+                             precision)
+        self._rate('parse_eng_many', len(self.floatL) * len(precisionL), seconds)
+
+    def test_scaled_arithmetic(self):
+        """
+        test that numbers scaled by powers of 1000, which reuse the decomposition of the
+        original, render as a fresh EngNotation of the scaled value
+        :return boolean: assertion results
+        """
+        seconds = 0.0
+        count = 0
+        for precision in (0, 4, 12):
+            engNotationL = [EngNotation(value, precision, unitS) for value in self.floatL]
+            for eN in engNotationL:
+                eN.engExponent
+            for factor in (1e3, 1e-3, 1e-9):
+                startTime = time.perf_counter()
+                resultL = [repr(eN.to_unit(factor, unitS)) for eN in engNotationL]
+                seconds += time.perf_counter() - startTime
+                refL = [repr(EngNotation(value * factor, precision, unitS)) for value in self.floatL]
+                self._assertPath('to_unit %g' % factor, self.floatL, refL, resultL, precision)
+                count += len(resultL)
+        self._rate('to_unit', count, seconds)